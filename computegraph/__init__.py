@@ -35,17 +35,21 @@ Todo:
 
 from __future__ import annotations
 
-import logging
-import logging.handlers
-import sys
-import time
 
-
-logging.root.setLevel(logging.NOTSET)
 LOG_FORMAT = "%(levelname)-8s %(module)-10s:%(lineno)-3s - %(message)s"
 
-CONSOLE_HANDLER = logging.StreamHandler()
-CONSOLE_HANDLER.setLevel(logging.DEBUG)
-CONSOLE_HANDLER.setFormatter(logging.Formatter(fmt=LOG_FORMAT))
-CONSOLE_HANDLER.setStream(sys.stdout)
-logging.root.addHandler(CONSOLE_HANDLER)
+
+def ConfigureLogging():
+    # console handler on the root logger, installed on request, importing the package configures nothing
+    import logging
+    import sys
+
+    if any(handler.name == "computegraph" for handler in logging.root.handlers):
+        return
+
+    logging.root.setLevel(logging.NOTSET)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.set_name("computegraph")
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT))
+    logging.root.addHandler(console_handler)
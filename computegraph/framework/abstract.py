@@ -270,6 +270,10 @@ class AbstractNetwork(ABC):
     def AddOperations(self, *args, **kwargs):
         ...
 
+    @abstractmethod
+    def RemoveOperation(self, *args, **kwargs):
+        ...
+
     @abstractmethod
     def Compile(self, *args, **kwargs):
         ...
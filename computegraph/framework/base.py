@@ -37,11 +37,10 @@ from __future__ import annotations
 from abc import abstractmethod
 from collections import OrderedDict as ordered_dict
 
-from typing import Any, Callable, Dict, List, Set, OrderedDict
-from enum import IntEnum, auto
-
-import networkx
+import threading
 
+from typing import Any, Callable, Dict, List, NamedTuple, Set, OrderedDict
+from enum import IntEnum, auto
 
 from computegraph.framework.abstract import (
     AbstractDatainterface,
@@ -52,6 +51,7 @@ from computegraph.framework.abstract import (
     AbstractSocket,
     CGProtocolDataItem,
 )
+from computegraph.framework.dag import CGDag
 from computegraph.utils import UUID
 
 
@@ -68,6 +68,9 @@ class SocketTypeEnum(IntEnum):
 
 
 class BaseItem(AbstractItem):
+    # the `CGHistory` tracking the item, if any
+    _history: Any = None
+
     def __init__(self, name: str, uid: str | None = None):
         self._name = name
         self._uid = uid or UUID()
@@ -79,6 +82,12 @@ class BaseItem(AbstractItem):
     @name.setter
     def name(self, name: str):
         self._name = name
+        self._Touch()
+
+    def _Touch(self, *change):
+        # a tracked item is captured again by the next snapshot of its history
+        if self._history is not None:
+            self._history.Touch(self, *change)
 
     @property
     def uid(self) -> str:
@@ -242,6 +251,13 @@ class BaseNode(BaseItem, AbstractNode):
         raise NotImplementedError("")
 
 
+class CGResources(NamedTuple):
+    # what one call of an operation holds while it runs
+    cpu: int = 1
+    memory: float = 0.0
+    exclusive: bool = False
+
+
 class BaseOperation(BaseItem, AbstractOperation):
     def __init__(
         self,
@@ -251,6 +267,11 @@ class BaseOperation(BaseItem, AbstractOperation):
         function: Callable,
         attr_dict: Dict = {},
         uid: str | None = None,
+        cost: float | None = None,
+        chunkable: bool = False,
+        demand: bool = False,
+        resources: CGResources | None = None,
+        types: Dict[str, type] | None = None,
     ):
         # sourcery skip: default-mutable-arg
         super().__init__(name, uid)
@@ -258,6 +279,11 @@ class BaseOperation(BaseItem, AbstractOperation):
         self._outputs: List[str] = outputs
         self._function: Callable = function
         self._attr_dict: Dict = attr_dict
+        self._cost: float | None = cost
+        self._chunkable = chunkable
+        self._demand = demand
+        self._resources = resources
+        self._types = dict(types or {})
 
     @property
     def inputs(self) -> List[str]:
@@ -275,6 +301,33 @@ class BaseOperation(BaseItem, AbstractOperation):
     def function(self) -> Callable:
         return self._function
 
+    @property
+    def cost(self) -> float | None:
+        return self._cost
+
+    @cost.setter
+    def cost(self, cost: float | None):
+        self._cost = cost
+
+    @property
+    def chunkable(self) -> bool:
+        return self._chunkable
+
+    @property
+    def demand(self) -> bool:
+        # the function takes `outputs=` and returns a dict of the requested outputs only
+        return self._demand
+
+    @property
+    def resources(self) -> CGResources | None:
+        # requirements admitted against a `CGResourceBudget` by the parallel executor
+        return self._resources
+
+    @property
+    def types(self) -> Dict[str, type]:
+        # declared types of inputs and outputs, by data name, checked by the compile time type pass
+        return self._types
+
     def __repr__(self) -> str:
         return f"Operation(name:`{self.name}` in:`{self.inputs} out:`{self.outputs}`)"
 
@@ -286,14 +339,23 @@ class BaseNetwork(BaseItem, AbstractNetwork):
     def __init__(self, name: str, uid: str | None = None):
         super().__init__(name, uid)
 
-        self._graph = networkx.DiGraph()
+        self._graph = CGDag()
         self._perf_register: OrderedDict[str, float | int] = ordered_dict()
         self._flag_compiled = False
+        self._flag_optimized = False
+        self._flag_plan_stale = False
         self._ordered_steps: List[Any] = []
+        self._ordered_step_ids: List[int] = []
         self._cached_requirements: Dict = {}
+        self._reachability: Any = None
+        self._generated_plans: Dict = {}
+        self._subnetworks: Dict = {}
+        self._plan_lock = threading.RLock()
+        self._constants: Dict[str, Any] = {}
+        self._types: Dict[str, type] = {}
 
     @property
-    def graph(self):
+    def graph(self) -> CGDag:
         return self._graph
 
     @property
@@ -312,12 +374,24 @@ class BaseNetwork(BaseItem, AbstractNetwork):
     def cached_requirements(self):
         return self._cached_requirements
 
+    @property
+    def constants(self) -> Dict[str, Any]:
+        return self._constants
+
+    @property
+    def types(self) -> Dict[str, type]:
+        # types of the data, as inferred by the last compile
+        return self._types
+
     def AddOperation(self, *args, **kwargs):
         raise NotImplementedError("")
 
     def AddOperations(self, *args, **kwargs):
         raise NotImplementedError("")
 
+    def RemoveOperation(self, *args, **kwargs):
+        raise NotImplementedError("")
+
     def Compile(self, *args, **kwargs):
         raise NotImplementedError("")
 
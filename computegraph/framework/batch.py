@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   batch.py
+# @Time    :   2026/10/19 22:03:18
+# _____________________________________________________________________________
+
+"""Micro-batching front end for many small calls of one compiled network.
+
+Requests submitted from any thread or asyncio task are queued; a worker thread
+takes the first waiting request, keeps collecting until `max_batch_size`
+requests are waiting or `max_wait` seconds have passed, and evaluates the whole
+batch at once. Each caller gets its result through its own future.
+
+Inside a batch, `chunkable` operations (rows in, same rows out) are called once
+with the inputs of all requests stacked along the first axis, and their
+outputs are split back per request. Scalars are stacked into one row each;
+a value shared by every request (the same object) is passed unchanged. Any
+other operation, or inputs that cannot be stacked, run once per request.
+
+A failed operation only fails the requests it failed for: their descendant
+operations are skipped and their futures get what could be computed, like a
+sequential call. The other requests of the batch go on.
+"""
+
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.network import Doomed
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class _Request:
+    __slots__ = ("input_dict", "future")
+
+    def __init__(self, input_dict: Dict[str, Any]):
+        self.input_dict = input_dict
+        self.future: Future = Future()
+
+
+def _Rows(value: Any) -> int | None:
+    # rows a value contributes to a stacked input, None for scalars
+    if isinstance(value, numpy.ndarray) and value.ndim:
+        return len(value)
+    if numpy.isscalar(value) or (isinstance(value, numpy.ndarray) and not value.ndim):
+        return None
+    return -1
+
+
+def _StackedCompute(operation: BaseOperation, caches: List[Dict[str, Any]]) -> bool:
+    shared: Dict[str, Any] = {}
+    stacked: Dict[str, List] = {}
+    rows: List[int | None] | None = None
+
+    for input_ in operation.inputs:
+        values = [cache[input_] for cache in caches]
+        if all(value is values[0] for value in values):
+            shared[input_] = values[0]
+            continue
+
+        input_rows = [_Rows(value) for value in values]
+        if -1 in input_rows or (rows is not None and input_rows != rows):
+            return False
+        rows = input_rows
+        stacked[input_] = values
+
+    if rows is None:
+        return False
+
+    # scalars become one row each, arrays keep their rows
+    inputs = dict(shared)
+    try:
+        for input_, values in stacked.items():
+            inputs[input_] = numpy.concatenate(
+                [numpy.reshape(value, (1,)) if n is None else value for value, n in zip(values, rows)]
+            )
+    except (ValueError, TypeError):
+        # rows of different shapes or dtypes, the requests run one by one
+        return False
+
+    temp_outputs = operation.Compute(inputs)
+    n_rows = sum(1 if n is None else n for n in rows)
+    if len(temp_outputs) != len(operation.outputs) or any(
+        _Rows(value) != n_rows for value in temp_outputs.values()
+    ):
+        return False
+
+    start = 0
+    for cache, n in zip(caches, rows):
+        stop = start + (1 if n is None else n)
+        for output, value in temp_outputs.items():
+            cache[output] = value[start] if n is None else value[start:stop]
+        start = stop
+    return True
+
+
+def batch_compute(operation_steps: Tuple, caches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # a failed operation dooms its outputs for that request only, its descendants are skipped there
+    doomed: List[set] = [set() for _ in caches]
+
+    for step in operation_steps:
+        if isinstance(step, BaseOperation):
+            live = [i for i, d in enumerate(doomed) if not (d and Doomed(step, d))]
+            for i in set(range(len(caches))).difference(live):
+                doomed[i].update(step.outputs)
+
+            vectorized = (
+                numpy is not None
+                and len(live) > 1
+                and step.chunkable
+                and all(input_ in caches[i] for i in live for input_ in step.inputs)
+            )
+            if vectorized and _StackedCompute(step, [caches[i] for i in live]):
+                continue
+
+            for i in live:
+                temp_outputs = step.Compute(caches[i])
+                caches[i] |= temp_outputs
+                doomed[i].update(output for output in step.outputs if output not in temp_outputs)
+
+        else:
+            for cache in caches:
+                cache.pop(step, None)
+
+    return caches
+
+
+class CGBatcher:
+    def __init__(self, network, outputs: List[str], max_batch_size: int = 32, max_wait: float = 0.002):
+        self._network = network
+        self._outputs = list(outputs)
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._Run, name="batcher", daemon=True)
+        self._batch_sizes: List[int] = []
+
+    @property
+    def batch_sizes(self) -> List[int]:
+        return self._batch_sizes
+
+    def Start(self) -> CGBatcher:
+        self._worker.start()
+        return self
+
+    def Close(self):
+        self._stop.set()
+        self._worker.join()
+
+        # requests that raced with closing are not left waiting
+        while not self._queue.empty():
+            self._queue.get().future.set_exception(RuntimeError("batcher is closed"))
+
+    def __enter__(self) -> CGBatcher:
+        return self.Start()
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def Submit(self, input_dict: Dict[str, Any]) -> Future:
+        request = _Request(input_dict)
+        if self._stop.is_set():
+            request.future.set_exception(RuntimeError("batcher is closed"))
+        else:
+            self._queue.put(request)
+        return request.future
+
+    def __call__(self, input_dict: Dict[str, Any]) -> Any:
+        return self.Submit(input_dict).result()
+
+    async def ACall(self, input_dict: Dict[str, Any]) -> Any:
+        return await asyncio.wrap_future(self.Submit(input_dict))
+
+    def _Collect(self) -> List[_Request]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        # the first request waits at most max_wait for others to join
+        deadline = time.monotonic() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            if (remaining := deadline - time.monotonic()) <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _Run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            if batch := self._Collect():
+                self._batch_sizes.append(len(batch))
+                self._Evaluate(batch)
+
+    def _Evaluate(self, batch: List[_Request]):
+        network, outputs = self._network, self._outputs
+
+        # requests providing different inputs get different plans
+        groups: Dict[Tuple, List[_Request]] = {}
+        for request in batch:
+            groups.setdefault(tuple(sorted(request.input_dict)), []).append(request)
+
+        for provided_inputs, requests in groups.items():
+            try:
+                required_inputs, operation_steps = network.EvaluateComputationRequirements(
+                    list(provided_inputs), outputs
+                )
+                if missing := set(required_inputs) - set(provided_inputs):
+                    logging.error(f"Missing required inputs:`{tuple(missing)}`")
+                    for request in requests:
+                        request.future.set_result(None)
+                    continue
+
+                caches = batch_compute(operation_steps, [dict(r.input_dict) for r in requests])
+            except Exception as e:
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+
+            for request, cache in zip(requests, caches):
+                request.future.set_result(
+                    {k: cache[k] for k in iter(cache) if k in outputs} if outputs else cache
+                )
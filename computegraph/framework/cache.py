@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   cache.py
+# @Time    :   2026/10/19 18:31:07
+# _____________________________________________________________________________
+
+"""Persistent, content addressed store for operation outputs.
+
+An entry key hashes the operation identity (function import path, the
+function and arguments of a partial, or the class and state of a callable
+instance, and `attr_dict`) together with the values of its inputs, so the same
+computation is found again after a restart or from another worker process.
+Lambdas and nested functions share their import path with their siblings, their
+operations are computed without the cache.
+Sets and dicts are hashed in a canonical order, independent of the hash seed. Every entry is
+a directory holding a pickle of the outputs; numpy arrays are written next to
+it as `.npy` files and loaded back memory mapped, without copying.
+
+Entries are published by renaming a finished temporary directory, readers
+touch the entry to keep LRU order by modification time, and eviction runs
+under an exclusive lock file, so several processes can share one directory.
+"""
+
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import types
+from typing import Any, Dict, List, Set, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.serialize import ImportPath
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+_META_FILE = "outputs.pkl"
+_LOCK_FILE = ".lock"
+
+
+class _ArrayRef:
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+
+
+def _Digest(value: Any) -> bytes:
+    digest = hashlib.sha256()
+    CGResultCache._HashValue(digest, value)
+    return digest.digest()
+
+
+class CGResultCache:
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._refused: Set[str] = set()  # function paths already reported as not importable
+        os.makedirs(directory, exist_ok=True)
+
+        self._approx_bytes = sum(size for _, _, size in self._Entries())
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @staticmethod
+    def _HashValue(digest, value: Any):
+        if numpy is not None and isinstance(value, numpy.ndarray) and value.dtype != object:
+            digest.update(f"ndarray:{value.dtype.str}:{value.shape}".encode())
+            digest.update(numpy.ascontiguousarray(value).data)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            digest.update(b"bytes:")
+            digest.update(value)
+        elif isinstance(value, (set, frozenset, dict)):
+            # iteration order of unordered containers depends on the hash seed of the process
+            if isinstance(value, dict):
+                parts = [_Digest(k) + _Digest(v) for k, v in value.items()]
+            else:
+                parts = [_Digest(v) for v in value]
+            digest.update(f"{type(value).__name__}:{len(parts)}:".encode())
+            digest.update(b"".join(sorted(parts)))
+        elif type(value) in (list, tuple):
+            digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+            for item in value:
+                digest.update(_Digest(item))
+        else:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _HashFunction(digest, function: Any) -> str | None:
+        # returns the import path that is not importable, lambdas and closures share their qualname
+        if isinstance(function, functools.partial):
+            digest.update(b"partial:")
+            if (refused := CGResultCache._HashFunction(digest, function.func)) is not None:
+                return refused
+            CGResultCache._HashValue(digest, list(function.args))
+            CGResultCache._HashValue(digest, dict(function.keywords))
+            return None
+
+        # bound methods and callable instances are identified by their class and their state
+        owner = getattr(function, "__self__", None)
+        if isinstance(owner, (type(None), type, types.ModuleType)) and hasattr(function, "__qualname__"):
+            function_path = ImportPath(function)
+            if "<" in function_path:
+                return function_path
+            digest.update(function_path.encode())
+            return None
+
+        instance, name = (function, "__call__") if owner is None else (owner, function.__name__)
+        type_path = ImportPath(type(instance))
+        if "<" in type_path:
+            return type_path
+        digest.update(f"{type_path}.{name}:".encode())
+        try:
+            CGResultCache._HashValue(digest, vars(instance) if hasattr(instance, "__dict__") else instance)
+        except Exception:
+            # unpicklable state, the entry is only found again by the same instance
+            digest.update(f"id:{id(instance)}".encode())
+        return None
+
+    def Key(self, operation: BaseOperation, input_dict: Dict[str, Any]) -> str | None:
+        digest = hashlib.sha256()
+        if (refused := self._HashFunction(digest, operation.function)) is not None:
+            if refused not in self._refused:
+                self._refused.add(refused)
+                logging.warning(
+                    f"operation:`{operation.name}` function:`{refused}` is not importable, not cached"
+                )
+            return None
+
+        for name in sorted(operation.attr_dict):
+            digest.update(f"attr:{name}".encode())
+            self._HashValue(digest, operation.attr_dict[name])
+
+        # an operation narrowed to some of its outputs stores them under a key of its own
+        if operation.demand:
+            digest.update(f"outputs:{','.join(operation.outputs)}".encode())
+
+        # absent optional inputs are part of the key as well
+        for name in operation.inputs:
+            if name in input_dict:
+                digest.update(b"input:")
+                self._HashValue(digest, input_dict[name])
+            else:
+                digest.update(b"missing:")
+
+        return digest.hexdigest()
+
+    def _EntryPath(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key)
+
+    def Get(self, operation: BaseOperation, key: str) -> Dict[str, Any] | None:
+        path = self._EntryPath(key)
+        try:
+            with open(os.path.join(path, _META_FILE), "rb") as f:
+                values: List = pickle.load(f)
+
+            for i, value in enumerate(values):
+                if isinstance(value, _ArrayRef):
+                    values[i] = numpy.load(os.path.join(path, value.file_name), mmap_mode="r")
+
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            # missing, or evicted by another process while reading
+            return None
+
+        return dict(zip(operation.outputs, values))
+
+    def Put(self, operation: BaseOperation, key: str, outputs: Dict[str, Any]):
+        path = self._EntryPath(key)
+        if os.path.exists(path):
+            return
+
+        if any(output not in outputs for output in operation.outputs):
+            logging.debug(f"operation:`{operation.name}` outputs incomplete, not cached")
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self._directory)
+        try:
+            values: List = []
+            for i, output in enumerate(operation.outputs):
+                value = outputs[output]
+                if numpy is not None and isinstance(value, numpy.ndarray) and value.dtype != object:
+                    file_name = f"{i}.npy"
+                    numpy.save(os.path.join(tmp_path, file_name), value)
+                    value = _ArrayRef(file_name)
+                values.append(value)
+
+            with open(os.path.join(tmp_path, _META_FILE), "wb") as f:
+                pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            size = _DirectorySize(tmp_path)
+            os.rename(tmp_path, path)
+        except OSError:
+            # another process published the same entry first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logging.warning(f"operation:`{operation.name}` outputs cannot be cached")
+            logging.warning(e)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        self._approx_bytes += size
+        if self._approx_bytes > self._max_bytes:
+            self.Evict()
+
+    def _Entries(self) -> List[Tuple[str, float, int]]:
+        entries = []
+        for prefix in os.scandir(self._directory):
+            if not prefix.is_dir() or prefix.name.startswith("."):
+                continue
+            for entry in os.scandir(prefix.path):
+                try:
+                    entries.append((entry.path, entry.stat().st_mtime, _DirectorySize(entry.path)))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def Evict(self):
+        with open(os.path.join(self._directory, _LOCK_FILE), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # least recently used first
+                entries = sorted(self._Entries(), key=lambda entry: entry[1])
+                total = sum(size for _, _, size in entries)
+                for path, _, size in entries:
+                    if total <= self._max_bytes:
+                        break
+                    shutil.rmtree(path, ignore_errors=True)
+                    total -= size
+                self._approx_bytes = total
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def Clear(self):
+        for path, _, _ in self._Entries():
+            shutil.rmtree(path, ignore_errors=True)
+        self._approx_bytes = 0
+
+
+def _DirectorySize(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
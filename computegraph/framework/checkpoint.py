@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   checkpoint.py
+# @Time    :   2026/10/20 01:06:44
+# _____________________________________________________________________________
+
+"""Checkpoints of sequential network calls, and resuming from them.
+
+A checkpoint holds the position of the next step of the plan and every data
+value alive at that point. It is written every `every_operations` completed
+operations, every `every_seconds` or after the operations named in `after`,
+whichever comes first, once the operation that triggered it completed.
+
+Every value is written once to a file of its own, numpy arrays as `.npy`
+files loaded back copy-on-write memory mapped, anything else pickled; a later
+checkpoint only writes the values produced since and drops the files of
+deleted ones. The manifest is replaced atomically last, so an interrupted
+write leaves the previous checkpoint intact. After a failed operation no
+further checkpoint is written, resuming retries it.
+
+`CGNetwork.Resume` rebuilds the values of the last checkpoint and continues
+the plan it was written for from its position.
+"""
+
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from computegraph.framework.base import BaseOperation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_MANIFEST_FILE = "manifest.json"
+VERSION = 1
+
+
+class CGCheckpointState(NamedTuple):
+    provided_inputs: List[str]
+    outputs: List[str]
+    position: int
+    fingerprint: str
+    values: Dict[str, Any]
+
+
+class CGCheckpoint:
+    def __init__(
+        self,
+        directory: str,
+        every_operations: int | None = None,
+        every_seconds: float | None = None,
+        after: Iterable[str] = (),
+    ):
+        self._directory = directory
+        self._every_operations = every_operations
+        self._every_seconds = every_seconds
+        self._after = set(after)
+        os.makedirs(directory, exist_ok=True)
+
+        # progress of the running call
+        self._provided_inputs: List[str] = []
+        self._outputs: List[str] = []
+        self._fingerprint = ""
+        self._position = 0
+        self._files: Dict[str, str] = {}
+        self._counter = 0
+        self._since_operations = 0
+        self._since_time = time.monotonic()
+        self._halted = False
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @staticmethod
+    def Fingerprint(provided_inputs: Iterable[str], outputs: Iterable[str], steps: Tuple) -> str:
+        # names only, uids differ between processes building the same network
+        plan = [step.name if isinstance(step, BaseOperation) else str(step) for step in steps]
+        description = json.dumps([sorted(provided_inputs), sorted(outputs), plan])
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def Begin(
+        self,
+        provided_inputs: Iterable[str],
+        outputs: Iterable[str],
+        steps: Tuple,
+        state: CGCheckpointState | None = None,
+    ):
+        self._provided_inputs = list(provided_inputs)
+        self._outputs = list(outputs)
+        self._fingerprint = self.Fingerprint(self._provided_inputs, self._outputs, steps)
+        self._since_operations = 0
+        self._since_time = time.monotonic()
+        self._halted = False
+
+        # file names continue after the last checkpoint, a resumed call keeps the files of its values
+        _, files, self._counter = self._ReadManifest()
+        self._files = files if state is not None else {}
+        self._position = state.position if state is not None else 0
+
+    def _Due(self, step: Any) -> bool:
+        if self._every_operations is not None and self._since_operations >= self._every_operations:
+            return True
+        if self._every_seconds is not None and time.monotonic() - self._since_time >= self._every_seconds:
+            return True
+        names = [operation.name for operation in getattr(step, "operations", [step])]
+        return any(name in self._after for name in names)
+
+    def Advance(self, step: Any, values: Dict[str, Any]):
+        # called after every completed step of the plan
+        self._position += 1
+        if self._halted or not isinstance(step, BaseOperation):
+            return
+
+        self._since_operations += 1
+        if self._Due(step):
+            self.Save(values)
+
+    def Halt(self):
+        # steps after a failure are not part of any checkpoint
+        self._halted = True
+
+    def Save(self, values: Dict[str, Any]):
+        files = {}
+        try:
+            for name, value in values.items():
+                if (file_name := self._files.get(name, None)) is None:
+                    file_name = self._Write(value)
+                files[name] = file_name
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logging.error(f"checkpoint of directory:`{self._directory}` could not be written")
+            logging.error(e)
+            self._halted = True
+            return
+
+        manifest = {
+            "version": VERSION,
+            "fingerprint": self._fingerprint,
+            "provided_inputs": self._provided_inputs,
+            "outputs": self._outputs,
+            "position": self._position,
+            "files": files,
+            "counter": self._counter,
+        }
+        tmp_path = os.path.join(self._directory, f".{_MANIFEST_FILE}")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self._directory, _MANIFEST_FILE))
+
+        # files of deleted values, or left over by an interrupted write
+        referenced = set(files.values())
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith((".npy", ".pkl")) and entry.name not in referenced:
+                _Remove(entry.path)
+        self._files = files
+        self._since_operations = 0
+        self._since_time = time.monotonic()
+
+    def _Write(self, value: Any) -> str:
+        self._counter += 1
+        if numpy is not None and isinstance(value, numpy.ndarray) and value.dtype != object:
+            file_name = f"{self._counter}.npy"
+            numpy.save(os.path.join(self._directory, file_name), value)
+        else:
+            file_name = f"{self._counter}.pkl"
+            with open(os.path.join(self._directory, file_name), "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return file_name
+
+    def _ReadManifest(self) -> Tuple[Dict[str, Any] | None, Dict[str, str], int]:
+        try:
+            with open(os.path.join(self._directory, _MANIFEST_FILE), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None, {}, 0
+        if manifest.get("version", None) != VERSION:
+            logging.error(f"checkpoint version:`{manifest.get('version', None)}` not supported")
+            return None, {}, 0
+        return manifest, manifest["files"], manifest["counter"]
+
+    def Load(self) -> CGCheckpointState | None:
+        manifest, files, _ = self._ReadManifest()
+        if manifest is None:
+            logging.error(f"no checkpoint in directory:`{self._directory}`")
+            return None
+
+        # arrays were written by a process with numpy, they cannot be read back without it
+        if numpy is None and any(file_name.endswith(".npy") for file_name in files.values()):
+            logging.error(f"checkpoint of directory:`{self._directory}` holds arrays, numpy not installed")
+            return None
+
+        values = {}
+        try:
+            for name, file_name in files.items():
+                path = os.path.join(self._directory, file_name)
+                if file_name.endswith(".npy"):
+                    values[name] = numpy.load(path, mmap_mode="c")
+                else:
+                    with open(path, "rb") as f:
+                        values[name] = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            logging.error(f"checkpoint of directory:`{self._directory}` could not be read")
+            logging.error(e)
+            return None
+
+        return CGCheckpointState(
+            manifest["provided_inputs"],
+            manifest["outputs"],
+            manifest["position"],
+            manifest["fingerprint"],
+            values,
+        )
+
+    def Clear(self):
+        _Remove(os.path.join(self._directory, _MANIFEST_FILE))
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith((".npy", ".pkl")):
+                _Remove(entry.path)
+        self._files = {}
+
+
+def _Remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   chunked.py
+# @Time    :   2026/10/19 19:31:16
+# _____________________________________________________________________________
+
+"""Chunked, out-of-core evaluation of array valued networks.
+
+When every operation of the plan is declared `chunkable` (it maps rows of its
+inputs to the same rows of its outputs), array inputs are split along the
+first axis and each chunk is pushed through the compiled plan on its own.
+Inputs may be in-memory arrays, memory-mapped arrays or paths to `.npy` files,
+which are opened memory mapped. Outputs are written chunk by chunk into
+preallocated arrays, or into `.npy` files opened with `open_memmap`.
+
+The chunk length is picked from a memory budget: a small probe chunk measures
+how many bytes one row costs across inputs, intermediates and outputs. Peak
+memory is then bounded by the budget instead of by the size of the data.
+Non-array inputs are passed unchanged to every chunk.
+"""
+
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.operation import CGFusedOperation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_PROBE_ROWS = 64
+
+
+def _nbytes(values) -> int:
+    return sum(value.nbytes for value in values if isinstance(value, numpy.ndarray))
+
+
+def chunked_compute(
+    network,
+    input_dict: Dict[str, Any],
+    outputs: List[str],
+    memory_budget: int,
+    out: Dict[str, Any] | None = None,
+) -> Dict[str, Any] | None:
+    # sourcery skip: default-mutable-arg
+    from computegraph.framework.network import sequential_compute
+
+    if numpy is None:
+        logging.error("chunked execution requires numpy")
+        return None
+
+    if not network.flag_compiled:
+        logging.error("graph not compiled")
+        return None
+
+    if not outputs:
+        logging.error("chunked execution needs the requested outputs")
+        return None
+
+    required_inputs, operation_steps = network.EvaluateComputationRequirements(list(input_dict), outputs)
+    if missing := set(required_inputs) - set(input_dict):
+        logging.error(f"Missing required inputs:`{tuple(missing)}`")
+        return None
+
+    if not_chunkable := [s.name for s in operation_steps if isinstance(s, BaseOperation) and not s.chunkable]:
+        logging.error(f"operations:`{not_chunkable}` are not chunkable")
+        return None
+
+    # .npy paths are opened memory mapped, nothing is read before a chunk needs it
+    inputs = {
+        name: numpy.load(value, mmap_mode="r") if isinstance(value, str) and value.endswith(".npy") else value
+        for name, value in input_dict.items()
+    }
+    chunked = {
+        name: value for name, value in inputs.items() if isinstance(value, numpy.ndarray) and value.ndim
+    }
+
+    lengths = {len(value) for value in chunked.values()}
+    if len(lengths) != 1:
+        logging.error(f"chunked inputs must share their first dimension, got:`{sorted(lengths)}`")
+        return None
+    n_rows = lengths.pop()
+
+    def chunk_inputs(start: int, stop: int) -> Dict[str, Any]:
+        return {
+            name: numpy.asarray(value[start:stop]) if name in chunked else value
+            for name, value in inputs.items()
+        }
+
+    # probe a few rows to estimate the memory of a row across the whole plan, intermediates included
+    probe_stop = min(n_rows, _PROBE_ROWS)
+    probe = chunk_inputs(0, probe_stop)
+    row_bytes = _nbytes(probe.values())
+    # fused steps keep their intermediates out of the cache, probe their operations one by one
+    for step in operation_steps:
+        for operation in step.operations if isinstance(step, CGFusedOperation) else [step]:
+            if isinstance(operation, BaseOperation):
+                try:
+                    temp_outputs = operation.Compute(probe)
+                except KeyError:
+                    # an operation before it failed, reported below by the missing outputs
+                    continue
+                row_bytes += _nbytes(temp_outputs.values())
+                probe |= temp_outputs
+    row_bytes /= max(1, probe_stop)
+
+    if any(output not in probe for output in outputs):
+        logging.error("probe chunk did not produce the requested outputs")
+        return None
+
+    chunk_rows = max(1, int(memory_budget // max(1.0, row_bytes)))
+    logging.debug(f"chunked execution of {n_rows} rows in chunks of {chunk_rows} rows")
+
+    destinations: Dict[str, Any] = {}
+    for output in outputs:
+        sample = numpy.asarray(probe[output])
+        shape = (n_rows,) + sample.shape[1:]
+        target = (out or {}).get(output, None)
+
+        if target is None:
+            destinations[output] = numpy.empty(shape, dtype=sample.dtype)
+        elif isinstance(target, str):
+            destinations[output] = numpy.lib.format.open_memmap(
+                target, mode="w+", dtype=sample.dtype, shape=shape
+            )
+        elif target.shape != shape:
+            logging.error(f"destination of output:`{output}` has shape:`{target.shape}`, expected:`{shape}`")
+            return None
+        else:
+            destinations[output] = target
+
+        destinations[output][:probe_stop] = sample
+
+    for start in range(probe_stop, n_rows, chunk_rows):
+        stop = min(n_rows, start + chunk_rows)
+        result = sequential_compute(chunk_inputs(start, stop), outputs, operation_steps, lambda *_: None)
+        missing = [output for output in outputs if result is None or output not in result]
+        if missing:
+            logging.error(f"chunk of rows:`{start}:{stop}` did not produce the outputs:`{missing}`")
+            return None
+        for output in outputs:
+            destinations[output][start:stop] = result[output]
+
+    for destination in destinations.values():
+        if isinstance(destination, numpy.memmap):
+            destination.flush()
+
+    return destinations
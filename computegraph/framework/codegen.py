@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   codegen.py
+# @Time    :   2026/10/19 23:41:07
+# _____________________________________________________________________________
+
+"""Ahead-of-time python code generation for requirement plans.
+
+A plan is written out as the source of one straight-line function: every data
+gets a local variable, every operation becomes a direct call of its function
+(attributes bound once with `functools.partial`) and every delete instruction
+a `del`. Fused chains are written operation by operation, aliases become
+assignments and baked constants are read from the function globals.
+
+The source is compiled once with `compile`/`exec` and kept on the plan for
+inspection; it is registered with `linecache` so tracebacks show the
+generated lines, until the plan is replaced and freed. The generated function
+does not catch errors and records no timings; the plan maps a raised error back
+to the operation whose call raised it.
+"""
+
+
+from __future__ import annotations
+
+import functools
+import itertools
+import keyword
+import linecache
+import weakref
+from typing import Any, Callable, Dict, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.operation import (
+    CGAliasOperation,
+    CGConstantOperation,
+    CGFusedOperation,
+    CGOperation,
+)
+
+_COUNTER = itertools.count()
+
+
+class CGGeneratedPlan:
+    def __init__(
+        self,
+        source: str,
+        function: Callable[[Dict[str, Any]], Dict[str, Any]],
+        filename: str,
+        calls: Dict[int, BaseOperation] | None = None,
+    ):
+        self._source = source
+        self._function = function
+        self._filename = filename
+        self._calls = dict(calls or {})  # source line number -> operation called there
+
+        # the lines of a freed plan are not kept for tracebacks anymore
+        weakref.finalize(self, linecache.cache.pop, filename, None)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    def __call__(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        return self._function(input_dict)
+
+    def FailedOperation(self, error: BaseException) -> BaseOperation | None:
+        # the operation whose call raised the error, from the innermost generated line of its traceback
+        operation = None
+        traceback = error.__traceback__
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == self._filename:
+                operation = self._calls.get(traceback.tb_lineno, operation)
+            traceback = traceback.tb_next
+        return operation
+
+
+class _Writer:
+    def __init__(self, provided_inputs: Tuple[str, ...]):
+        self.provided_inputs = set(provided_inputs)
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {}
+        self.variables: Dict[str, str] = {}  # data name -> local variable
+        self.deleted: List[str] = []
+        self.calls: Dict[int, BaseOperation] = {}  # line index -> operation called there
+        self._counter = itertools.count()
+
+    def Global(self, value: Any, prefix: str) -> str:
+        name = f"{prefix}{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def Available(self, name: str) -> bool:
+        return name in self.variables or name in self.provided_inputs
+
+    def Read(self, name: str) -> str:
+        # provided inputs are loaded on first use
+        if name not in self.variables:
+            self.variables[name] = variable = f"v{next(self._counter)}"
+            self.lines.append(f"{variable} = input_dict[{str(name)!r}]")
+        return self.variables[name]
+
+    def Assign(self, name: str) -> str:
+        self.variables[name] = variable = f"v{next(self._counter)}"
+        return variable
+
+    def Delete(self, name: str):
+        if (variable := self.variables.pop(name, None)) is not None:
+            self.lines.append(f"del {variable}")
+        self.deleted.append(name)
+
+    def Call(self, operation: CGOperation):
+        function = operation.function
+        if operation.attr_dict:
+            function = functools.partial(function, **operation.attr_dict)
+
+        arguments = []
+        for input_ in operation.inputs:
+            if not isinstance(input_, CGOperation.Modifiers.OptionalData):
+                arguments.append(self.Read(input_))
+            elif self.Available(input_):
+                # absent optional inputs are left to the default of the function
+                value = self.Read(input_)
+                keyword_ = input_.isidentifier() and not keyword.iskeyword(input_)
+                arguments.append(f"{input_}={value}" if keyword_ else f"**{{{str(input_)!r}: {value}}}")
+        if operation.demand:
+            arguments.append(f"outputs={self.Global(list(operation.outputs), 'c')}")
+
+        call = f"{self.Global(function, 'f')}({', '.join(arguments)})"
+        self.calls[len(self.lines)] = operation
+        if operation.demand:
+            self.lines.append(f"result = {call}")
+            self.lines.extend(f"{self.Assign(o)} = result[{str(o)!r}]" for o in operation.outputs)
+        elif len(operation.outputs) == 1:
+            self.lines.append(f"{self.Assign(operation.outputs[0])} = {call}")
+        else:
+            self.lines.append(f"{', '.join(self.Assign(o) for o in operation.outputs)}, = {call}")
+
+    def Step(self, step: Any, process_data: type):
+        if isinstance(step, process_data):
+            return
+        if isinstance(step, CGConstantOperation):
+            for name, value in step.values.items():
+                self.lines.append(f"{self.Assign(name)} = {self.Global(value, 'c')}")
+        elif isinstance(step, CGFusedOperation):
+            for operation in step.operations:
+                self.Call(operation)
+            # intermediates of a chain never outlive it, as in the interpreter
+            for intermediate in step.intermediates:
+                self.lines.append(f"del {self.variables.pop(intermediate)}")
+        elif isinstance(step, CGAliasOperation):
+            values = [self.Read(input_) for input_ in step.inputs]
+            for output, value in zip(step.outputs, values):
+                self.lines.append(f"{self.Assign(output)} = {value}")
+        elif isinstance(step, CGOperation):
+            self.Call(step)
+        elif isinstance(step, BaseOperation):
+            # operations of other kinds keep their own Compute
+            inputs = ", ".join(f"{str(i)!r}: {self.Read(i)}" for i in step.inputs if self.Available(i))
+            self.calls[len(self.lines)] = step
+            self.lines.append(f"result = {self.Global(step, 'o')}.Compute({{{inputs}}})")
+            self.lines.extend(f"{self.Assign(o)} = result[{str(o)!r}]" for o in step.outputs)
+        else:
+            self.Delete(str(step))
+
+
+def GeneratePlan(
+    provided_inputs: Tuple[str, ...], outputs: Tuple[str, ...], steps: Tuple, name: str = "plan"
+) -> CGGeneratedPlan:
+    # imported here, network imports this module lazily
+    from computegraph.framework.network import CGNetwork
+
+    writer = _Writer(provided_inputs)
+    for step in steps:
+        writer.Step(step, CGNetwork.ProcessData)
+
+    if outputs:
+        returned = ", ".join(f"{str(o)!r}: {writer.Read(o)}" for o in outputs if writer.Available(o))
+        writer.lines.append(f"return {{{returned}}}")
+    else:
+        # like the interpreter, everything still alive is returned with the inputs
+        writer.lines.append("values = dict(input_dict)")
+        writer.lines.extend(
+            f"values.pop({str(n)!r}, None)" for n in writer.deleted if n in writer.provided_inputs
+        )
+        produced = ", ".join(
+            f"{str(n)!r}: {v}" for n, v in writer.variables.items() if n not in writer.provided_inputs
+        )
+        writer.lines.append(f"values.update({{{produced}}})")
+        writer.lines.append("return values")
+
+    header = f"# inputs: {', '.join(provided_inputs)}\n# outputs: {', '.join(outputs) or '*'}\n"
+    source = header + "def plan(input_dict):\n" + "".join(f"    {line}\n" for line in writer.lines)
+    # the body starts after the two header lines and the signature
+    calls = {index + 4: operation for index, operation in writer.calls.items()}
+
+    filename = f"<computegraph:{name}:{next(_COUNTER)}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    namespace = dict(writer.namespace)
+    exec(compile(source, filename, "exec"), namespace)
+    return CGGeneratedPlan(source, namespace["plan"], filename, calls)
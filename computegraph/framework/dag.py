@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   dag.py
+# @Time    :   2026/10/19 17:05:48
+# _____________________________________________________________________________
+
+"""Directed acyclic graph store used by compute networks.
+
+Nodes are arbitrary hashable keys mapped to integer ids; the ids of removed
+nodes are given to the next added ones, so the id range stays as large as the
+graph. Adjacency is kept as per-node id lists while the graph is edited and
+frozen into CSR (offsets/targets) arrays for traversal, so ancestor/descendant
+queries only touch integer arrays. A topological order is maintained on every edge
+insertion with the Pearce-Kelly dynamic ordering algorithm, which only
+reorders the region between the two endpoints and rejects edges that would
+close a cycle. `ToNetworkx` exports a `networkx.DiGraph` copy for
+visualization and debugging.
+"""
+
+
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate, chain
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+
+def _csr(adjacency: List[List[int]]) -> Tuple[array, array]:
+    offsets = array("q", accumulate(map(len, adjacency), initial=0))
+    targets = array("q", chain.from_iterable(adjacency))
+    return offsets, targets
+
+
+class CGDag:
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}
+        self._keys: List[Any] = []
+        self._succ: List[List[int]] = []
+        self._pred: List[List[int]] = []
+        self._n_edges = 0
+        self._frozen: Tuple[Tuple[array, array], Tuple[array, array]] | None = None
+
+        # topological position of each node id, and node id at each position (-1 for removed nodes)
+        self._position: List[int] = []
+        self._order: List[int] = []
+        self._n_removed = 0
+        self._free: List[int] = []  # ids of removed nodes, reused by the next added nodes
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    @property
+    def nodes(self) -> List[Any]:
+        return [self._keys[i] for i in self._order if i >= 0]
+
+    @property
+    def id_bound(self) -> int:
+        return len(self._keys)
+
+    @property
+    def n_edges(self) -> int:
+        return self._n_edges
+
+    def HasNode(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def GetId(self, key: Hashable) -> int | None:
+        return self._ids.get(key, None)
+
+    def GetKey(self, node_id: int) -> Any:
+        return self._keys[node_id]
+
+    def AddNode(self, key: Hashable) -> int:
+        if (node_id := self._ids.get(key, None)) is not None:
+            return node_id
+
+        if self._free:
+            node_id = self._free.pop()
+            self._keys[node_id] = key
+            self._position[node_id] = len(self._order)
+        else:
+            node_id = len(self._keys)
+            self._keys.append(key)
+            self._succ.append([])
+            self._pred.append([])
+            self._position.append(len(self._order))
+        self._ids[key] = node_id
+        self._order.append(node_id)
+        self._frozen = None
+        return node_id
+
+    def RemoveNode(self, key: Hashable):
+        node_id = self._ids.pop(key)
+
+        for v in self._succ[node_id]:
+            self._pred[v].remove(node_id)
+        for u in self._pred[node_id]:
+            self._succ[u].remove(node_id)
+
+        self._n_edges -= len(self._succ[node_id]) + len(self._pred[node_id])
+        self._succ[node_id] = []
+        self._pred[node_id] = []
+        self._keys[node_id] = None
+        self._order[self._position[node_id]] = -1
+        self._position[node_id] = -1
+        self._n_removed += 1
+        self._free.append(node_id)
+        self._frozen = None
+
+        # drop the holes once they make up half of the order
+        if 2 * self._n_removed > len(self._order):
+            self._order = [i for i in self._order if i >= 0]
+            for position, i in enumerate(self._order):
+                self._position[i] = position
+            self._n_removed = 0
+
+    def AddEdge(self, source: Hashable, target: Hashable) -> Tuple[int, int]:
+        u = self.AddNode(source)
+        v = self.AddNode(target)
+
+        if u == v:
+            raise ValueError(f"edge `{source}`->`{target}` would create a cycle")
+
+        # duplicate check on the shorter list, data nodes can have thousands of consumers
+        if len(self._succ[u]) <= len(self._pred[v]):
+            exists = v in self._succ[u]
+        else:
+            exists = u in self._pred[v]
+
+        if not exists:
+            if self._position[v] < self._position[u]:
+                self._Reorder(u, v)
+            self._succ[u].append(v)
+            self._pred[v].append(u)
+            self._n_edges += 1
+            self._frozen = None
+        return u, v
+
+    def _Reorder(self, u: int, v: int):
+        position = self._position
+        lower, upper = position[v], position[u]
+
+        # nodes reachable from v that are currently ordered before u
+        forward, seen, stack = [], {v}, [v]
+        while stack:
+            n = stack.pop()
+            forward.append(n)
+            for w in self._succ[n]:
+                if w == u:
+                    raise ValueError(f"edge `{self._keys[u]}`->`{self._keys[v]}` would create a cycle")
+                if w not in seen and position[w] < upper:
+                    seen.add(w)
+                    stack.append(w)
+
+        # nodes reaching u that are currently ordered after v
+        backward, seen, stack = [], {u}, [u]
+        while stack:
+            n = stack.pop()
+            backward.append(n)
+            for w in self._pred[n]:
+                if w not in seen and position[w] > lower:
+                    seen.add(w)
+                    stack.append(w)
+
+        # the affected nodes keep their slots, the backward set moves in front of the forward set
+        forward.sort(key=position.__getitem__)
+        backward.sort(key=position.__getitem__)
+        nodes = backward + forward
+        slots = sorted(position[n] for n in nodes)
+        for n, slot in zip(nodes, slots):
+            position[n] = slot
+            self._order[slot] = n
+
+    def Successors(self, key: Hashable) -> List[Any]:
+        return [self._keys[i] for i in self._succ[self._ids[key]]]
+
+    def Predecessors(self, key: Hashable) -> List[Any]:
+        return [self._keys[i] for i in self._pred[self._ids[key]]]
+
+    def SuccessorIds(self, node_id: int) -> List[int]:
+        return self._succ[node_id]
+
+    def PredecessorIds(self, node_id: int) -> List[int]:
+        return self._pred[node_id]
+
+    def InDegree(self, key: Hashable) -> int:
+        return len(self._pred[self._ids[key]])
+
+    def OutDegree(self, key: Hashable) -> int:
+        return len(self._succ[self._ids[key]])
+
+    def Freeze(self) -> Tuple[Tuple[array, array], Tuple[array, array]]:
+        if self._frozen is None:
+            self._frozen = (_csr(self._succ), _csr(self._pred))
+        return self._frozen
+
+    def TopologicalIds(self) -> List[int]:
+        return [i for i in self._order if i >= 0]
+
+    def Position(self, key: Hashable) -> int:
+        return self._position[self._ids[key]]
+
+    def TopologicalSort(self) -> List[Any]:
+        keys = self._keys
+        return [keys[i] for i in self.TopologicalIds()]
+
+    def _Reach(self, node_ids: Iterable[int], backward: bool) -> bytearray:
+        successors, predecessors = self.Freeze()
+        offsets, targets = predecessors if backward else successors
+        mask = bytearray(len(self._keys))
+
+        stack = []
+        for node_id in node_ids:
+            stack.extend(targets[offsets[node_id] : offsets[node_id + 1]])
+
+        while stack:
+            u = stack.pop()
+            if mask[u]:
+                continue
+            mask[u] = 1
+            stack.extend(v for v in targets[offsets[u] : offsets[u + 1]] if not mask[v])
+        return mask
+
+    def AncestorMask(self, keys: Iterable[Hashable]) -> bytearray:
+        return self._Reach((self._ids[k] for k in keys if k in self._ids), backward=True)
+
+    def DescendantMask(self, keys: Iterable[Hashable]) -> bytearray:
+        return self._Reach((self._ids[k] for k in keys if k in self._ids), backward=False)
+
+    def Ancestors(self, key: Hashable) -> Set[Any]:
+        mask = self.AncestorMask([key])
+        return {self._keys[i] for i in range(len(mask)) if mask[i]}
+
+    def Descendants(self, key: Hashable) -> Set[Any]:
+        mask = self.DescendantMask([key])
+        return {self._keys[i] for i in range(len(mask)) if mask[i]}
+
+    def ToNetworkx(self):
+        import networkx
+
+        graph = networkx.DiGraph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(
+            (self._keys[u], self._keys[v]) for u, successors in enumerate(self._succ) for v in successors
+        )
+        return graph
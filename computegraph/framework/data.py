@@ -34,20 +34,30 @@ Todo:
 
 
 from __future__ import annotations
-from typing import Any
+from typing import Any, Callable
 
 from computegraph.framework.base import BaseDataInterface
+from computegraph.framework.inference import ChangeDetector, DataType
 
 
 class CGDataInterface(BaseDataInterface):
+    _changed: Callable[[Any, Any], bool] | None = None
+
     def GetValue(self) -> Any:
         return self.data_item.GetValue()
 
     def SetValue(self, value: Any):
         self.data_item.SetValue(value)
+        self._Touch()
+
+    def Changed(self, value: Any) -> bool:
+        # the comparison is picked once from the type of the data item
+        if self._changed is None:
+            self._changed = ChangeDetector(DataType(self.data_item))
+        return self._changed(self.data_item.GetValue(), value)
 
     def UpdateValue(self, value: Any):
-        current_value = self.data_item.GetValue()
-        if current_value != value:
+        if self.Changed(value):
             self.data_item.SetValue(value)
+            self._Touch()
             self.parent_node.Evaluate(self.name)
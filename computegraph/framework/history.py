@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   history.py
+# @Time    :   2026/10/20 02:14:38
+# _____________________________________________________________________________
+
+"""Structurally shared snapshots of node graphs and networks, for undo and redo.
+
+A `CGHistory` keeps the state of every tracked item (nodes with their sockets
+and data interfaces, networks) in a persistent hash trie mapping the item to
+an immutable tuple. Mutators of a tracked item mark it dirty, a snapshot copies
+only the trie paths of the items marked since the previous one and shares the
+rest: time and memory are O(changes), times the trie depth (log32 of the
+number of items).
+
+Restoring compares the trie of the current state with the one of the target,
+skipping shared subtrees, and writes back the items that differ only. The
+state of a network holds its operations, in a trie of their own, and its
+compiled plan (steps, requirement cache, reachability index, generated plans);
+a restore adds or removes the operations that differ and reinstalls the plan
+without compiling.
+
+Values are kept by reference, a value mutated in place is not seen. Restored
+data interfaces are set without evaluating their node, the restored values are
+consistent already.
+"""
+
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from computegraph.framework.base import BaseDataInterface, BaseNetwork, BaseNode, BaseSocket
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_EMPTY_NODE = (None,) * (1 << _BITS)
+_MISSING = object()
+
+
+class _Leaf:
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, hash_: int, key: Any, value: Any):
+        self.hash = hash_
+        self.key = key
+        self.value = value
+
+
+class _Bucket:
+    # leaves of keys with the same hash, below the last level
+    __slots__ = ("hash", "leaves")
+
+    def __init__(self, hash_: int, leaves: Tuple[_Leaf, ...]):
+        self.hash = hash_
+        self.leaves = leaves
+
+
+def _Hash(key: Any) -> int:
+    return hash(key) & 0xFFFFFFFFFFFFFFFF
+
+
+def _Set(node: Any, shift: int, leaf: _Leaf) -> Tuple[Any, bool]:
+    # path copying, returns the new node and whether the key is new
+    if node is None:
+        node = _EMPTY_NODE
+    i = (leaf.hash >> shift) & _MASK
+    entry = node[i]
+
+    added = False
+    if entry is None:
+        entry, added = leaf, True
+    elif type(entry) is _Leaf:
+        if entry.key is leaf.key or entry.key == leaf.key:
+            if entry.value is leaf.value:
+                return node, False
+            entry = leaf
+        elif entry.hash == leaf.hash:
+            entry, added = _Bucket(leaf.hash, (entry, leaf)), True
+        else:
+            entry, _ = _Set(_Set(None, shift + _BITS, entry)[0], shift + _BITS, leaf)
+            added = True
+    elif type(entry) is _Bucket:
+        leaves = tuple(l for l in entry.leaves if not (l.key is leaf.key or l.key == leaf.key))
+        added = len(leaves) == len(entry.leaves)
+        entry = _Bucket(entry.hash, (*leaves, leaf))
+    else:
+        child, added = _Set(entry, shift + _BITS, leaf)
+        if child is entry:
+            return node, False
+        entry = child
+    return node[:i] + (entry,) + node[i + 1 :], added
+
+
+def _Remove(node: Any, shift: int, hash_: int, key: Any) -> Tuple[Any, bool]:
+    if node is None:
+        return None, False
+    i = (hash_ >> shift) & _MASK
+    entry = node[i]
+
+    if entry is None:
+        return node, False
+    if type(entry) is _Leaf:
+        if not (entry.key is key or entry.key == key):
+            return node, False
+        entry = None
+    elif type(entry) is _Bucket:
+        leaves = tuple(l for l in entry.leaves if not (l.key is key or l.key == key))
+        if len(leaves) == len(entry.leaves):
+            return node, False
+        entry = _Bucket(entry.hash, leaves) if len(leaves) > 1 else leaves[0]
+    else:
+        entry, removed = _Remove(entry, shift + _BITS, hash_, key)
+        if not removed:
+            return node, False
+        if entry == _EMPTY_NODE:
+            entry = None
+
+    node = node[:i] + (entry,) + node[i + 1 :]
+    return (None if node == _EMPTY_NODE else node), True
+
+
+def _Leaves(entry: Any) -> Iterator[_Leaf]:
+    if entry is None:
+        return
+    if type(entry) is _Leaf:
+        yield entry
+    elif type(entry) is _Bucket:
+        yield from entry.leaves
+    else:
+        for child in entry:
+            yield from _Leaves(child)
+
+
+def _Diff(a: Any, b: Any) -> Iterator[Tuple[Any, Any, Any]]:
+    # shared subtrees hold the same items in the same states, they are never entered
+    if a is b:
+        return
+    if type(a) is tuple and type(b) is tuple:
+        for x, y in zip(a, b):
+            yield from _Diff(x, y)
+        return
+
+    left = {id(leaf.key): leaf for leaf in _Leaves(a)}
+    right = {id(leaf.key): leaf for leaf in _Leaves(b)}
+    for key_id, leaf in left.items():
+        other = right.get(key_id, None)
+        if other is None:
+            yield leaf.key, leaf.value, _MISSING
+        elif other.value is not leaf.value:
+            yield leaf.key, leaf.value, other.value
+    for key_id, leaf in right.items():
+        if key_id not in left:
+            yield leaf.key, _MISSING, leaf.value
+
+
+class CGPersistentMap:
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root: Any = None, size: int = 0):
+        self._root = root
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        return self.Get(key, _MISSING) is not _MISSING
+
+    def Get(self, key: Any, default: Any = None) -> Any:
+        hash_ = _Hash(key)
+        node, shift = self._root, 0
+        while type(node) is tuple:
+            node = node[(hash_ >> shift) & _MASK]
+            shift += _BITS
+        for leaf in _Leaves(node):
+            if leaf.key is key or leaf.key == key:
+                return leaf.value
+        return default
+
+    def Set(self, key: Any, value: Any) -> CGPersistentMap:
+        root, added = _Set(self._root, 0, _Leaf(_Hash(key), key, value))
+        return self if root is self._root else CGPersistentMap(root, self._size + added)
+
+    def Remove(self, key: Any) -> CGPersistentMap:
+        root, removed = _Remove(self._root, 0, _Hash(key), key)
+        return CGPersistentMap(root, self._size - 1) if removed else self
+
+    def Items(self) -> Iterator[Tuple[Any, Any]]:
+        for leaf in _Leaves(self._root):
+            yield leaf.key, leaf.value
+
+    def Diff(self, other: CGPersistentMap) -> Iterator[Tuple[Any, Any, Any]]:
+        # (key, value here, value in other) of every key whose value is not the same object
+        return _Diff(self._root, other._root)
+
+
+class CGSnapshot:
+    def __init__(self, version: int, states: CGPersistentMap):
+        self._version = version
+        self._states = states
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def states(self) -> CGPersistentMap:
+        return self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def Changed(self, other: CGSnapshot) -> List[Any]:
+        # items in a different state in the other snapshot
+        return [item for item, _, _ in self._states.Diff(other._states)]
+
+
+def _Same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    if type(a) is tuple and type(b) is tuple:
+        return len(a) == len(b) and all(_Same(x, y) for x, y in zip(a, b))
+    if type(a) is frozenset and type(b) is frozenset:
+        return a == b
+    return False
+
+
+class CGHistory:
+    def __init__(self, items: Iterable[Any] = ()):
+        self._states = CGPersistentMap()
+        self._dirty: Dict[Any, None] = {}
+        self._operation_changes: Dict[BaseNetwork, Dict[Any, bool]] = {}
+        self._restoring = False
+        self._versions: List[CGSnapshot] = []
+        self._cursor = -1
+        self._n_snapshots = 0
+
+        for item in items:
+            self.Track(item)
+
+    @property
+    def versions(self) -> List[CGSnapshot]:
+        return self._versions
+
+    @property
+    def n_dirty(self) -> int:
+        return len(self._dirty)
+
+    @property
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._versions) - 1
+
+    def Track(self, item: Any):
+        # a node is tracked with its sockets and data interfaces
+        if item._history is self:
+            return
+        item._history = self
+        self._dirty[item] = None
+
+    def Touch(self, item: Any, operation: Any = None, added: bool = True):
+        if self._restoring:
+            return
+        self._dirty[item] = None
+        if operation is not None:
+            self._operation_changes.setdefault(item, {})[operation] = added
+
+    def Snapshot(self) -> CGSnapshot:
+        states = self._states
+        while self._dirty:
+            item = next(iter(self._dirty))
+            del self._dirty[item]
+            previous = states.Get(item, None)
+            state = self._Capture(item, previous)
+            if previous is None or not _Same(previous, state):
+                states = states.Set(item, state)
+
+        self._states = states
+        self._n_snapshots += 1
+        return CGSnapshot(self._n_snapshots, states)
+
+    def Restore(self, snapshot: CGSnapshot):
+        current = self.Snapshot()
+        self._restoring = True
+        try:
+            # networks last, their operations may belong to restored nodes
+            changed = [(item, state) for item, _, state in current.states.Diff(snapshot.states)]
+            changed.sort(key=lambda entry: isinstance(entry[0], BaseNetwork))
+            for item, state in changed:
+                # items tracked after the snapshot are left as they are, nothing restored refers to them
+                if state is not _MISSING:
+                    self._Apply(item, current.states.Get(item, None), state)
+        finally:
+            self._restoring = False
+
+        self._states = snapshot.states
+        self._dirty.clear()
+        self._operation_changes.clear()
+
+    def Commit(self) -> CGSnapshot:
+        # a new version, the versions that could be redone are dropped
+        snapshot = self.Snapshot()
+        del self._versions[self._cursor + 1 :]
+        self._versions.append(snapshot)
+        self._cursor = len(self._versions) - 1
+        return snapshot
+
+    def Undo(self) -> CGSnapshot | None:
+        # changes not committed are discarded
+        if not self.can_undo:
+            return None
+        self._cursor -= 1
+        self.Restore(self._versions[self._cursor])
+        return self._versions[self._cursor]
+
+    def Redo(self) -> CGSnapshot | None:
+        if not self.can_redo:
+            return None
+        self._cursor += 1
+        self.Restore(self._versions[self._cursor])
+        return self._versions[self._cursor]
+
+    def _Capture(self, item: Any, previous: Any) -> Any:
+        if isinstance(item, BaseNode):
+            for child in (*item.sockets, *item.data_interfaces):
+                self.Track(child)
+            return (item.name, tuple(item.sockets), tuple(item.data_interfaces), tuple(item.operations))
+
+        if isinstance(item, BaseSocket):
+            return (item.name, item.data_interface, frozenset(item.connections))
+
+        if isinstance(item, BaseDataInterface):
+            return (item.name, item.data_item, item.data_item.GetValue())
+
+        if isinstance(item, BaseNetwork):
+            return self._CaptureNetwork(item, previous)
+
+        raise TypeError(f"item:`{item}` cannot be tracked")
+
+    def _CaptureNetwork(self, network: BaseNetwork, previous: Any) -> Any:
+        # operations by their changes since the last snapshot, once a snapshot holds the network
+        changes = self._operation_changes.pop(network, {})
+        if previous is None:
+            operations = CGPersistentMap()
+            for operation in network.operations:
+                operations = operations.Set(operation, True)
+        else:
+            operations = previous[1]
+            for operation, added in changes.items():
+                operations = operations.Set(operation, True) if added else operations.Remove(operation)
+
+        with network._plan_lock:
+            plan = (
+                network._ordered_steps,
+                network._ordered_step_ids,
+                network._flag_compiled,
+                network._flag_optimized,
+                network._flag_plan_stale,
+                network._constants,
+                network._types,
+                network._cached_requirements,
+                network._reachability,
+                network._generated_plans,
+            )
+            subnetworks = tuple(network._subnetworks.items())
+        return (network.name, operations, plan, subnetworks)
+
+    def _Apply(self, item: Any, current: Any, state: Any):
+        if isinstance(item, BaseNode):
+            item._name = state[0]
+            item._sockets, item._data_interfaces, item._operations = (list(s) for s in state[1:])
+        elif isinstance(item, BaseSocket):
+            item._name, item._data_interface = state[0], state[1]
+            item._connections = set(state[2])
+        elif isinstance(item, BaseDataInterface):
+            item._name, item._data_item = state[0], state[1]
+            item.data_item.SetValue(state[2])
+        elif isinstance(item, BaseNetwork):
+            self._ApplyNetwork(item, current, state)
+
+    def _ApplyNetwork(self, network: BaseNetwork, current: Any, state: Any):
+        name, operations, plan, subnetworks = state
+        with network._plan_lock:
+            # only the operations that differ enter or leave the graph
+            changed = list(current[1].Diff(operations)) if current is not None else []
+            for operation, _, target in changed:
+                if target is _MISSING:
+                    network.RemoveOperation(operation)
+            for operation, present, _ in changed:
+                if present is _MISSING:
+                    network.AddOperation(operation)
+
+            network._name = name
+            (
+                network._ordered_steps,
+                network._ordered_step_ids,
+                network._flag_compiled,
+                network._flag_optimized,
+                network._flag_plan_stale,
+                network._constants,
+                network._types,
+                network._cached_requirements,
+                network._reachability,
+                network._generated_plans,
+            ) = plan
+            network._subnetworks = dict(subnetworks)
+
+            # operations added again got new graph ids
+            if changed and not network._flag_plan_stale:
+                network._ordered_step_ids = network._StepIds(network._ordered_steps)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   inference.py
+# @Time    :   2026/10/20 03:02:51
+# _____________________________________________________________________________
+
+"""Type propagation over node graphs and networks, and the fast paths it selects.
+
+A data item tells its type with `GetType()`; an operation declares the types of
+its inputs and outputs by data name in `types`, or through the annotations of
+its function. Types flow from the producer of a data, or from a compile time
+constant, to its consumers: a consumer expecting a type the producer does not
+give is a mismatch. Sockets are checked when they connect, networks when an
+operation is added and when they compile. A mismatch between declared types
+is rejected; one involving an annotation, which nothing enforces at runtime,
+is only warned about. Unknown types are compatible with everything, an untyped
+graph is never rejected.
+
+The known type of a data interface also picks how a new value is compared with
+the current one: `!=` for scalars, an element wise comparison for arrays.
+"""
+
+
+from __future__ import annotations
+
+import functools
+import logging
+import numbers
+import operator
+import sys
+import typing
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.operation import CGOperation, _Signature
+
+SCALAR_TYPES = (bool, int, float, complex, str, bytes)
+
+
+def DataType(item: Any) -> type | None:
+    # type of a data item, of the data item of an interface or of the interface of a socket
+    item = getattr(item, "data_interface", item)
+    item = getattr(item, "data_item", item)
+    get_type = getattr(item, "GetType", None)
+    data_type = get_type() if get_type is not None else None
+    return data_type if isinstance(data_type, type) else None
+
+
+def Compatible(source: type | None, target: type | None) -> bool:
+    # whether a value of type `source` can be given where `target` is expected
+    if source is None or target is None or target is object:
+        return True
+    if issubclass(source, target):
+        return True
+    # numeric widening, an int where a float is expected
+    if target is float:
+        return issubclass(source, numbers.Real)
+    if target is complex:
+        return issubclass(source, numbers.Complex)
+    return False
+
+
+def OperationTypes(operation: BaseOperation) -> Dict[str, type]:
+    # declared types, completed by the annotations of the function
+    types = dict(_AnnotatedTypes(operation))
+    types.update(operation.types)
+    return types
+
+
+@functools.lru_cache(maxsize=1024)
+def _CachedHints(function: Callable) -> Dict[str, Any]:
+    try:
+        return typing.get_type_hints(function)
+    except Exception:
+        # builtins, callables without annotations or with unresolvable ones
+        return {}
+
+
+def _Hints(function: Callable) -> Dict[str, Any]:
+    try:
+        return _CachedHints(function)
+    except TypeError:
+        # unhashable callables are inspected every time
+        return _CachedHints.__wrapped__(function)
+
+
+def _AnnotatedTypes(operation: BaseOperation) -> List[Tuple[str, type]]:
+    hints = _Hints(operation.function)
+    if not hints:
+        return []
+    signature = _Signature(operation.function)
+    if signature is None:
+        return []
+
+    # required inputs are passed by position, in the order of the parameters
+    required = [n for n in operation.inputs if not isinstance(n, CGOperation.Modifiers.OptionalData)]
+    annotated = [(n, hints.get(p, None)) for n, p in zip(required, signature.parameters)]
+    if len(operation.outputs) == 1:
+        annotated.append((operation.outputs[0], hints.get("return", None)))
+    return [(n, t) for n, t in annotated if isinstance(t, type)]
+
+
+def CheckOperation(
+    operation: BaseOperation,
+    producers: Dict[str, List[BaseOperation]],
+    consumers: Dict[str, List[BaseOperation]],
+) -> List[str]:
+    # mismatches of one operation with the producers of its inputs and the consumers of its outputs
+    types = OperationTypes(operation)
+    errors: List[str] = []
+    for input_ in operation.inputs:
+        for producer in producers.get(input_, []):
+            produced = OperationTypes(producer).get(input_, None)
+            if not Compatible(produced, types.get(input_, None)):
+                declared = input_ in producer.types and input_ in operation.types
+                _Report(errors, _Mismatch(input_, producer, produced, operation, types[input_]), declared)
+    for output in operation.outputs:
+        for consumer in consumers.get(output, []):
+            expected = OperationTypes(consumer).get(output, None)
+            if not Compatible(types.get(output, None), expected):
+                declared = output in operation.types and output in consumer.types
+                _Report(errors, _Mismatch(output, operation, types[output], consumer, expected), declared)
+    return errors
+
+
+def InferTypes(
+    operations: Iterable[BaseOperation], constants: Dict[str, Any] | None = None
+) -> Tuple[Dict[str, type], List[str]]:
+    # operations in topological order, returns the type of every data whose type is known and the mismatches
+    produced: Dict[str, type] = {n: type(v) for n, v in (constants or {}).items()}
+    producer_of: Dict[str, Any] = {n: "constant" for n in produced}
+    declared = set(produced)
+    expected: Dict[str, type] = {}
+    errors: List[str] = []
+
+    for operation in operations:
+        types = OperationTypes(operation)
+        for input_ in operation.inputs:
+            if (target := types.get(input_, None)) is None:
+                continue
+            if input_ in produced:
+                if not Compatible(produced[input_], target):
+                    mismatch = _Mismatch(input_, producer_of[input_], produced[input_], operation, target)
+                    _Report(errors, mismatch, input_ in declared and input_ in operation.types)
+            else:
+                expected.setdefault(input_, target)
+        for output in operation.outputs:
+            if (source := types.get(output, None)) is not None:
+                produced[output] = source
+                producer_of[output] = operation
+                if output in operation.types:
+                    declared.add(output)
+                else:
+                    declared.discard(output)
+
+    return {**expected, **produced}, errors
+
+
+def _Report(errors: List[str], mismatch: str, declared: bool):
+    # annotations are not enforced by anything, a value of another type may well work
+    if declared:
+        errors.append(mismatch)
+    else:
+        logging.warning(f"{mismatch}, by annotation only")
+
+
+def _Mismatch(data: str, producer: Any, source: type, consumer: BaseOperation, target: type) -> str:
+    producer = getattr(producer, "name", producer)
+    return (
+        f"data:`{data}` produced as `{source.__name__}` by `{producer}`"
+        f" is read as `{target.__name__}` by `{consumer.name}`"
+    )
+
+
+def _Changed(current: Any, value: Any) -> bool:
+    # any value, arrays compare element wise instead of raising on `!=`
+    if current is value:
+        return False
+    # an array exists only once numpy is imported, importing it here would slow every node import down
+    numpy = sys.modules.get("numpy", None)
+    if numpy is not None and (isinstance(current, numpy.ndarray) or isinstance(value, numpy.ndarray)):
+        return not (
+            isinstance(current, numpy.ndarray)
+            and isinstance(value, numpy.ndarray)
+            and current.shape == value.shape
+            and numpy.array_equal(current, value)
+        )
+    try:
+        return bool(current != value)
+    except ValueError:
+        return True
+
+
+def ChangeDetector(data_type: type | None) -> Callable[[Any, Any], bool]:
+    # `(current, value) -> changed` for values of a known type
+    # scalars skip the identity and array checks, everything else is compared by `_Changed`
+    if data_type is not None and issubclass(data_type, SCALAR_TYPES):
+        return operator.ne
+    return _Changed
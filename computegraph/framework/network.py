@@ -34,15 +34,49 @@ Todo:
 
 
 from __future__ import annotations
+from collections import Counter
+from collections import OrderedDict as ordered_dict
 from enum import IntEnum, auto
 
+import heapq
 import logging
+import os
 import time
-from typing import Any, Callable, Dict, List, Tuple, Union
-
-import networkx as nx
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    OrderedDict,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from computegraph.framework.base import BaseNetwork, BaseOperation
+from computegraph.framework.inference import CheckOperation, InferTypes, OperationTypes
+from computegraph.framework.operation import (
+    CGAliasOperation,
+    CGConstantOperation,
+    CGFusedOperation,
+    CGOperation,
+    CGOperationError,
+)
+from computegraph.framework.reachability import CGReachabilityIndex
+from computegraph.framework.scheduler import CGCostModel, CGListScheduler, CGResourceBudget
+
+if TYPE_CHECKING:
+    from computegraph.framework.batch import CGBatcher
+    from computegraph.framework.codegen import CGGeneratedPlan
+    from computegraph.framework.cache import CGResultCache
+    from computegraph.framework.checkpoint import CGCheckpoint
+    from computegraph.framework.sweep import CGSweepResult
 
 
 class CGNetwork(BaseNetwork):
@@ -58,56 +92,671 @@ class CGNetwork(BaseNetwork):
         SEQUENTIAL = auto()
         PARALLEL = auto()
         DISTRUBUTED = auto()
+        GENERATED = auto()
+
+    @property
+    def ordered_steps(self) -> List[Any]:
+        if self._flag_plan_stale:
+            with self._plan_lock:
+                if self._flag_plan_stale:
+                    self._BuildPlan()
+        return self._ordered_steps
 
     def AddOperation(self, operation: BaseOperation):
-        if operation in self._graph.nodes:
+        if isinstance(operation, CGNetworkOperation):
+            self._AddNetworkOperation(operation)
+            return
+
+        graph = self._graph
+        if graph.HasNode(operation):
             logging.error("Operation can only be added once")
             return
 
-        for n in operation.inputs:
-            self._graph.add_edge(CGNetwork.ProcessData(n), operation)
+        # declared types are checked against the neighbours the operation would have
+        producers = {
+            n: list(graph.Predecessors(CGNetwork.ProcessData(n)))
+            for n in operation.inputs
+            if graph.HasNode(CGNetwork.ProcessData(n))
+        }
+        consumers = {
+            n: list(graph.Successors(CGNetwork.ProcessData(n)))
+            for n in operation.outputs
+            if graph.HasNode(CGNetwork.ProcessData(n))
+        }
+        if errors := CheckOperation(operation, producers, consumers):
+            logging.error(f"cannot add operation:`{operation.name}`, {'; '.join(errors)}")
+            return
 
-        for p in operation.outputs:
-            self._graph.add_edge(operation, CGNetwork.ProcessData(p))
+        new_data = [
+            CGNetwork.ProcessData(n) for n in (*operation.inputs, *operation.outputs) if not graph.HasNode(n)
+        ]
 
-        self._flag_compiled = False
+        # the topological order is maintained edge by edge, a cycle is rejected before it enters the graph
+        try:
+            for n in operation.inputs:
+                graph.AddEdge(CGNetwork.ProcessData(n), operation)
+
+            for p in operation.outputs:
+                graph.AddEdge(operation, CGNetwork.ProcessData(p))
+        except ValueError as e:
+            logging.error(f"cannot add operation:`{operation.name}`, {e}")
+            graph.RemoveNode(operation)
+            for data in new_data:
+                if graph.HasNode(data):
+                    graph.RemoveNode(data)
+            return
+
+        self._Touch(operation, True)
+        self._PatchPlan(operation, True)
 
     def AddOperations(self, operations: List[BaseOperation]):
         for operation in operations:
             self.AddOperation(operation)
 
-    def Compile(self, optimize: bool = False) -> List[Union[str, BaseOperation]]:
+    def _AddNetworkOperation(self, operation: CGNetworkOperation) -> bool:
+        if operation in self._subnetworks:
+            logging.error("Operation can only be added once")
+            return False
+
+        # the operations of a sub-network are inlined, every pass of the plan sees through the boundary
+        inner_operations = operation.network.operations
+        inlined = operation.Inline()
+        for inlined_operation in inlined:
+            self.AddOperation(inlined_operation)
+            if not self._graph.HasNode(inlined_operation):
+                logging.error(f"cannot add network operation:`{operation.name}`")
+                for added in inlined:
+                    if self._graph.HasNode(added):
+                        self.RemoveOperation(added)
+                return False
+
+        self._subnetworks[operation] = (inner_operations, inlined)
+        return True
+
+    def _RefreshNetworkOperations(self):
+        # sub-networks changed since they were added are inlined again
+        for operation, (inner_operations, inlined) in list(self._subnetworks.items()):
+            operation.network._RefreshNetworkOperations()
+            if operation.network.operations != inner_operations:
+                self.RemoveOperation(operation)
+                self._AddNetworkOperation(operation)
+
+    @property
+    def network_operations(self) -> List[CGNetworkOperation]:
+        return list(self._subnetworks)
+
+    @property
+    def operations(self) -> List[BaseOperation]:
+        return [node for node in self._graph.nodes if isinstance(node, BaseOperation)]
+
+    def RemoveOperation(self, operation: BaseOperation):
+        if isinstance(operation, CGNetworkOperation):
+            if (entry := self._subnetworks.pop(operation, None)) is None:
+                logging.error(f"operation:`{operation.name}` not found in network:`{self.name}`")
+                return
+            for inlined_operation in entry[1]:
+                self.RemoveOperation(inlined_operation)
+            return
+
+        graph = self._graph
+        if not graph.HasNode(operation):
+            logging.error(f"operation:`{operation.name}` not found in network:`{self.name}`")
+            return
+
+        data = [*graph.Predecessors(operation), *graph.Successors(operation)]
+        graph.RemoveNode(operation)
+
+        # data nodes left without producers and consumers are not part of the network anymore
+        for data_node in data:
+            if graph.InDegree(data_node) == 0 and graph.OutDegree(data_node) == 0:
+                graph.RemoveNode(data_node)
+
+        self._Touch(operation, False)
+        self._PatchPlan(operation, False)
+
+    def _InvalidatePlan(self):
+        # a compiled network stays compiled, the plan is re-read from the maintained order on next use
+        # calls in flight keep the plan and requirements they already hold, nothing is mutated in place
+        with self._plan_lock:
+            self._flag_plan_stale = self._flag_compiled
+            self._reachability = None
+            self._cached_requirements = {}
+            self._generated_plans = {}
+            self._Touch()
+
+    def _PatchPlan(self, operation: BaseOperation, added: bool):
+        # the compiled plan is patched around the edited operation, a new list every time
+        # an edit the constant folding, subexpression or fusion passes could decide differently on is rebuilt
+        with self._plan_lock:
+            patched = None
+            if self._flag_compiled and not self._flag_plan_stale:
+                patched = self._PlanWith(operation) if added else self._PlanWithout(operation)
+            if patched is None:
+                self._InvalidatePlan()
+                return
+
+            self._ordered_steps, self._ordered_step_ids = patched
+            self._PatchTypes((*operation.inputs, *operation.outputs))
+            self._reachability = None
+            self._cached_requirements = {}
+            self._generated_plans = {}
+            self._Touch()
+
+    def _PlanIndex(
+        self, operations: Iterable[BaseOperation], names: Iterable[str]
+    ) -> Tuple[Dict[BaseOperation, int], Dict[str, int], set, Dict[str, str], set]:
+        # plan position of the operations and of the delete instructions of the data, the data that are
+        # intermediates of a fused step, and the aliases the subexpression pass decided on
+        # exact types, an abstract isinstance per step would cost more than the rest of the scan
+        targets, names = set(operations), set(names)
+        positions: Dict[BaseOperation, int] = {}
+        deletions: Dict[str, int] = {}
+        intermediates: set = set()
+        renamed: Dict[str, str] = {}
+        skip: set = set()
+        for index, step in enumerate(self._ordered_steps):
+            kind = type(step)
+            if kind is CGNetwork.DeleteInstruction:
+                if step in names:
+                    deletions[step] = index
+            elif kind is CGFusedOperation:
+                if not targets.isdisjoint(step.operations):
+                    positions.update(
+                        (operation, index) for operation in targets.intersection(step.operations)
+                    )
+                if not names.isdisjoint(step.intermediates):
+                    intermediates.update(names.intersection(step.intermediates))
+            elif kind is CGAliasOperation:
+                positions[step.operation] = index
+                renamed.update(zip(step.operation.outputs, step.canonical.outputs))
+                skip.update((step.operation, step.canonical))
+            elif step in targets:
+                positions[step] = index
+        return positions, deletions, intermediates, renamed, skip
+
+    def _Constants(self, names: Iterable[str]) -> bool:
+        # whether an edit touches the compile time constants or the values folded from them
+        steps = self._ordered_steps
+        folded = steps[0].outputs if steps and isinstance(steps[0], CGConstantOperation) else ()
+        return any(name in self._constants or name in folded for name in names)
+
+    def _Linked(self, producer: BaseOperation, data: str, skip: set) -> bool:
+        # whether the fusion pass would link the producer of a data to its single consumer
+        consumers = self._graph.Successors(CGNetwork.ProcessData(data))
+        return (
+            len(producer.outputs) == 1
+            and len(consumers) == 1
+            and not skip.intersection((producer, consumers[0]))
+            and _Fusable(producer)
+            and _Fusable(consumers[0])
+        )
+
+    def _PlanWith(self, operation: BaseOperation) -> Tuple[List[Any], List[Any]] | None:
+        graph = self._graph
+        if self._Constants((*operation.inputs, *operation.outputs)):
+            return None
+        if any(graph.InDegree(CGNetwork.ProcessData(o)) > 1 for o in operation.outputs):
+            return None
+
+        producers = [p for i in operation.inputs for p in graph.Predecessors(CGNetwork.ProcessData(i))]
+        consumers = [c for o in operation.outputs for c in graph.Successors(CGNetwork.ProcessData(o))]
+        positions, deletions, intermediates, renamed, skip = self._PlanIndex(
+            (*producers, *consumers), operation.inputs
+        )
+
+        if self._flag_optimized:
+            # an intermediate of a fused step is not available to another reader
+            if intermediates.intersection(operation.inputs):
+                return None
+
+            # the operation would start, extend or end a fused chain, or break one the pass gave up on
+            if len(operation.outputs) == 1 and self._Linked(operation, operation.outputs[0], skip):
+                return None
+            for input_ in operation.inputs:
+                data = CGNetwork.ProcessData(input_)
+                others = [r for r in graph.Successors(data) if r is not operation]
+                for producer in graph.Predecessors(data):
+                    if self._Linked(producer, input_, skip):
+                        return None
+                    if (
+                        len(others) == 1
+                        and _Fusable(producer)
+                        and _Fusable(others[0])
+                        and len(producer.outputs) == 1
+                    ):
+                        return None
+
+            # a duplicate of an existing operation would become an alias
+            if type(operation) is CGOperation and self._Duplicated(operation, renamed):
+                return None
+
+        # placed after the producers of its inputs and before the consumers of its outputs
+        if any(p not in positions for p in producers) or any(c not in positions for c in consumers):
+            return None
+        steps, ids = self._ordered_steps, self._ordered_step_ids
+        start = 1 if steps and isinstance(steps[0], CGConstantOperation) else 0
+        position = max((positions[p] + 1 for p in producers), default=start)
+        if position > min((positions[c] for c in consumers), default=len(steps)):
+            return None
+
+        steps, ids = list(steps), list(ids)
+        node_id = graph.GetId(operation)
+        inserted_steps: List[Any] = [operation]
+        inserted_ids: List[Any] = [node_id]
+        moved: List[int] = []
+        if self._flag_optimized:
+            # inputs deleted before the operation runs are deleted after it instead
+            for data_id in dict.fromkeys(graph.PredecessorIds(node_id)):
+                index = deletions.get(graph.GetKey(data_id), None)
+                if index is None or index < position:
+                    inserted_steps.append(CGNetwork.DeleteInstruction(graph.GetKey(data_id)))
+                    inserted_ids.append(data_id)
+                    if index is not None:
+                        moved.append(index)
+
+        steps[position:position] = inserted_steps
+        ids[position:position] = inserted_ids
+        for index in sorted(moved, reverse=True):
+            del steps[index], ids[index]
+        return steps, ids
+
+    def _Duplicated(self, operation: CGOperation, renamed: Dict[str, str]) -> bool:
+        # duplicates read the same first input after renaming, an operation reading nothing is rebuilt
+        graph = self._graph
+        if not operation.inputs:
+            return True
+        key = _SubexpressionKey(operation, renamed)
+        try:
+            hash(key)
+        except TypeError:
+            # unhashable attribute values, the operation is never deduplicated
+            return False
+
+        first = renamed.get(operation.inputs[0], operation.inputs[0])
+        for name in {first, *(n for n, c in renamed.items() if c == first)}:
+            data = CGNetwork.ProcessData(name)
+            for candidate in graph.Successors(data) if graph.HasNode(data) else []:
+                if candidate is operation or type(candidate) is not CGOperation:
+                    continue
+                if candidate.function != operation.function:
+                    continue
+                other = _SubexpressionKey(candidate, renamed)
+                try:
+                    if hash(other) == hash(key) and other == key:
+                        return True
+                except TypeError:
+                    continue
+        return False
+
+    def _PlanWithout(self, operation: BaseOperation) -> Tuple[List[Any], List[Any]] | None:
+        graph = self._graph
+        if self._Constants((*operation.inputs, *operation.outputs)):
+            return None
+
+        positions, deletions, _, _, skip = self._PlanIndex((operation,), operation.inputs)
+        steps, ids = self._ordered_steps, self._ordered_step_ids
+        position = positions.get(operation, None)
+        if position is None or steps[position] is not operation or operation in skip:
+            # folded, fused or deduplicated
+            return None
+
+        if self._flag_optimized:
+            # the fusion pass could link operations the removed one kept apart
+            if len(operation.outputs) == 1 and graph.HasNode(CGNetwork.ProcessData(operation.outputs[0])):
+                if self._Linked(operation, operation.outputs[0], skip):
+                    return None
+            for input_ in operation.inputs:
+                data = CGNetwork.ProcessData(input_)
+                if graph.HasNode(data) and any(
+                    self._Linked(p, input_, skip) for p in graph.Predecessors(data)
+                ):
+                    return None
+
+        # inputs it read last are deleted after the step reading them last now, or not at all
+        events: List[Tuple[int, int]] = [(position, -1)]
+        if self._flag_optimized:
+            for input_ in dict.fromkeys(operation.inputs):
+                index = deletions.get(input_, None)
+                if index is None or any(_Reads(steps[k], input_) for k in range(position + 1, index)):
+                    continue
+                events.append((index, -1))
+                # aliases read the outputs of their canonical operation, the plan knows every reader
+                readers = (k for k in range(position - 1, -1, -1) if _Reads(steps[k], input_))
+                if (last := next(readers, None)) is not None:
+                    events.append((last + 1, index))
+
+        # applied from the end, every index still points into the unchanged part, removals go first
+        steps, ids = list(steps), list(ids)
+        for index, source in sorted(events, key=lambda event: (event[0], event[1] < 0), reverse=True):
+            if source < 0:
+                del steps[index], ids[index]
+            else:
+                steps.insert(index, self._ordered_steps[source])
+                ids.insert(index, self._ordered_step_ids[source])
+        return steps, ids
+
+    def _PatchTypes(self, names: Iterable[str]):
+        # types of the data around an edit, from their producer first, as `InferTypes` gives them
+        graph = self._graph
+        types = dict(self._types)
+        for name in names:
+            types.pop(name, None)
+            data = CGNetwork.ProcessData(name)
+            if not graph.HasNode(data):
+                continue
+            for neighbour in (*graph.Predecessors(data), *graph.Successors(data)):
+                if (data_type := OperationTypes(neighbour).get(name, None)) is not None:
+                    types[name] = data_type
+                    break
+        self._types = types
+
+    def Compile(
+        self, optimize: bool = False, constants: Dict[str, Any] | None = None
+    ) -> List[Union[str, BaseOperation]]:
+        with self._plan_lock:
+            self._RefreshNetworkOperations()
+            self._flag_optimized = optimize
+            self._constants = dict(constants or {})
+            self._cached_requirements = {}
+            self._generated_plans = {}
+
+            if not self._BuildPlan():
+                return []
+
+            self._flag_compiled = True
+            return list(self._ordered_steps)
+
+    def _BuildPlan(self) -> bool:
         # sourcery skip: raise-specific-error
-        self.ordered_steps.clear()
-        self.cached_requirements.clear()
+        # the plan is built aside and swapped in, a plan handed out before is never modified
+        ordered_steps: List[Any] = []
+        ordered_step_ids: List[Any] = []
 
+        graph = self._graph
+        optimize = self._flag_optimized
         try:
-            topological_sequence = list(nx.algorithms.dag.topological_sort(self._graph))
+            topological_sequence = graph.TopologicalIds()
+            get_key = graph.GetKey
+
+            # constants included, a mismatch the operations could not be checked for when added
+            types, errors = InferTypes(
+                [get_key(i) for i in topological_sequence if isinstance(get_key(i), BaseOperation)],
+                self._constants,
+            )
+            if errors:
+                raise Exception("; ".join(errors))
+
+            aliases: Dict[int, int] = {}
+            if optimize:
+                aliases = self._CommonSubexpressions(topological_sequence)
+
+            # operations depending on compile time constants only are evaluated once, here
+            folded, constants = self._FoldConstants(topological_sequence, aliases)
+            if constants:
+                ordered_steps.append(CGConstantOperation(constants))
+                ordered_step_ids.append(-1)
+
+            chains: Dict[int, List[int]] = {}
+            intermediates: set = set()
+            if optimize:
+                chains, intermediates = self._FusionChains(
+                    topological_sequence, folded | set(aliases) | set(aliases.values())
+                )
+
+            # an alias reads the outputs of its canonical operation instead of its own inputs
+            def reads(node_id: int) -> List[int]:
+                if node_id in aliases:
+                    return graph.SuccessorIds(aliases[node_id])
+                return graph.PredecessorIds(node_id)
 
-            for i, node in enumerate(topological_sequence):
-                if isinstance(node, CGNetwork.ProcessData):
+            # position of the last step consuming each data node, a fused step counts at its last operation
+            last_consumer: Dict[int, int] = {}
+            if optimize:
+                for node_id in topological_sequence:
+                    if node_id not in folded:
+                        for member in chains.get(node_id, [node_id]):
+                            for predecessor in reads(member):
+                                last_consumer[predecessor] = node_id
+
+            for node_id in topological_sequence:
+                node = get_key(node_id)
+                if isinstance(node, CGNetwork.ProcessData) or node_id in folded:
                     pass
 
                 elif isinstance(node, BaseOperation):
-                    self._ordered_steps.append(node)
+                    # a fused chain is placed at its last operation, every outside input exists by then
+                    members = chains.get(node_id, [node_id])
+                    if len(members) == 0:
+                        continue
+                    elif node_id in aliases:
+                        ordered_steps.append(CGAliasOperation(node, get_key(aliases[node_id])))
+                        ordered_step_ids.append(node_id)
+                    elif len(members) == 1:
+                        ordered_steps.append(node)
+                        ordered_step_ids.append(node_id)
+                    else:
+                        ordered_steps.append(CGFusedOperation([get_key(m) for m in members]))
+                        ordered_step_ids.append(tuple(members))
 
                     if optimize:
-                        for predecessor in self._graph.predecessors(node):
-                            if not any(
-                                isinstance(future_node, BaseOperation) and predecessor in future_node.inputs
-                                for future_node in topological_sequence[i + 1 :]
-                            ):
-                                self._ordered_steps.append(CGNetwork.DeleteInstruction(predecessor))
+                        deletions = [
+                            predecessor
+                            for member in members
+                            for predecessor in reads(member)
+                            if last_consumer[predecessor] == node_id and predecessor not in intermediates
+                        ]
+                        for predecessor in dict.fromkeys(deletions):
+                            ordered_steps.append(CGNetwork.DeleteInstruction(get_key(predecessor)))
+                            ordered_step_ids.append(predecessor)
 
                 else:
                     raise Exception(f"unhandles operation type:`{node}`")
         except Exception as e:
             logging.error("Failed to compile network")
             logging.error(e)
-            return []
+            self._ordered_steps, self._ordered_step_ids = [], []
+            self._types = {}
+            self._reachability = None
+            self._flag_plan_stale = False
+            self._flag_compiled = False
+            self._Touch()
+            return False
+
+        self._ordered_steps, self._ordered_step_ids = ordered_steps, ordered_step_ids
+        self._types = types
+        self._reachability = None
+        self._flag_plan_stale = False
+        self._Touch()
+        return True
+
+    def _StepIds(self, steps: List[Any]) -> List[Any]:
+        # graph node ids of plan steps, as `_BuildPlan` records them
+        graph = self._graph
+
+        def step_id(step) -> Any:
+            if isinstance(step, CGFusedOperation):
+                return tuple(graph.GetId(operation) for operation in step.operations)
+            if isinstance(step, CGAliasOperation):
+                return graph.GetId(step.operation)
+            if isinstance(step, CGConstantOperation):
+                return -1
+            return graph.GetId(step)
+
+        return [step_id(step) for step in steps]
+
+    def _FoldConstants(
+        self, topological_sequence: List[int], aliases: Dict[int, int]
+    ) -> Tuple[set, Dict[str, Any]]:
+        get_key = self._graph.GetKey
+        values = dict(self._constants)
+        folded = set()
+        if not values:
+            return folded, values
+
+        for node_id in topological_sequence:
+            node = get_key(node_id)
+            if not isinstance(node, BaseOperation) or not node.inputs:
+                continue
+
+            # a duplicated operation takes the folded values of its canonical operation
+            if node_id in aliases:
+                if aliases[node_id] in folded:
+                    canonical = get_key(aliases[node_id])
+                    values |= {p: values[c] for p, c in zip(node.outputs, canonical.outputs)}
+                    folded.add(node_id)
+                continue
+
+            if any(input_ not in values for input_ in node.inputs):
+                continue
+
+            temp_outputs = node.Compute(values)
+            if len(temp_outputs) != len(node.outputs):
+                logging.warning(f"operation:`{node.name}` failed on constant inputs, not folded")
+                continue
+
+            values |= temp_outputs
+            folded.add(node_id)
+
+        return folded, values
+
+    def _CommonSubexpressions(self, topological_sequence: List[int]) -> Dict[int, int]:
+        get_key = self._graph.GetKey
+
+        # inputs are compared after renaming aliased outputs, so duplicated chains collapse as a whole
+        renamed: Dict[str, str] = {}
+        canonical: Dict[Tuple, int] = {}
+        aliases: Dict[int, int] = {}
+        for node_id in topological_sequence:
+            node = get_key(node_id)
+            if type(node) is not CGOperation:
+                continue
+
+            key = _SubexpressionKey(node, renamed)
+            try:
+                first = canonical.setdefault(key, node_id)
+            except TypeError:
+                # unhashable attribute values, the operation is never deduplicated
+                continue
+
+            if first != node_id:
+                aliases[node_id] = first
+                renamed.update(zip(node.outputs, get_key(first).outputs))
+
+        return aliases
+
+    def _FusionChains(self, topological_sequence: List[int], skip: set) -> Tuple[Dict[int, List[int]], set]:
+        graph = self._graph
+        get_key = graph.GetKey
+
+        def fusable(node_id: int) -> bool:
+            return node_id not in skip and _Fusable(get_key(node_id))
+
+        # an operation with a single output read by a single fusable operation is linked to it
+        next_operation: Dict[int, int] = {}
+        for node_id in topological_sequence:
+            if not isinstance(get_key(node_id), BaseOperation) or not fusable(node_id):
+                continue
+            successors = graph.SuccessorIds(node_id)
+            if len(successors) != 1:
+                continue
+            consumers = graph.SuccessorIds(successors[0])
+            if len(consumers) == 1 and fusable(consumers[0]):
+                next_operation[node_id] = consumers[0]
+
+        # an operation linked from two producers would join two chains, it starts a new one instead
+        n_links = Counter(next_operation.values())
+        next_operation = {u: v for u, v in next_operation.items() if n_links[v] == 1}
+
+        # chains are keyed by their last operation, the other members map to an empty chain
+        chains: Dict[int, List[int]] = {}
+        intermediates = set()
+        linked = set(next_operation.values())
+        for head in next_operation:
+            if head in linked:
+                continue
+            members = [head]
+            while members[-1] in next_operation:
+                intermediates.add(graph.SuccessorIds(members[-1])[0])
+                members.append(next_operation[members[-1]])
+            for member in members[:-1]:
+                chains[member] = []
+            chains[members[-1]] = members
+
+        return chains, intermediates
+
+    def Save(self, path: str) -> bool:
+        from computegraph.framework.serialize import DumpNetwork
+
+        return DumpNetwork(self, path)
+
+    @staticmethod
+    def Load(path: str, use_mmap: bool = True) -> CGNetwork | None:
+        from computegraph.framework.serialize import LoadNetwork
+
+        return LoadNetwork(path, use_mmap)
+
+    def Stream(
+        self, inputs: Iterable[Dict], outputs: List[str] = [], max_in_flight: int = 8, max_stages: int = 4
+    ) -> Iterator[Dict | None]:
+        # sourcery skip: default-mutable-arg
+        from computegraph.framework.stream import stream_compute
 
-        self._flag_compiled = True
-        return list(self.ordered_steps)
+        return stream_compute(self, inputs, outputs, max_in_flight, max_stages)
+
+    def AStream(
+        self,
+        inputs: AsyncIterable[Dict],
+        outputs: List[str] = [],
+        max_in_flight: int = 8,
+        max_stages: int = 4,
+    ) -> AsyncIterator[Dict | None]:
+        # sourcery skip: default-mutable-arg
+        from computegraph.framework.stream import astream_compute
+
+        return astream_compute(self, inputs, outputs, max_in_flight, max_stages)
+
+    def Batcher(
+        self, outputs: List[str] = [], max_batch_size: int = 32, max_wait: float = 0.002
+    ) -> CGBatcher:
+        # sourcery skip: default-mutable-arg
+        from computegraph.framework.batch import CGBatcher
+
+        return CGBatcher(self, outputs, max_batch_size, max_wait)
+
+    def ChunkedCall(
+        self,
+        input_dict: Dict,
+        outputs: List[str],
+        memory_budget: int,
+        out: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any] | None:
+        from computegraph.framework.chunked import chunked_compute
+
+        return chunked_compute(self, input_dict, outputs, memory_budget, out)
+
+    def Sweep(
+        self,
+        base_inputs: Dict,
+        axes: Dict[str, Sequence],
+        outputs: List[str] = [],
+        method: CGNetwork.COMPUTE_METHOD = COMPUTE_METHOD.SEQUENTIAL,
+        max_workers: int | None = None,
+    ) -> CGSweepResult | None:
+        # sourcery skip: default-mutable-arg
+        from computegraph.framework.sweep import sweep_compute
+
+        return sweep_compute(self, base_inputs, axes, outputs, method, max_workers)
+
+    def GeneratedPlan(self, provided_inputs: List[str], requested_outputs: List[str]) -> CGGeneratedPlan:
+        from computegraph.framework.codegen import GeneratePlan
+
+        # generated once per requirement signature, a plan replaced meanwhile gets a new cache
+        generated_plans = self._generated_plans
+        key = (tuple(sorted(provided_inputs)), tuple(sorted(requested_outputs)))
+        if (generated := generated_plans.get(key, None)) is None:
+            _, steps = self.EvaluateComputationRequirements(provided_inputs, requested_outputs)
+            generated = generated_plans[key] = GeneratePlan(*key, steps, self.name)
+        return generated
 
     def EvaluateComputationRequirements(
         self, provided_inputs: List[str], requested_outputs: List[str]
@@ -116,54 +765,25 @@ class CGNetwork(BaseNetwork):
         outputs = tuple(sorted(requested_outputs))
 
         key = (inputs, outputs)
-        if computation_requirements := self.cached_requirements.get(key, None):
+        if computation_requirements := self._cached_requirements.get(key, None):
             return computation_requirements
 
-        graph = self.graph.copy(as_view=True)
-        necessary_nodes = set()
-        unnecessary_nodes = set()
-
-        # if inputs are provided, remove preceeding steps in the graph
-        for input_name in inputs:
-            if graph.has_node(input_name):
-                unnecessary_nodes |= nx.dag.ancestors(graph, input_name)
-            else:
-                logging.warning(f"graph has no OperationData:`{input_name}`")
+        graph = self.graph
+        for name in (*inputs, *outputs):
+            if not graph.HasNode(name):
+                logging.warning(f"graph has no OperationData:`{name}`")
 
-        # full graph computed
-        if not outputs:
-            necessary_nodes = set(graph.nodes)
+        # the index is built on the first query after the plan changed, queries only read it
+        with self._plan_lock:
+            steps = self.ordered_steps
+            if self._reachability is None:
+                self._reachability = CGReachabilityIndex(steps)
+                self._Touch()
+            index, cached_requirements = self._reachability, self._cached_requirements
+        required_inputs, computation_requirements = index.Query(inputs, outputs)
 
-        # for selected outputs, find neccessary ancestors only in the graph
-        else:
-            for output_name in outputs:
-                if graph.has_node(output_name):
-                    necessary_nodes |= nx.dag.ancestors(graph, output_name)
-                    # unnecessary_nodes |= nx.dag.descendants(graph, output_name)
-                else:
-                    logging.warning(f"graph has no OperationData:`{output_name}`")
-
-        # if inputs were provided, remove unnecessary nodes
-        necessary_nodes -= unnecessary_nodes
-
-        # get ordered operation steps
-        computation_requirements = tuple(step for step in self.ordered_steps if step in necessary_nodes)
-
-        # get required data nodes for computation
-        required_inputs = set()
-        for node in computation_requirements:
-            if isinstance(node, BaseOperation):
-                for input_ in node.inputs:
-                    if graph.in_degree(input_) == 0:  # type:ignore
-                        required_inputs.add(input_)
-        required_inputs |= set(inputs)
-
-        # cahche results for future look-up
-        required_inputs = tuple(sorted(required_inputs))
-        self.cached_requirements[(required_inputs, tuple(outputs))] = (
-            required_inputs,
-            computation_requirements,
-        )
+        # cahche results for future look-up, a plan replaced meanwhile gets a new cache
+        cached_requirements[key] = (required_inputs, computation_requirements)
 
         return required_inputs, computation_requirements
 
@@ -172,11 +792,24 @@ class CGNetwork(BaseNetwork):
         input_dict: Dict,
         outputs: List[str] = [],
         method: CGNetwork.COMPUTE_METHOD = COMPUTE_METHOD.SEQUENTIAL,
+        max_workers: int | None = None,
+        cost_model: CGCostModel | None = None,
+        result_cache: CGResultCache | None = None,
+        context: CGExecutionContext | None = None,
+        abort_on_error: bool = False,
+        timeout: float | None = None,
+        budget: CGResourceBudget | None = None,
+        checkpoint: CGCheckpoint | None = None,
     ) -> Any:
-        def update_perf_register(step_name: str, step_exec_time: float):
-            self.perf_register[step_name] = step_exec_time
-
         # sourcery skip: default-mutable-arg
+        # the budget covers the whole call, planning included
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        # everything a call writes lives in its context, concurrent calls share the plan only
+        context = context if context is not None else CGExecutionContext()
+        context.status = CGExecutionContext.STATUS.INVALID
+        context.not_computed = list(outputs)
+
         if not self.flag_compiled:
             logging.error("graph not compiled")
             return
@@ -186,20 +819,387 @@ class CGNetwork(BaseNetwork):
             return
 
         provided_inputs = list(input_dict.keys())
+        # the baked values would silently replace the ones passed for them
+        if self._constants and (baked := [name for name in provided_inputs if self._Constants((name,))]):
+            logging.error(f"inputs:`{tuple(baked)}` are compile time constants")
+            return
+
         required_inputs, operation_steps = self.EvaluateComputationRequirements(provided_inputs, outputs)
 
         if not set(required_inputs).issubset(provided_inputs):
             logging.error(f"Missing required inputs:`{tuple(set(required_inputs) - set(provided_inputs))}`")
             return
 
-        self.perf_register.clear()
+        context.status = CGExecutionContext.STATUS.COMPLETE
+        update_perf_register = context.Record
+
+        # generated plans neither read the result cache nor watch the clock
+        if method == CGNetwork.COMPUTE_METHOD.GENERATED and (
+            result_cache is not None or deadline is not None
+        ):
+            method = CGNetwork.COMPUTE_METHOD.SEQUENTIAL
+
+        # checkpoints record the progress of the sequential plan
+        if checkpoint is not None:
+            if method != CGNetwork.COMPUTE_METHOD.SEQUENTIAL:
+                logging.warning(f"checkpointed calls run sequentially, method:`{method.name}` ignored")
+            method = CGNetwork.COMPUTE_METHOD.SEQUENTIAL
+            checkpoint.Begin(provided_inputs, outputs, operation_steps)
+
+        result = None
+        if method == CGNetwork.COMPUTE_METHOD.GENERATED:
+            # a plan that cannot be generated runs in the interpreter, a started call is never run twice
+            try:
+                plan = self.GeneratedPlan(provided_inputs, outputs)
+            except Exception as e:
+                logging.warning(f"cannot generate the plan, running it sequentially, {e!r}")
+                method = CGNetwork.COMPUTE_METHOD.SEQUENTIAL
+            else:
+                result = generated_compute(plan, input_dict, context)
 
         if method == CGNetwork.COMPUTE_METHOD.PARALLEL:
+            priorities = CGListScheduler(cost_model).Prioritize(operation_steps)
+            result = parallel_compute(
+                input_dict,
+                outputs,
+                operation_steps,
+                update_perf_register,
+                max_workers,
+                priorities,
+                result_cache,
+                context,
+                abort_on_error,
+                deadline,
+                budget,
+            )
+        elif method == CGNetwork.COMPUTE_METHOD.DISTRUBUTED:
             logging.error("not implemented")
-        if method == CGNetwork.COMPUTE_METHOD.DISTRUBUTED:
-            logging.error("not implemented")
+            context.status = CGExecutionContext.STATUS.INVALID
         elif method == CGNetwork.COMPUTE_METHOD.SEQUENTIAL:
-            return sequential_compute(input_dict, outputs, operation_steps, update_perf_register)
+            result = sequential_compute(
+                input_dict,
+                outputs,
+                operation_steps,
+                update_perf_register,
+                result_cache,
+                context,
+                abort_on_error,
+                deadline,
+                checkpoint,
+            )
+
+        context.values = result
+        context.not_computed = [output for output in outputs if result is None or output not in result]
+        self._perf_register = context.timings
+        if cost_model is not None:
+            # delete instructions are timed under the name of their data, they are not operations
+            names = {
+                name for step in operation_steps if isinstance(step, BaseOperation) for name in _Names(step)
+            }
+            cost_model.Update({name: t for name, t in context.timings.items() if name in names})
+
+        return result
+
+    def Evaluate(
+        self,
+        input_dict: Dict,
+        outputs: List[str] = [],
+        method: CGNetwork.COMPUTE_METHOD = COMPUTE_METHOD.SEQUENTIAL,
+        max_workers: int | None = None,
+        cost_model: CGCostModel | None = None,
+        result_cache: CGResultCache | None = None,
+        abort_on_error: bool = False,
+        timeout: float | None = None,
+        budget: CGResourceBudget | None = None,
+        checkpoint: CGCheckpoint | None = None,
+    ) -> CGExecutionContext:
+        # sourcery skip: default-mutable-arg
+        # partial results and the failure report of one call
+        context = CGExecutionContext()
+        self(
+            input_dict,
+            outputs,
+            method,
+            max_workers,
+            cost_model,
+            result_cache,
+            context,
+            abort_on_error,
+            timeout,
+            budget,
+            checkpoint,
+        )
+        return context
+
+    def Resume(
+        self,
+        checkpoint: CGCheckpoint,
+        result_cache: CGResultCache | None = None,
+        context: CGExecutionContext | None = None,
+        abort_on_error: bool = False,
+        timeout: float | None = None,
+    ) -> Any:
+        # continues the call a checkpoint was written for, from its first incomplete step
+        deadline = None if timeout is None else time.monotonic() + timeout
+        context = context if context is not None else CGExecutionContext()
+        context.status = CGExecutionContext.STATUS.INVALID
+
+        if not self.flag_compiled:
+            logging.error("graph not compiled")
+            return
+
+        if (state := checkpoint.Load()) is None:
+            return
+
+        context.not_computed = list(state.outputs)
+        _, operation_steps = self.EvaluateComputationRequirements(state.provided_inputs, state.outputs)
+        if checkpoint.Fingerprint(state.provided_inputs, state.outputs, operation_steps) != state.fingerprint:
+            logging.error(f"checkpoint:`{checkpoint.directory}` was written for another plan")
+            return
+
+        context.status = CGExecutionContext.STATUS.COMPLETE
+        checkpoint.Begin(state.provided_inputs, state.outputs, operation_steps, state)
+        result = sequential_compute(
+            state.values,
+            state.outputs,
+            operation_steps[state.position :],
+            context.Record,
+            result_cache,
+            context,
+            abort_on_error,
+            deadline,
+            checkpoint,
+        )
+
+        context.values = result
+        context.not_computed = [output for output in state.outputs if output not in result]
+        self._perf_register = context.timings
+        return result
+
+
+class CGNetworkOperation(CGOperation):
+    def __init__(
+        self,
+        name: str,
+        network: CGNetwork,
+        input_map: Dict[str, str] | None = None,
+        output_map: Dict[str, str] | None = None,
+        uid: str | None = None,
+    ):
+        # sourcery skip: default-mutable-arg
+        # maps inner data names to outer ones, unmapped inner data is named `name/data` in the parent
+        self._network = network
+        self._input_map = dict(input_map or {})
+        self._output_map = dict(output_map or {})
+        super().__init__(
+            name,
+            [self._Rename(n) for n in self._input_map],
+            [self._Rename(n) for n in self._output_map],
+            network,
+            {},
+            uid,
+        )
+
+    @property
+    def network(self) -> CGNetwork:
+        return self._network
+
+    @property
+    def input_map(self) -> Dict[str, str]:
+        return self._input_map
+
+    @property
+    def output_map(self) -> Dict[str, str]:
+        return self._output_map
+
+    def _Rename(self, data: str) -> str:
+        renamed = self._input_map.get(data, None) or self._output_map.get(data, None) or f"{self.name}/{data}"
+        if isinstance(data, CGOperation.Modifiers.OptionalData):
+            return CGOperation.Modifiers.OptionalData(renamed)
+        return renamed
+
+    def Inline(self) -> List[BaseOperation]:
+        inlined = []
+        for operation in self._network.operations:
+            inlined.append(
+                type(operation)(
+                    f"{self.name}/{operation.name}",
+                    [self._Rename(n) for n in operation.inputs],
+                    [self._Rename(n) for n in operation.outputs],
+                    operation.function,
+                    operation.attr_dict,
+                    # inlining the same operation again keeps its identity
+                    uuid.uuid5(uuid.NAMESPACE_OID, f"{self.uid}/{operation.uid}").hex,
+                    cost=operation.cost,
+                    chunkable=operation.chunkable,
+                    demand=operation.demand,
+                    resources=operation.resources,
+                    types={self._Rename(n): t for n, t in operation.types.items()},
+                )
+            )
+        return inlined
+
+    def Execute(self, input_dict: Dict, output_list: List[str] | None = None) -> Dict:
+        # used on its own, outside of a network, the operation calls the inner network
+        inner_inputs = {
+            inner: input_dict[outer]
+            for inner, outer in zip(self._input_map, self.inputs)
+            if outer in input_dict
+        }
+        result = self._network(inner_inputs, list(self._output_map))
+        if result is None:
+            raise ValueError(f"network:`{self._network.name}` could not be evaluated")
+
+        return {
+            outer: result[inner]
+            for inner, outer in zip(self._output_map, self.outputs)
+            if inner in result and (not output_list or outer in output_list)
+        }
+
+
+class CGExecutionContext:
+    class STATUS(IntEnum):
+        COMPLETE = auto()
+        FAILED = auto()
+        ABORTED = auto()
+        INVALID = auto()
+        TIMEOUT = auto()
+
+    def __init__(self):
+        self.timings: OrderedDict[str, float] = ordered_dict()
+        self.values: Dict[str, Any] | None = None
+        self.status = CGExecutionContext.STATUS.COMPLETE
+        self.failed: Dict[str, BaseException] = {}
+        self.skipped: List[str] = []
+        self.cancelled: List[str] = []
+        self.not_computed: List[str] = []
+
+    def Record(self, step_name: str, step_exec_time: float):
+        self.timings[step_name] = step_exec_time
+
+    def Fail(self, step: BaseOperation, error: BaseException):
+        # a fused step names the operation of its chain that failed, the ones after it are skipped
+        name = step.name
+        if isinstance(error, CGOperationError):
+            name, error = error.operation, error.error
+            if isinstance(step, CGFusedOperation):
+                names = [operation.name for operation in step.operations]
+                self.skipped.extend(names[names.index(name) + 1 :])
+
+        logging.log(
+            logging.ERROR if isinstance(error, ValueError) else logging.CRITICAL,
+            f"operation:`{name}` failed, {error!r}",
+        )
+        self.failed[name] = error
+        if self.status == CGExecutionContext.STATUS.COMPLETE:
+            self.status = CGExecutionContext.STATUS.FAILED
+
+    def Skip(self, step: BaseOperation):
+        self.skipped.extend(_Names(step))
+
+    def Expire(self, steps: Iterable[BaseOperation]):
+        # operations not started, or abandoned while running, when the deadline passed
+        self.cancelled.extend(name for step in steps for name in _Names(step))
+        self.status = CGExecutionContext.STATUS.TIMEOUT
+
+
+def _SubexpressionKey(node: BaseOperation, renamed: Dict[str, str]) -> Tuple:
+    # operations with equal keys compute the same outputs, inputs are compared after renaming aliased outputs
+    return (
+        node.function,
+        tuple(sorted(node.attr_dict.items())),
+        tuple((type(i), renamed.get(i, i)) for i in node.inputs),
+        len(node.outputs),
+    )
+
+
+def _Fusable(node: BaseOperation) -> bool:
+    return (
+        type(node) is CGOperation
+        and not node.demand
+        and not any(isinstance(i, CGOperation.Modifiers.OptionalData) for i in node.inputs)
+    )
+
+
+def _Reads(step: Any, data: str) -> bool:
+    return not isinstance(step, CGNetwork.DeleteInstruction) and data in step.inputs
+
+
+def _Names(step: BaseOperation) -> List[str]:
+    operations = step.operations if isinstance(step, CGFusedOperation) else [step]
+    return [operation.name for operation in operations]
+
+
+def _Expired(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def Doomed(operation: BaseOperation, doomed: set) -> bool:
+    # whether an operation reads data a failed operation left out, an absent optional input does not stop it
+    return any(i in doomed for i in operation.inputs if not isinstance(i, CGOperation.Modifiers.OptionalData))
+
+
+def _Outcome(
+    operation: BaseOperation, compute: Callable[[], Dict[str, Any]]
+) -> Tuple[Dict[str, Any], BaseException | None]:
+    try:
+        temp_outputs = compute()
+    except Exception as e:
+        return {}, e
+
+    if missing := [output for output in operation.outputs if output not in temp_outputs]:
+        return temp_outputs, LookupError(f"outputs:`{missing}` not returned")
+    return temp_outputs, None
+
+
+def compute_operation(
+    operation: BaseOperation,
+    input_dict: Dict[str, Any],
+    perf_register_callback: Callable[[str, float], None] | None = None,
+) -> Dict[str, Any]:
+    # fused steps report the time of every operation they are made of, errors reach the executor
+    if isinstance(operation, CGFusedOperation):
+        return operation.Execute(input_dict, perf_register_callback=perf_register_callback)
+    if isinstance(operation, CGOperation):
+        return operation.Execute(input_dict)
+    return operation.Compute(input_dict)
+
+
+def cached_compute(
+    operation: BaseOperation,
+    input_dict: Dict[str, Any],
+    result_cache: CGResultCache | None = None,
+    perf_register_callback: Callable[[str, float], None] | None = None,
+) -> Dict[str, Any]:
+    # aliases and baked constants only forward values, there is nothing to store
+    if result_cache is None or isinstance(operation, (CGAliasOperation, CGConstantOperation)):
+        return compute_operation(operation, input_dict, perf_register_callback)
+
+    key = result_cache.Key(operation, input_dict)
+    if key is None:
+        return compute_operation(operation, input_dict, perf_register_callback)
+    if (temp_outputs := result_cache.Get(operation, key)) is not None:
+        logging.debug(f"cached result for opration:`{operation}`")
+        return temp_outputs
+
+    temp_outputs = compute_operation(operation, input_dict, perf_register_callback)
+    result_cache.Put(operation, key, temp_outputs)
+    return temp_outputs
+
+
+def generated_compute(
+    plan: CGGeneratedPlan, input_dict: Dict[str, Any], context: CGExecutionContext
+) -> Dict[str, Any] | None:
+    # a generated call stops at the first error and keeps no partial values
+    try:
+        return plan(input_dict)
+    except Exception as e:
+        if (operation := plan.FailedOperation(e)) is not None:
+            context.Fail(operation, e)
+        else:
+            logging.critical(f"generated plan failed, {e!r}")
+            context.status = CGExecutionContext.STATUS.FAILED
+        return None
 
 
 def sequential_compute(
@@ -207,30 +1207,210 @@ def sequential_compute(
     outputs: List[str],
     operation_steps: Tuple,
     perf_register_callback: Callable[[str, float], None],
+    result_cache: CGResultCache | None = None,
+    context: CGExecutionContext | None = None,
+    abort_on_error: bool = False,
+    deadline: float | None = None,
+    checkpoint: CGCheckpoint | None = None,
 ) -> Dict[str, Any]:
+    context = context if context is not None else CGExecutionContext()
     cache = dict(input_dict)
+    doomed: set = set()
 
-    for step in operation_steps:
+    for i, step in enumerate(operation_steps):
         if isinstance(step, CGNetwork.ProcessData):
             if step not in cache:
                 logging.error(f"missing data:`{step}` in processing stack")
                 break
 
         elif isinstance(step, BaseOperation):
+            # no operation is started once the deadline has passed
+            if _Expired(deadline):
+                context.Expire(s for s in operation_steps[i:] if isinstance(s, BaseOperation))
+                break
+
+            # descendants of a failed operation are skipped, independent branches go on
+            if doomed and Doomed(step, doomed):
+                context.Skip(step)
+                doomed.update(step.outputs)
+                continue
+
             logging.debug(f"executing opration:`{step}`")
             t_start = time.time()
 
-            temp_outputs = step.Compute(cache)
+            temp_outputs, error = _Outcome(
+                step, lambda: cached_compute(step, cache, result_cache, perf_register_callback)
+            )
             cache |= temp_outputs
 
-            perf_register_callback(step.name, time.time() - t_start)
+            if error is not None:
+                context.Fail(step, error)
+                doomed.update(output for output in step.outputs if output not in temp_outputs)
+                if checkpoint is not None:
+                    checkpoint.Halt()
+                if abort_on_error:
+                    context.status = CGExecutionContext.STATUS.ABORTED
+                    break
+                continue
+
+            # fused steps have registered their operations already
+            if not isinstance(step, CGFusedOperation):
+                perf_register_callback(step.name, time.time() - t_start)
 
         elif isinstance(step, CGNetwork.DeleteInstruction):
             logging.debug(f"executing opration:`{step}`")
             t_start = time.time()
 
-            cache.pop(step)
+            # data of a skipped producer was never there
+            cache.pop(step, None)
 
             perf_register_callback(step, time.time() - t_start)
 
+        if checkpoint is not None:
+            checkpoint.Advance(step, cache)
+
+    return {k: cache[k] for k in iter(cache) if k in outputs} if outputs else cache
+
+
+def parallel_compute(
+    input_dict: Dict[str, Any],
+    outputs: List[str],
+    operation_steps: Tuple,
+    perf_register_callback: Callable[[str, float], None],
+    max_workers: int | None = None,
+    priorities: Dict[BaseOperation, float] | None = None,
+    result_cache: CGResultCache | None = None,
+    context: CGExecutionContext | None = None,
+    abort_on_error: bool = False,
+    deadline: float | None = None,
+    budget: CGResourceBudget | None = None,
+) -> Dict[str, Any]:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    def timed_compute(operation: BaseOperation, inputs: Dict[str, Any]) -> Tuple[Dict, Any, float]:
+        t_start = time.time()
+        try:
+            temp_outputs, error = _Outcome(
+                operation, lambda: cached_compute(operation, inputs, result_cache, perf_register_callback)
+            )
+        finally:
+            # released before the future completes, the next admission already sees the freed resources
+            if budget is not None:
+                budget.Release(operation.resources)
+        return temp_outputs, error, time.time() - t_start
+
+    context = context if context is not None else CGExecutionContext()
+    cache = dict(input_dict)
+    doomed: set = set()
+    priorities = priorities or {}
+
+    operations = [step for step in operation_steps if isinstance(step, BaseOperation)]
+    deletions = {str(step) for step in operation_steps if isinstance(step, CGNetwork.DeleteInstruction)}
+    order = {operation: i for i, operation in enumerate(operations)}
+
+    producers = {p: operation for operation in operations for p in operation.outputs}
+    waiting_on = {
+        operation: {producers[i] for i in operation.inputs if i in producers} - {operation}
+        for operation in operations
+    }
+    successors: Dict[BaseOperation, List[BaseOperation]] = {operation: [] for operation in operations}
+    for operation, predecessors in waiting_on.items():
+        for predecessor in predecessors:
+            successors[predecessor].append(operation)
+
+    remaining_consumers: Dict[str, int] = {}
+    for operation in operations:
+        for input_ in operation.inputs:
+            remaining_consumers[input_] = remaining_consumers.get(input_, 0) + 1
+
+    # ready operations are started highest priority first, ties keep the compiled order
+    ready: List = []
+    for operation in operations:
+        if not waiting_on[operation]:
+            heapq.heappush(ready, (-priorities.get(operation, 0.0), order[operation], operation))
+
+    def release(operation: BaseOperation):
+        for input_ in operation.inputs:
+            remaining_consumers[input_] -= 1
+            if remaining_consumers[input_] == 0 and input_ in deletions:
+                cache.pop(input_, None)
+
+        for successor in successors[operation]:
+            waiting_on[successor].discard(operation)
+            if not waiting_on[successor]:
+                heapq.heappush(ready, (-priorities.get(successor, 0.0), order[successor], successor))
+
+    n_workers = max_workers or os.cpu_count() or 1
+    pool = ThreadPoolExecutor(max_workers=n_workers)
+    running: Dict = {}
+    settled: set = set()
+    try:
+        while ready or running:
+            # after an abort nothing new is started, running operations are waited for
+            if context.status == CGExecutionContext.STATUS.ABORTED:
+                ready.clear()
+
+            # past the deadline running operations are abandoned, their results are dropped
+            if _Expired(deadline):
+                context.Expire(operation for operation in operations if operation not in settled)
+                break
+
+            held_back = []
+            version = budget.version if budget is not None else 0
+            while ready and len(running) < n_workers:
+                entry = heapq.heappop(ready)
+                operation = entry[2]
+                # descendants of a failed operation are skipped, independent branches go on
+                if doomed and Doomed(operation, doomed):
+                    context.Skip(operation)
+                    doomed.update(operation.outputs)
+                    settled.add(operation)
+                    release(operation)
+                    continue
+
+                # an operation waits for its resources, smaller ones behind it may start first
+                if budget is not None and not budget.TryAcquire(operation.resources):
+                    held_back.append(entry)
+                    # but nothing does while an exclusive one waits for the running ones to drain
+                    if operation.resources is not None and operation.resources.exclusive:
+                        break
+                    continue
+
+                logging.debug(f"executing opration:`{operation}`")
+                inputs = {i: cache[i] for i in operation.inputs if i in cache}
+                running[pool.submit(timed_compute, operation, inputs)] = operation
+
+            for entry in held_back:
+                heapq.heappush(ready, entry)
+
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not running:
+                # the budget is held by other calls
+                if held_back:
+                    budget.Wait(version, timeout)
+                continue
+
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                operation = running.pop(future)
+                temp_outputs, error, exec_time = future.result()
+                cache |= temp_outputs
+
+                if error is not None:
+                    context.Fail(operation, error)
+                    doomed.update(output for output in operation.outputs if output not in temp_outputs)
+                    if abort_on_error:
+                        context.status = CGExecutionContext.STATUS.ABORTED
+                elif not isinstance(operation, CGFusedOperation):
+                    perf_register_callback(operation.name, exec_time)
+
+                settled.add(operation)
+                release(operation)
+    finally:
+        # an expired call does not wait for the operations it abandoned
+        for future, operation in running.items():
+            if future.cancel() and budget is not None:
+                budget.Release(operation.resources)
+        pool.shutdown(wait=context.status != CGExecutionContext.STATUS.TIMEOUT, cancel_futures=True)
+
     return {k: cache[k] for k in iter(cache) if k in outputs} if outputs else cache
@@ -86,6 +86,7 @@ class CGNode(BaseNode):
 
         socket = CGSocket(self, socket_name, socket_type, uid=uid)
         self.sockets.append(socket)
+        self._Touch()
         return socket
 
     def AddData(self, name: str, data_item: CGProtocolDataItem, uid: str | None = None) -> CGDataInterface:
@@ -101,6 +102,7 @@ class CGNode(BaseNode):
 
         interface = CGDataInterface(self, name, data_item, uid)
         self.data_interfaces.append(interface)
+        self._Touch()
         return interface
 
     def AddOperation(
@@ -134,6 +136,7 @@ class CGNode(BaseNode):
 
         operation = CGOperation(name, inputs, outputs, function, params, uid)
         self.operations.append(operation)
+        self._Touch()
         return operation
 
     def Evaluate(self, interface_name: str):
@@ -35,21 +35,27 @@ Todo:
 
 from __future__ import annotations
 
+import functools
 import logging
-from typing import Any, Dict, List
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
 
-from computegraph.framework.base import BaseOperation
+from computegraph.framework.base import BaseOperation, CGResources
+
+if TYPE_CHECKING:
+    import inspect
 
 
 class CGOperation(BaseOperation):
+    _invoker: Callable[[Dict], Dict] | None = None
+
     class Modifiers:
         class OptionalData(str):
             def __repr__(self) -> str:
                 return f"OptionalData{self}"
 
-    def Compute(self, input_dict: Dict, output_list: List[str] | None = None) -> Dict:
-        to_exec = self.function
-
+    def _Arguments(self, input_dict: Dict) -> Tuple[List, Dict]:
         inputs = [input_dict[d] for d in self.inputs if not isinstance(d, CGOperation.Modifiers.OptionalData)]
 
         optionals = {
@@ -59,10 +65,92 @@ class CGOperation(BaseOperation):
         }
 
         kwargs = {k: v for d in (self.attr_dict, optionals) for k, v in d.items()}
+        return inputs, kwargs
 
-        result: List = []
-        try:
+    @property
+    def demand(self) -> bool:
+        return self._demand or isinstance(self.function, CGOutputFunctions)
+
+    def _Outputs(self, result: Any, output_list: List[str] | None) -> Dict:
+        if len(self.outputs) == 1:
+            result = [result]
+
+        ret_dict = zip(self.outputs, result)
+        if output_list:
+            requested = set(output_list)
+            ret_dict = filter(lambda kv: kv[0] in requested, ret_dict)
+
+        return dict(ret_dict)
+
+    def _Invoke(self, inputs: List, kwargs: Dict, output_list: List[str] | None) -> Dict:
+        to_exec = self.function
+        if not self.demand:
             result = to_exec(*inputs, **kwargs) if kwargs else to_exec(*inputs)
+            return self._Outputs(result, output_list)
+
+        # demand aware functions compute the requested outputs only
+        requested = [o for o in self.outputs if o in output_list] if output_list else list(self.outputs)
+        result = to_exec(*inputs, outputs=requested, **kwargs)
+        return {o: result[o] for o in requested if o in result}
+
+    def _Specialize(self) -> Callable[[Dict], Dict]:
+        # the binding is resolved once, a call only looks its inputs up and calls the function
+        if self.demand:
+            self._invoker = lambda d: self._Invoke(*self._Arguments(d), None)
+            return self._invoker
+
+        optional = tuple(n for n in self.inputs if isinstance(n, CGOperation.Modifiers.OptionalData))
+        required = tuple(n for n in self.inputs if n not in optional)
+        outputs = tuple(self.outputs)
+
+        signature = _Signature(self.function)
+        if signature is not None:
+            try:
+                signature.bind(*required, **{**self.attr_dict, **dict.fromkeys(optional)})
+            except TypeError as e:
+                logging.warning(f"operation:`{self.name}` inputs do not match its function, {e}")
+
+        function = functools.partial(self.function, **self.attr_dict) if self.attr_dict else self.function
+
+        if not optional and len(outputs) == 1:
+            (output,) = outputs
+            if len(required) == 1:
+                (a,) = required
+                invoker = lambda d: {output: function(d[a])}
+            elif len(required) == 2:
+                a, b = required
+                invoker = lambda d: {output: function(d[a], d[b])}
+            else:
+                invoker = lambda d: {output: function(*[d[n] for n in required])}
+        else:
+
+            def invoker(d: Dict) -> Dict:
+                result = function(*[d[n] for n in required], **{n: d[n] for n in optional if n in d})
+                return {outputs[0]: result} if len(outputs) == 1 else dict(zip(outputs, result))
+
+        self._invoker = invoker
+        return invoker
+
+    def Execute(self, input_dict: Dict, output_list: List[str] | None = None) -> Dict:
+        # same as Compute, but errors raised by the function reach the caller
+        if output_list:
+            inputs, kwargs = self._Arguments(input_dict)
+            return self._Invoke(inputs, kwargs, output_list)
+        return (self._invoker or self._Specialize())(input_dict)
+
+    def Compute(self, input_dict: Dict, output_list: List[str] | None = None) -> Dict:
+        try:
+            return self.Execute(input_dict, output_list)
+        except KeyError as e:
+            # a missing input is an error of the caller, not of the function
+            if any(
+                n not in input_dict
+                for n in self.inputs
+                if not isinstance(n, CGOperation.Modifiers.OptionalData)
+            ):
+                raise
+            logging.critical(e)
+            return {}
         except ValueError as e:
             logging.error(e)
             return {}
@@ -70,11 +158,216 @@ class CGOperation(BaseOperation):
             logging.critical(e)
             return {}
 
-        if len(self.outputs) == 1:
-            result = [result]
 
-        ret_dict = zip(self.outputs, result)
-        if output_list:
-            ret_dict = filter(lambda kv: kv[0] in set(output_list), ret_dict)
+@functools.lru_cache(maxsize=1024)
+def _CachedSignature(function: Callable) -> inspect.Signature | None:
+    # imported on first use, inspect pulls ast, dis and tokenize in with it
+    import inspect
 
-        return dict(ret_dict)
+    try:
+        return inspect.signature(function)
+    except (TypeError, ValueError):
+        # builtins without text signature
+        return None
+
+
+def _Signature(function: Callable) -> inspect.Signature | None:
+    try:
+        return _CachedSignature(function)
+    except TypeError:
+        # unhashable callables are inspected every time
+        return _CachedSignature.__wrapped__(function)
+
+
+class CGOutputFunctions:
+    def __init__(self, functions: Dict[str, Callable]):
+        # one function per output, each called with every input and attribute of the operation
+        self._functions = dict(functions)
+        self.__qualname__ = "CGOutputFunctions({})".format(
+            ",".join(f"{o}={f.__module__}:{f.__qualname__}" for o, f in self._functions.items())
+        )
+
+    @property
+    def functions(self) -> Dict[str, Callable]:
+        return self._functions
+
+    def __call__(self, *args: Any, outputs: List[str] | None = None, **kwargs: Any) -> Dict[str, Any]:
+        return {o: self._functions[o](*args, **kwargs) for o in (outputs or self._functions)}
+
+
+class CGOperationError(Exception):
+    def __init__(self, operation: str, error: BaseException):
+        super().__init__(f"operation:`{operation}` failed, {error!r}")
+        self.operation = operation
+        self.error = error
+
+
+class CGFusedOperation(CGOperation):
+    _PREVIOUS = object()
+
+    def __init__(self, operations: List[BaseOperation], uid: str | None = None):
+        inputs: List[str] = []
+        program = []
+        for i, operation in enumerate(operations):
+            previous = operations[i - 1].outputs[0] if i else None
+            args = tuple(CGFusedOperation._PREVIOUS if a == previous else a for a in operation.inputs)
+            for a in args:
+                if a is not CGFusedOperation._PREVIOUS and a not in inputs:
+                    inputs.append(a)
+            program.append((operation.function, args, dict(operation.attr_dict), operation.name))
+
+        costs = [operation.cost for operation in operations]
+        super().__init__(
+            "+".join(operation.name for operation in operations),
+            inputs,
+            list(operations[-1].outputs),
+            self._Run,
+            {
+                "fused": [
+                    (f"{op.function.__module__}:{op.function.__qualname__}", op.attr_dict)
+                    for op in operations
+                ]
+            },
+            # the same operations always fuse into the same uid, a reloaded plan keeps its identities
+            uid or uuid.uuid5(uuid.NAMESPACE_OID, "+".join(op.uid for op in operations)).hex,
+            cost=None if None in costs else sum(costs),
+            chunkable=all(operation.chunkable for operation in operations),
+            resources=_ChainResources(operations),
+            types={n: t for operation in operations for n, t in operation.types.items()},
+        )
+        self._operations = list(operations)
+        self._intermediates = [operation.outputs[0] for operation in operations[:-1]]
+        self._program = program
+
+    @property
+    def operations(self) -> List[BaseOperation]:
+        return self._operations
+
+    @property
+    def intermediates(self) -> List[str]:
+        return self._intermediates
+
+    def _Run(
+        self, input_dict: Dict, perf_register_callback: Callable[[str, float], None] | None = None
+    ) -> Any:
+        # intermediates only live in `value`, they never reach the network cache
+        value = None
+        for function, args, kwargs, name in self._program:
+            inputs = [value if a is CGFusedOperation._PREVIOUS else input_dict[a] for a in args]
+
+            t_start = time.time()
+            try:
+                value = function(*inputs, **kwargs) if kwargs else function(*inputs)
+            except Exception as e:
+                raise CGOperationError(name, e) from e
+            if perf_register_callback is not None:
+                perf_register_callback(name, time.time() - t_start)
+
+        return value
+
+    def Execute(
+        self,
+        input_dict: Dict,
+        output_list: List[str] | None = None,
+        perf_register_callback: Callable[[str, float], None] | None = None,
+    ) -> Dict:
+        # errors are raised as CGOperationError, naming the operation of the chain that failed
+        return self._Outputs(self._Run(input_dict, perf_register_callback), output_list)
+
+    def Compute(
+        self,
+        input_dict: Dict,
+        output_list: List[str] | None = None,
+        perf_register_callback: Callable[[str, float], None] | None = None,
+    ) -> Dict:
+        try:
+            result = self._Run(input_dict, perf_register_callback)
+        except CGOperationError as e:
+            if isinstance(e.error, ValueError):
+                logging.error(e.error)
+            else:
+                logging.critical(e.error)
+            return {}
+
+        return self._Outputs(result, output_list)
+
+
+def _ChainResources(operations: List[BaseOperation]) -> CGResources | None:
+    # a chain runs one operation at a time, it holds the most any of them needs
+    annotated = [operation.resources for operation in operations if operation.resources is not None]
+    if not annotated:
+        return None
+    return CGResources(
+        max(r.cpu for r in annotated),
+        max(r.memory for r in annotated),
+        any(r.exclusive for r in annotated),
+    )
+
+
+class CGAliasOperation(CGOperation):
+    def __init__(self, operation: BaseOperation, canonical: BaseOperation):
+        # reads the outputs of an identical operation instead of computing its own
+        super().__init__(
+            operation.name,
+            list(canonical.outputs),
+            list(operation.outputs),
+            self._Alias,
+            {},
+            operation.uid,
+            chunkable=canonical.chunkable,
+            types={
+                **{n: t for n, t in canonical.types.items() if n in canonical.outputs},
+                **{n: t for n, t in operation.types.items() if n in operation.outputs},
+            },
+        )
+        self._operation = operation
+        self._canonical = canonical
+
+    @property
+    def operation(self) -> BaseOperation:
+        return self._operation
+
+    @property
+    def canonical(self) -> BaseOperation:
+        return self._canonical
+
+    def _Alias(self, *values: Any) -> Any:
+        return values[0] if len(values) == 1 else values
+
+
+class CGConstantOperation(CGOperation):
+    def __init__(self, values: Dict[str, Any], uid: str | None = None):
+        # constants are passed whole to every chunk, like non-array inputs
+        super().__init__("constants", [], list(values), self._Values, {}, uid, chunkable=True)
+        self._values = dict(values)
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        return self._values
+
+    def _Values(self) -> Any:
+        values = list(self._values.values())
+        return values[0] if len(values) == 1 else values
+
+
+class CGPartialOperation(CGOperation):
+    def __init__(self, operation: BaseOperation, outputs: List[str]):
+        # a demand aware operation restricted to the outputs a plan reads
+        super().__init__(
+            operation.name,
+            operation.inputs,
+            list(outputs),
+            operation.function,
+            operation.attr_dict,
+            operation.uid,
+            cost=operation.cost,
+            chunkable=operation.chunkable,
+            demand=True,
+            resources=operation.resources,
+            types=operation.types,
+        )
+        self._operation = operation
+
+    @property
+    def operation(self) -> BaseOperation:
+        return self._operation
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   partition.py
+# @Time    :   2026/10/20 00:18:52
+# _____________________________________________________________________________
+
+"""Partitioning of compiled plans across workers.
+
+The steps of a compiled plan (fused chains stay whole) are split into one
+partition per worker. Node weights are operation costs from a `CGCostModel`,
+edge weights the size of the data passed between operations; a data value is
+sent once to every other worker that reads it. Partitions are kept within
+`imbalance` of an even split of the total cost while the transferred volume is
+minimized with a multilevel heuristic:
+
+    coarsen     operations joined along their heaviest edges, level by level
+    initial     coarse nodes placed greedily with the worker they exchange most with
+    refine      boundary nodes moved to the worker that saves the most volume,
+                on every level back to the operations
+
+Sizes can be measured from the values of a call with `MeasureDataSizes`.
+"""
+
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.scheduler import CGCostModel
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def MeasureDataSizes(values: Dict[str, Any]) -> Dict[str, int]:
+    # bytes of each value, arrays by their buffers
+    sizes = {}
+    for name, value in values.items():
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            sizes[name] = value.nbytes
+        else:
+            sizes[name] = sys.getsizeof(value)
+    return sizes
+
+
+class CGPartitionPlan:
+    def __init__(
+        self,
+        steps: List[Any],
+        workers: Dict[BaseOperation, int],
+        transfers: List[Tuple[str, int, int]],
+        transfer_volume: float,
+        loads: List[float],
+    ):
+        self._steps = steps
+        self._workers = workers
+        self._transfers = transfers
+        self._transfer_volume = transfer_volume
+        self._loads = loads
+
+    @property
+    def workers(self) -> Dict[BaseOperation, int]:
+        return self._workers
+
+    @property
+    def transfers(self) -> List[Tuple[str, int, int]]:
+        # (data, from worker, to worker)
+        return self._transfers
+
+    @property
+    def transfer_volume(self) -> float:
+        return self._transfer_volume
+
+    @property
+    def loads(self) -> List[float]:
+        return self._loads
+
+    def Worker(self, operation: BaseOperation) -> int:
+        return self._workers[operation]
+
+    def Steps(self, worker: int) -> List[BaseOperation]:
+        # the operations of one worker, in plan order
+        return [step for step in self._steps if step in self._workers and self._workers[step] == worker]
+
+
+class CGPartitioner:
+    def __init__(
+        self,
+        n_workers: int,
+        cost_model: CGCostModel | None = None,
+        data_size: Callable[[str], float] | None = None,
+        imbalance: float = 0.1,
+    ):
+        self._n_workers = max(1, n_workers)
+        self._cost_model = cost_model or CGCostModel()
+        self._data_size = data_size
+        self._imbalance = imbalance
+
+    @property
+    def n_workers(self) -> int:
+        return self._n_workers
+
+    def DataSize(self, data_name: str) -> float:
+        return self._data_size(data_name) if self._data_size else 1.0
+
+    def Partition(self, steps: Iterable) -> CGPartitionPlan:
+        steps = list(steps)
+        operations = [step for step in steps if isinstance(step, BaseOperation)]
+        n = len(operations)
+        k = self._n_workers
+
+        weights = [self._cost_model.GetCost(operation) for operation in operations]
+        producers = {output: i for i, operation in enumerate(operations) for output in operation.outputs}
+        readers: Dict[str, List[int]] = {}
+        for i, operation in enumerate(operations):
+            for input_ in operation.inputs:
+                if input_ in producers and producers[input_] != i:
+                    readers.setdefault(input_, []).append(i)
+
+        # a net is a data value with its producer and readers, sent once to every other worker reading it
+        nets = [
+            (name, self.DataSize(name), producers[name], consumers) for name, consumers in readers.items()
+        ]
+        nets_of: List[List[int]] = [[] for _ in range(n)]
+        for index, (_, _, producer, consumers) in enumerate(nets):
+            for i in {producer, *consumers}:
+                nets_of[i].append(index)
+
+        capacity = sum(weights) / k * (1 + self._imbalance)
+
+        # coarsening, every level maps the nodes of the previous level to its own
+        adjacency: List[Dict[int, float]] = [{} for _ in range(n)]
+        for _, size, producer, consumers in nets:
+            for consumer in consumers:
+                adjacency[producer][consumer] = adjacency[producer].get(consumer, 0.0) + size
+                adjacency[consumer][producer] = adjacency[consumer].get(producer, 0.0) + size
+
+        levels: List[Tuple[List[int], List[Dict[int, float]], List[float]]] = []
+        level_weights = list(weights)
+        while len(level_weights) > 4 * k:
+            mapping, coarse_adjacency, coarse_weights = _Coarsen(adjacency, level_weights, capacity / 2)
+            if len(coarse_weights) > 0.9 * len(level_weights):
+                break
+            levels.append((mapping, adjacency, level_weights))
+            adjacency, level_weights = coarse_adjacency, coarse_weights
+
+        parts = _InitialPartition(adjacency, level_weights, k, capacity)
+        _Refine(parts, adjacency, level_weights, k, capacity)
+
+        # projected back level by level, refined on each
+        for mapping, adjacency, level_weights in reversed(levels):
+            parts = [parts[mapping[i]] for i in range(len(mapping))]
+            _Refine(parts, adjacency, level_weights, k, capacity)
+
+        # the finest level counts every data value once per receiving worker
+        _RefineVolume(parts, nets, nets_of, weights, k, capacity)
+
+        transfers = []
+        volume = 0.0
+        for name, size, producer, consumers in nets:
+            for worker in sorted({parts[c] for c in consumers} - {parts[producer]}):
+                transfers.append((name, parts[producer], worker))
+                volume += size
+
+        loads = [0.0] * k
+        for i, weight in enumerate(weights):
+            loads[parts[i]] += weight
+
+        workers = {operation: parts[i] for i, operation in enumerate(operations)}
+        return CGPartitionPlan(steps, workers, transfers, volume, loads)
+
+
+def _Coarsen(
+    adjacency: List[Dict[int, float]], weights: List[float], max_weight: float
+) -> Tuple[List[int], List[Dict[int, float]], List[float]]:
+    # heavy edge matching, a node joins the unmatched neighbour it exchanges the most with
+    n = len(weights)
+    mapping = [-1] * n
+    coarse_weights: List[float] = []
+    for node in range(n):
+        if mapping[node] != -1:
+            continue
+        mapping[node] = len(coarse_weights)
+        weight = weights[node]
+        candidates = [
+            (edge, neighbour)
+            for neighbour, edge in adjacency[node].items()
+            if mapping[neighbour] == -1 and weight + weights[neighbour] <= max_weight
+        ]
+        if candidates:
+            neighbour = max(candidates)[1]
+            mapping[neighbour] = mapping[node]
+            weight += weights[neighbour]
+        coarse_weights.append(weight)
+
+    coarse_adjacency: List[Dict[int, float]] = [{} for _ in coarse_weights]
+    for node in range(n):
+        for neighbour, edge in adjacency[node].items():
+            a, b = mapping[node], mapping[neighbour]
+            if a != b:
+                coarse_adjacency[a][b] = coarse_adjacency[a].get(b, 0.0) + edge
+    return mapping, coarse_adjacency, coarse_weights
+
+
+def _InitialPartition(
+    adjacency: List[Dict[int, float]], weights: List[float], k: int, capacity: float
+) -> List[int]:
+    # heaviest nodes first, each with the worker it exchanges the most with while there is room
+    parts = [-1] * len(weights)
+    loads = [0.0] * k
+    for node in sorted(range(len(weights)), key=lambda i: -weights[i]):
+        connection = [0.0] * k
+        for neighbour, edge in adjacency[node].items():
+            if parts[neighbour] != -1:
+                connection[parts[neighbour]] += edge
+        fitting = [w for w in range(k) if loads[w] + weights[node] <= capacity] or list(range(k))
+        worker = max(fitting, key=lambda w: (connection[w], -loads[w]))
+        parts[node] = worker
+        loads[worker] += weights[node]
+    return parts
+
+
+def _Refine(
+    parts: List[int], adjacency: List[Dict[int, float]], weights: List[float], k: int, capacity: float
+):
+    loads = [0.0] * k
+    for node, weight in enumerate(weights):
+        loads[parts[node]] += weight
+
+    for _ in range(4):
+        moved = False
+        for node in range(len(parts)):
+            current = parts[node]
+            connection = [0.0] * k
+            for neighbour, edge in adjacency[node].items():
+                connection[parts[neighbour]] += edge
+
+            best = current
+            for worker in range(k):
+                if worker == current or loads[worker] + weights[node] > capacity:
+                    continue
+                if connection[worker] > connection[best]:
+                    best = worker
+            if best != current:
+                parts[node] = best
+                loads[current] -= weights[node]
+                loads[best] += weights[node]
+                moved = True
+        if not moved:
+            break
+
+
+def _RefineVolume(
+    parts: List[int], nets: List, nets_of: List[List[int]], weights: List[float], k: int, capacity: float
+):
+    loads = [0.0] * k
+    for i, weight in enumerate(weights):
+        loads[parts[i]] += weight
+
+    def volume(node: int) -> float:
+        total = 0.0
+        for index in nets_of[node]:
+            _, size, producer, consumers = nets[index]
+            total += size * len({parts[c] for c in consumers} - {parts[producer]})
+        return total
+
+    for _ in range(4):
+        moved = False
+        for node in range(len(parts)):
+            current = parts[node]
+            before = volume(node)
+            best, best_gain = current, 0.0
+            for worker in range(k):
+                if worker == current or loads[worker] + weights[node] > capacity:
+                    continue
+                parts[node] = worker
+                if (gain := before - volume(node)) > best_gain:
+                    best, best_gain = worker, gain
+            parts[node] = best
+            if best != current:
+                loads[current] -= weights[node]
+                loads[best] += weights[node]
+                moved = True
+        if not moved:
+            break
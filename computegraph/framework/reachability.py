@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   reachability.py
+# @Time    :   2026/10/19 21:12:40
+# _____________________________________________________________________________
+
+"""Reachability index over the positions of a compiled plan.
+
+Fused steps are expanded into their operations, every operation then gets a
+position in plan order and the positions of the operations producing its
+inputs. Dependencies are read from the steps, so aliases and baked constants
+are followed like any other edge.
+
+A requirement query selects the ancestors of the requested outputs that are
+not ancestors of the provided inputs. Up to `BITSET_LIMIT` operations, every
+position also holds an ancestor bitset (a python int) and a query is a handful
+of bitwise operations; the bitsets take one bit per pair of operations, so
+larger plans walk the dependencies back from the names instead, linear in the
+size of the plan for each query. The steps and the required inputs are then
+read from the selected positions only; demand aware operations are narrowed to
+the outputs that are requested or read by another selected operation.
+"""
+
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.operation import CGConstantOperation, CGFusedOperation, CGPartialOperation
+
+
+def _Bits(mask: int) -> List[int]:
+    # positions of the set bits, read from the binary string in a single pass
+    return [position for position, bit in enumerate(reversed(bin(mask))) if bit == "1"]
+
+
+class CGReachabilityIndex:
+    # above this number of operations the ancestor bitsets are not built
+    BITSET_LIMIT = 4096
+
+    def __init__(self, steps: List[Any]):
+        self._steps = steps
+        self._operations: List[BaseOperation] = []
+        self._owner: List[int] = []  # step index of every position
+        self._sources: List[Tuple[str, ...]] = []
+        self._parents: List[Tuple[int, ...]] = []  # positions producing the inputs of every position
+        self._fused_ranges: Dict[int, range] = {}
+
+        self._producers: Dict[str, int] = {}
+        self._deletions: Dict[str, int] = {}  # step index of the delete instruction of a data
+        self._constants: Tuple[str, ...] = ()
+
+        for index, step in enumerate(steps):
+            if isinstance(step, CGConstantOperation):
+                # baked constants are not producers, they count as provided inputs
+                self._constants = tuple(step.outputs)
+            elif isinstance(step, CGFusedOperation):
+                start = len(self._operations)
+                for operation in step.operations:
+                    self._Add(operation, index)
+                self._fused_ranges[index] = range(start, len(self._operations))
+            elif isinstance(step, BaseOperation):
+                self._Add(step, index)
+            else:
+                self._deletions[str(step)] = index
+
+        self._masks: List[int] | None = None
+        if len(self._operations) <= self.BITSET_LIMIT:
+            self._masks = []
+            for position, parents in enumerate(self._parents):
+                mask = 1 << position
+                for parent in parents:
+                    mask |= self._masks[parent]
+                self._masks.append(mask)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def _Add(self, operation: BaseOperation, index: int):
+        position = len(self._operations)
+        parents = set()
+        sources = []
+        for input_ in operation.inputs:
+            if (producer := self._producers.get(input_, None)) is not None:
+                parents.add(producer)
+            elif input_ not in self._constants:
+                sources.append(input_)
+
+        for output in operation.outputs:
+            self._producers[output] = position
+
+        self._operations.append(operation)
+        self._owner.append(index)
+        self._sources.append(tuple(sources))
+        self._parents.append(tuple(parents))
+
+    def _Ancestors(self, names: Iterable[str]) -> bytearray:
+        # marks the producers of the names and everything upstream of them
+        marked = bytearray(len(self._operations))
+        stack = [self._producers[n] for n in names if n in self._producers]
+        while stack:
+            position = stack.pop()
+            if marked[position]:
+                continue
+            marked[position] = 1
+            stack.extend(p for p in self._parents[position] if not marked[p])
+        return marked
+
+    def _Selected(self, inputs: Tuple[str, ...], outputs: Tuple[str, ...]) -> List[int]:
+        # positions needed for the outputs and not upstream of the inputs, in plan order
+        excluded_names = inputs + self._constants
+        if self._masks is not None:
+            masks, producers = self._masks, self._producers
+            necessary = (1 << len(masks)) - 1
+            if outputs:
+                necessary = 0
+                for name in outputs:
+                    if name in producers:
+                        necessary |= masks[producers[name]]
+            for name in excluded_names:
+                if name in producers:
+                    necessary &= ~masks[producers[name]]
+            return _Bits(necessary)
+
+        excluded = self._Ancestors(excluded_names)
+        if not outputs:
+            return [p for p in range(len(excluded)) if not excluded[p]]
+        necessary = self._Ancestors(outputs)
+        return [p for p in range(len(excluded)) if necessary[p] and not excluded[p]]
+
+    def Query(self, inputs: Tuple[str, ...], outputs: Tuple[str, ...]) -> Tuple[Tuple, Tuple]:
+        inputs, outputs = tuple(inputs), tuple(outputs)
+        positions = self._Selected(inputs, outputs)
+
+        steps = self._steps
+        operations = self._operations
+        owner = self._owner
+
+        requirements: List[Any] = []
+        if self._constants:
+            requirements.append(steps[0])
+
+        # delete instructions are kept for data read by a selected operation, unless requested
+        read = set()
+        required_inputs = set(inputs)
+        for position in positions:
+            read.update(operations[position].inputs)
+            required_inputs.update(self._sources[position])
+        deletions = {self._deletions[n]: n for n in read if n in self._deletions and n not in outputs}
+
+        # a demand aware operation computes the outputs that are read or requested only
+        needed = read | set(outputs) if outputs else None
+
+        # a fused step runs whole, unless part of it is provided or one of its intermediates is requested
+        selected = set(positions)
+        fused: Dict[int, bool] = {}
+        step_indices: List[Tuple[int, Any]] = []
+        for position in positions:
+            index = owner[position]
+            step = steps[index]
+            if not isinstance(step, CGFusedOperation):
+                if needed is not None and step.demand and not needed.issuperset(step.outputs):
+                    step = CGPartialOperation(step, [o for o in step.outputs if o in needed])
+                step_indices.append((index, step))
+                continue
+
+            if (whole := fused.get(index, None)) is None:
+                whole = selected.issuperset(self._fused_ranges[index])
+                whole = fused[index] = whole and not set(step.intermediates) & set(outputs)
+                if whole:
+                    step_indices.append((index, step))
+            if not whole:
+                step_indices.append((index, operations[position]))
+
+        step_indices.extend((index, steps[index]) for index in deletions)
+        step_indices.sort(key=lambda item: item[0])
+        requirements.extend(step for _, step in step_indices)
+
+        return tuple(sorted(required_inputs)), tuple(requirements)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   scheduler.py
+# @Time    :   2026/10/19 16:40:12
+# _____________________________________________________________________________
+
+"""Cost model and list scheduling of compiled network operations.
+
+Operation costs are taken from the optional `cost` annotation of an operation,
+falling back to timings collected in a network `perf_register` and persisted
+between runs by `CGCostModel`. `CGListScheduler` ranks operations by their
+upward rank (longest remaining path to an exit, HEFT style) and simulates a
+placement on a number of workers, charging a transfer cost whenever an input
+lives on a different worker than the one the operation is placed on.
+
+`CGResourceBudget` bounds the CPU slots and memory held by the operations a
+parallel call runs at once, by their `CGResources` annotations; an exclusive
+operation runs alone.
+"""
+
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence
+
+from computegraph.framework.base import BaseOperation, CGResources
+
+
+class CGCostModel:
+    def __init__(self, path: str | None = None, default_cost: float = 1e-3, smoothing: float = 0.5):
+        self._path = path
+        self._default_cost = default_cost
+        self._smoothing = smoothing
+        self._history: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.Load()
+
+    @property
+    def path(self) -> str | None:
+        return self._path
+
+    @property
+    def history(self) -> Dict[str, float]:
+        return self._history
+
+    def GetCost(self, operation: BaseOperation) -> float:
+        if operation.cost is not None:
+            return operation.cost
+        return self._history.get(operation.name, self._default_cost)
+
+    def Update(self, perf_register: Dict[str, float]):
+        # exponential moving average, so a single slow run does not dominate the history
+        with self._lock:
+            for name, exec_time in perf_register.items():
+                if name in self._history:
+                    exec_time = self._smoothing * exec_time + (1 - self._smoothing) * self._history[name]
+                self._history[name] = exec_time
+
+    def Load(self):
+        if self._path is None:
+            logging.error("cost model has no path to load from")
+            return
+
+        try:
+            with open(self._path, "r") as f:
+                self._history = {str(k): float(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logging.error(f"failed to load cost model:`{self._path}`")
+            logging.error(e)
+
+    def Save(self):
+        if self._path is None:
+            logging.error("cost model has no path to save to")
+            return
+
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with self._lock, open(tmp_path, "w") as f:
+            json.dump(self._history, f)
+        os.replace(tmp_path, self._path)
+
+
+class ScheduleEntry(NamedTuple):
+    operation: BaseOperation
+    worker: int
+    start: float
+    finish: float
+
+
+class CGListScheduler:
+    def __init__(
+        self,
+        cost_model: CGCostModel | None = None,
+        n_workers: int = 1,
+        transfer_cost: Callable[[str], float] | None = None,
+    ):
+        self._cost_model = cost_model or CGCostModel()
+        self._n_workers = max(1, n_workers)
+        self._transfer_cost = transfer_cost
+
+    @property
+    def cost_model(self) -> CGCostModel:
+        return self._cost_model
+
+    @property
+    def n_workers(self) -> int:
+        return self._n_workers
+
+    def TransferCost(self, data_name: str) -> float:
+        # threads share memory, locality only matters for process or distributed workers
+        return self._transfer_cost(data_name) if self._transfer_cost else 0.0
+
+    def Prioritize(self, steps: Iterable) -> Dict[BaseOperation, float]:
+        operations = [step for step in steps if isinstance(step, BaseOperation)]
+
+        consumers: Dict[str, List[BaseOperation]] = {}
+        for operation in operations:
+            for input_ in operation.inputs:
+                consumers.setdefault(input_, []).append(operation)
+
+        # upward rank: own cost plus the most expensive path to an exit operation
+        ranks: Dict[BaseOperation, float] = {}
+        for operation in reversed(operations):
+            tail = 0.0
+            for output in operation.outputs:
+                for consumer in consumers.get(output, []):
+                    tail = max(tail, self.TransferCost(output) + ranks[consumer])
+            ranks[operation] = self._cost_model.GetCost(operation) + tail
+
+        return ranks
+
+    def Schedule(self, steps: Iterable, prioritize: bool = True) -> List[ScheduleEntry]:
+        operations = [step for step in steps if isinstance(step, BaseOperation)]
+        ranks = self.Prioritize(operations) if prioritize else {}
+
+        producers: Dict[str, BaseOperation] = {p: op for op in operations for p in op.outputs}
+        pending = {
+            op: len({producers[i] for i in op.inputs if i in producers and producers[i] is not op})
+            for op in operations
+        }
+        successors: Dict[BaseOperation, List[BaseOperation]] = {op: [] for op in operations}
+        for op in operations:
+            for predecessor in {producers[i] for i in op.inputs if i in producers and producers[i] is not op}:
+                successors[predecessor].append(op)
+
+        # fifo keeps the ready order, otherwise the highest upward rank goes first
+        order = {op: i for i, op in enumerate(operations)}
+        ready_heap: List = []
+        ready_fifo: deque = deque()
+
+        def push(op: BaseOperation):
+            if prioritize:
+                heapq.heappush(ready_heap, (-ranks[op], order[op], op))
+            else:
+                ready_fifo.append(op)
+
+        for op in operations:
+            if pending[op] == 0:
+                push(op)
+
+        worker_free = [0.0] * self._n_workers
+        placement: Dict[BaseOperation, ScheduleEntry] = {}
+        schedule: List[ScheduleEntry] = []
+
+        while ready_heap or ready_fifo:
+            op = heapq.heappop(ready_heap)[2] if prioritize else ready_fifo.popleft()
+            cost = self._cost_model.GetCost(op)
+
+            best: ScheduleEntry | None = None
+            for worker in range(self._n_workers):
+                start = worker_free[worker]
+                for input_ in op.inputs:
+                    if (producer := producers.get(input_)) is None or producer is op:
+                        continue
+                    entry = placement[producer]
+                    arrival = entry.finish + (0.0 if entry.worker == worker else self.TransferCost(input_))
+                    start = max(start, arrival)
+                if best is None or start + cost < best.finish:
+                    best = ScheduleEntry(op, worker, start, start + cost)
+
+            assert best is not None
+            placement[op] = best
+            schedule.append(best)
+            worker_free[best.worker] = best.finish
+
+            for successor in successors[op]:
+                pending[successor] -= 1
+                if pending[successor] == 0:
+                    push(successor)
+
+        if len(schedule) != len(operations):
+            logging.error("operations left unscheduled, steps are not topologically ordered")
+
+        return schedule
+
+    @staticmethod
+    def Makespan(schedule: Sequence[ScheduleEntry]) -> float:
+        return max((entry.finish for entry in schedule), default=0.0)
+
+
+class CGResourceBudget:
+    def __init__(self, cpu: int | None = None, memory: float | None = None):
+        # shared by every call given the budget, concurrent calls on one box draw from the same slots
+        self._cpu = cpu
+        self._memory = memory
+        self._used_cpu = 0
+        self._used_memory = 0.0
+        self._holders = 0
+        self._exclusive = False
+        self._version = 0
+        self._condition = threading.Condition()
+
+    @property
+    def cpu(self) -> int | None:
+        return self._cpu
+
+    @property
+    def memory(self) -> float | None:
+        return self._memory
+
+    @property
+    def used(self) -> CGResources:
+        return CGResources(self._used_cpu, self._used_memory, self._exclusive)
+
+    @property
+    def version(self) -> int:
+        # changes on every release, a caller that could not acquire waits for the next one
+        return self._version
+
+    def TryAcquire(self, resources: CGResources | None) -> bool:
+        resources = resources or CGResources()
+        with self._condition:
+            if self._exclusive or (resources.exclusive and self._holders):
+                return False
+            # an operation larger than the whole budget runs alone rather than never
+            if self._holders and (
+                (self._cpu is not None and self._used_cpu + resources.cpu > self._cpu)
+                or (self._memory is not None and self._used_memory + resources.memory > self._memory)
+            ):
+                return False
+
+            self._used_cpu += resources.cpu
+            self._used_memory += resources.memory
+            self._holders += 1
+            self._exclusive = resources.exclusive
+            return True
+
+    def Release(self, resources: CGResources | None):
+        resources = resources or CGResources()
+        with self._condition:
+            self._used_cpu -= resources.cpu
+            self._used_memory -= resources.memory
+            self._holders -= 1
+            self._exclusive = False
+            self._version += 1
+            self._condition.notify_all()
+
+    def Wait(self, version: int, timeout: float | None = None):
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != version, timeout)
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   serialize.py
+# @Time    :   2026/10/19 17:52:31
+# _____________________________________________________________________________
+
+"""Binary save/load of compiled compute networks.
+
+A saved network holds its graph, the compiled `ordered_steps` (including
+delete instructions) and the cached requirement plans, so a worker can start
+executing without compiling. Operations are stored by the import path of their
+class and function plus a JSON encoded `attr_dict`; functions that cannot be
+imported by path (lambdas, closures) cannot be saved.
+
+Steps built by compile passes (fused chains, aliases of duplicated operations,
+baked constants, demand aware operations narrowed by a plan) are stored by the
+operations they refer to and rebuilt on load; constant values are stored as
+JSON.
+
+Layout, little endian, version 5::
+
+    header      magic `CGNW`, version, flags, section sizes
+    strings     uint32 offsets (n + 1) followed by the utf-8 blob
+    operations  int32 records of 8 fields per graph operation, options as a JSON string
+    io          int32 string ids of operation inputs and outputs
+    composite   int32 stream of (kind, n, operation indices or output string ids...) per compiled
+                or narrowed step
+    steps       int32 per step, operation index, composite index | (1 << 29), or -(string id + 1) for a delete
+    plans       int32 stream of (n, ids...) groups per cached requirement, steps encoded as above
+    attrs       utf-8 JSON of attr dicts, compile constants and baked constant values
+
+Loading maps the file with `mmap` and reads the integer sections through
+`memoryview` casts, without copying them.
+"""
+
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Callable, Dict, List
+
+from computegraph.framework.base import BaseOperation, CGResources
+from computegraph.framework.inference import InferTypes
+
+MAGIC = b"CGNW"
+VERSION = 5
+
+_HEADER = struct.Struct("<4sHHIIIIIII")
+_OPTIONAL_FLAG = 1 << 30
+_COMPOSITE_FLAG = 1 << 29
+_FLAG_COMPILED = 1
+_FLAG_OPTIMIZED = 2
+
+_KIND_FUSED = 0
+_KIND_ALIAS = 1
+_KIND_CONSTANT = 2
+_KIND_PARTIAL = 3
+
+
+def ImportPath(obj: Any) -> str:
+    return f"{obj.__module__}:{obj.__qualname__}"
+
+
+def ResolveImportPath(path: str) -> Any:
+    module_name, qualname = path.split(":", 1)
+    obj = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _OperationOptions(operation: BaseOperation) -> Dict[str, Any]:
+    # keyword arguments of the operation constructor beyond the positional ones
+    resources = operation.resources._asdict() if operation.resources is not None else None
+    return {
+        "cost": operation.cost,
+        "chunkable": operation.chunkable,
+        "demand": operation.demand,
+        "resources": resources,
+        "types": {n: ImportPath(t) for n, t in operation.types.items()},
+    }
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def __call__(self, string: str) -> int:
+        if (sid := self.ids.get(string, None)) is None:
+            sid = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return sid
+
+    def Pack(self) -> bytes:
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = array("I", [0])
+        for blob in encoded:
+            offsets.append(offsets[-1] + len(blob))
+
+        # pad to keep the int32 sections that follow aligned
+        packed = offsets.tobytes() + b"".join(encoded)
+        return packed + bytes(-len(packed) % 4)
+
+
+def DumpNetwork(network, path: str) -> bool:
+    # imported here, network imports this module lazily for Save/Load
+    from computegraph.framework.operation import (
+        CGAliasOperation,
+        CGConstantOperation,
+        CGFusedOperation,
+        CGOperation,
+        CGOutputFunctions,
+        CGPartialOperation,
+    )
+
+    if not network.flag_compiled:
+        logging.error(f"network:`{network.name}` must be compiled before saving")
+        return False
+
+    strings = _StringTable()
+    strings(network.name)
+    strings(network.uid)
+
+    steps = list(network.ordered_steps)
+    graph = network.graph
+    operations = [node for node in graph.nodes if isinstance(node, BaseOperation)]
+    operation_index = {operation: i for i, operation in enumerate(operations)}
+
+    records = array("i")
+    io = array("i")
+    attrs = []
+    for operation in operations:
+        # per-output functions are stored as a JSON object of import paths
+        if isinstance(operation.function, CGOutputFunctions):
+            paths = {o: ImportPath(f) for o, f in operation.function.functions.items()}
+            function_path = json.dumps(paths, separators=(",", ":"))
+        else:
+            function_path = ImportPath(operation.function)
+        if "<" in function_path:
+            logging.error(f"operation:`{operation.name}` function:`{function_path}` is not importable")
+            return False
+
+        records.extend(
+            [
+                strings(operation.name),
+                strings(operation.uid),
+                strings(ImportPath(type(operation))),
+                strings(function_path),
+                strings(json.dumps(_OperationOptions(operation), separators=(",", ":"))),
+                len(operation.inputs),
+                len(operation.outputs),
+                len(io),
+            ]
+        )
+        for input_ in operation.inputs:
+            optional = isinstance(input_, CGOperation.Modifiers.OptionalData)
+            io.append(strings(input_) | (_OPTIONAL_FLAG if optional else 0))
+        io.extend(strings(output) for output in operation.outputs)
+        attrs.append(operation.attr_dict)
+
+    composite = array("i")
+    composite_index = {}
+    values = []
+    for step in steps:
+        if isinstance(step, CGFusedOperation):
+            references = [_KIND_FUSED, *(operation_index[operation] for operation in step.operations)]
+        elif isinstance(step, CGAliasOperation):
+            references = [_KIND_ALIAS, operation_index[step.operation], operation_index[step.canonical]]
+        elif isinstance(step, CGConstantOperation):
+            references = [_KIND_CONSTANT, len(values)]
+            values.append(step.values)
+        else:
+            continue
+        composite_index[step] = len(composite_index)
+        composite.extend([references[0], len(references) - 1, *references[1:]])
+
+    try:
+        blob = {"attrs": attrs, "constants": network.constants, "values": values}
+        attrs_blob = json.dumps(blob, separators=(",", ":")).encode("utf-8")
+    except TypeError as e:
+        logging.error(f"attr_dict or constants of network:`{network.name}` are not JSON serializable")
+        logging.error(e)
+        return False
+
+    def encode(step) -> int:
+        # operations narrowed to some outputs only appear in plans
+        if isinstance(step, CGPartialOperation) and step not in composite_index:
+            references = [_KIND_PARTIAL, operation_index[step.operation], *map(strings, step.outputs)]
+            composite_index[step] = len(composite_index)
+            composite.extend([references[0], len(references) - 1, *references[1:]])
+        if step in composite_index:
+            return composite_index[step] | _COMPOSITE_FLAG
+        if isinstance(step, BaseOperation):
+            return operation_index[step]
+        return -(strings(str(step)) + 1)
+
+    step_ids = array("i", (encode(step) for step in steps))
+
+    plans = array("i")
+    for (inputs, outputs), (required_inputs, requirement_steps) in network.cached_requirements.items():
+        for names in (inputs, outputs, required_inputs):
+            plans.append(len(names))
+            plans.extend(strings(name) for name in names)
+        plans.append(len(requirement_steps))
+        plans.extend(encode(step) for step in requirement_steps)
+
+    strings_blob = strings.Pack()
+    flags = _FLAG_COMPILED | (_FLAG_OPTIMIZED if network._flag_optimized else 0)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        len(strings.strings),
+        len(strings_blob) - 4 * (len(strings.strings) + 1),
+        len(operations),
+        len(io),
+        len(composite),
+        len(step_ids),
+        len(plans),
+    )
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        for section in (
+            header,
+            strings_blob,
+            records.tobytes(),
+            io.tobytes(),
+            composite.tobytes(),
+            step_ids.tobytes(),
+            plans.tobytes(),
+        ):
+            f.write(section)
+        f.write(attrs_blob)
+    os.replace(tmp_path, path)
+    return True
+
+
+def LoadNetwork(path: str, use_mmap: bool = True):
+    from computegraph.framework.network import CGNetwork
+    from computegraph.framework.operation import (
+        CGAliasOperation,
+        CGConstantOperation,
+        CGFusedOperation,
+        CGOperation,
+        CGOutputFunctions,
+        CGPartialOperation,
+    )
+
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else f.read()
+
+    view = memoryview(buffer)
+    sections: List[memoryview] = []
+    try:
+        header = _HEADER.unpack_from(view)
+        (
+            magic,
+            version,
+            flags,
+            n_strings,
+            strings_size,
+            n_operations,
+            n_io,
+            n_composite,
+            n_steps,
+            n_plans,
+        ) = header
+        if magic != MAGIC:
+            logging.error(f"file:`{path}` is not a saved network")
+            return None
+        if version != VERSION:
+            logging.error(f"file:`{path}` has unsupported version:`{version}`")
+            return None
+
+        offset = _HEADER.size
+
+        def section(n_items: int, fmt: str) -> memoryview:
+            nonlocal offset
+            size = n_items * struct.calcsize(fmt)
+            chunk = view[offset : offset + size]
+            sections.append(chunk)
+            sections.append(chunk.cast(fmt))
+            offset += size
+            return sections[-1]
+
+        string_offsets = section(n_strings + 1, "I")
+        blob = section(strings_size, "B")
+        strings = [str(blob[string_offsets[i] : string_offsets[i + 1]], "utf-8") for i in range(n_strings)]
+
+        records = section(8 * n_operations, "i")
+        io = section(n_io, "i")
+        composite = section(n_composite, "i")
+        step_ids = section(n_steps, "i")
+        plans = section(n_plans, "i")
+        blob = json.loads(str(view[offset:], "utf-8"))
+        attrs = blob["attrs"]
+
+        resolved: Dict[str, Callable] = {}
+
+        def resolve(path_sid: int) -> Any:
+            path = strings[path_sid]
+            if (obj := resolved.get(path, None)) is None:
+                if path.startswith("{"):
+                    obj = CGOutputFunctions({o: ResolveImportPath(p) for o, p in json.loads(path).items()})
+                else:
+                    obj = ResolveImportPath(path)
+                resolved[path] = obj
+            return obj
+
+        network = CGNetwork(strings[0], strings[1])
+        operations: List[BaseOperation] = []
+        for i in range(n_operations):
+            name, uid, cls, function, options, n_in, n_out, start = records[8 * i : 8 * i + 8].tolist()
+            inputs = [
+                CGOperation.Modifiers.OptionalData(strings[sid & ~_OPTIONAL_FLAG])
+                if sid & _OPTIONAL_FLAG
+                else strings[sid]
+                for sid in io[start : start + n_in].tolist()
+            ]
+            outputs = [strings[sid] for sid in io[start + n_in : start + n_in + n_out].tolist()]
+            options = json.loads(strings[options])
+            if options.get("resources", None) is not None:
+                options["resources"] = CGResources(**options["resources"])
+            options["types"] = {n: ResolveImportPath(p) for n, p in options.get("types", {}).items()}
+            operation = resolve(cls)(
+                strings[name],
+                inputs,
+                outputs,
+                resolve(function),
+                attrs[i],
+                strings[uid],
+                **options,
+            )
+            operations.append(operation)
+
+            # operations are stored in topological order, so the maintained order never has to move
+            network.AddOperation(operation)
+
+        graph = network.graph
+        composite_steps = []
+        cursor = 0
+        while cursor < n_composite:
+            kind, n = composite[cursor], composite[cursor + 1]
+            references = composite[cursor + 2 : cursor + 2 + n].tolist()
+            if kind == _KIND_FUSED:
+                composite_steps.append(CGFusedOperation([operations[i] for i in references]))
+            elif kind == _KIND_ALIAS:
+                composite_steps.append(CGAliasOperation(operations[references[0]], operations[references[1]]))
+            elif kind == _KIND_PARTIAL:
+                composite_steps.append(
+                    CGPartialOperation(operations[references[0]], [strings[s] for s in references[1:]])
+                )
+            else:
+                composite_steps.append(CGConstantOperation(blob["values"][references[0]]))
+            cursor += 2 + n
+
+        def decode(step_id: int) -> Any:
+            if step_id < 0:
+                return CGNetwork.DeleteInstruction(strings[-step_id - 1])
+            if step_id & _COMPOSITE_FLAG:
+                return composite_steps[step_id & ~_COMPOSITE_FLAG]
+            return operations[step_id]
+
+        steps = [decode(step_id) for step_id in step_ids]
+
+        cached_requirements = {}
+        cursor = 0
+        while cursor < n_plans:
+            groups = []
+            for _ in range(4):
+                n = plans[cursor]
+                groups.append(plans[cursor + 1 : cursor + 1 + n].tolist())
+                cursor += 1 + n
+            inputs, outputs, required_inputs, plan_steps = groups
+            cached_requirements[(tuple(strings[s] for s in inputs), tuple(strings[s] for s in outputs))] = (
+                tuple(strings[s] for s in required_inputs),
+                tuple(decode(s) for s in plan_steps),
+            )
+    finally:
+        for chunk in reversed(sections):
+            chunk.release()
+        view.release()
+        if use_mmap:
+            buffer.close()
+
+    network._ordered_steps = steps
+    network._ordered_step_ids = network._StepIds(steps)
+    network._constants = blob["constants"]
+    network._types, _ = InferTypes(operations, network._constants)
+    network._cached_requirements = cached_requirements
+    network._flag_optimized = bool(flags & _FLAG_OPTIMIZED)
+    network._flag_compiled = bool(flags & _FLAG_COMPILED)
+    network._flag_plan_stale = False
+    return network
@@ -38,19 +38,31 @@ import logging
 from typing import Any
 
 from computegraph.framework.base import BaseDataInterface, BaseSocket
+from computegraph.framework.inference import Compatible, DataType
 
 
 class CGSocket(BaseSocket):
     def Connect(self, socket: BaseSocket):
+        source, target = DataType(self), DataType(socket)
+        if not Compatible(source, target):
+            logging.error(
+                f"cannot connect socket:`{self.name}` of type `{source.__name__}`"
+                f" to socket:`{socket.name}` of type `{target.__name__}`"
+            )
+            return
+
         if socket not in self.connections:
             self._connections.add(socket)
+            self._Touch()
             self.Propogate()
 
     def Disconnect(self, socket: BaseSocket):
         self._connections.discard(socket)
+        self._Touch()
 
     def SetDataInterface(self, interface: BaseDataInterface) -> None:
         self._data_interface = interface
+        self._Touch()
 
     def GetValue(self) -> Any | None:
         return self.data_interface.GetValue() if self.data_interface else None
@@ -60,7 +72,7 @@ class CGSocket(BaseSocket):
             logging.debug(f"socket:`{self.name}` has no data interface")
             return
 
-        if self.data_interface.GetValue() == value:
+        if not self.data_interface.Changed(value):
             logging.debug(f"socket:`{self.name}` data interface value has not changed={value}")
             return
 
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   stream.py
+# @Time    :   2026/10/19 19:02:44
+# _____________________________________________________________________________
+
+"""Streaming evaluation of a compiled network over many input records.
+
+The operations of the plan are split into at most `max_stages` stages of
+about equal cost, one thread per stage, connected by bounded queues. Record
+`n + 1` can be in the first stage while record `n` is in the second, so
+throughput approaches the slowest stage rather than the sum of all stages. A
+semaphore bounds the number of records inside the pipeline, which makes
+producers wait (backpressure) and keeps memory bounded. Records leave the
+pipeline in the order they entered.
+
+A record missing inputs, or on which an operation fails, passes through the
+remaining stages untouched; its failure is logged and it comes out as None,
+the other records are not affected.
+"""
+
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Tuple
+
+from computegraph.framework.base import BaseOperation
+from computegraph.framework.operation import CGFusedOperation, CGOperationError
+
+_END = object()
+
+
+class _Record:
+    __slots__ = ("index", "cache", "error")
+
+    def __init__(self, index: int, cache: Dict[str, Any] | None, error: BaseException | None = None):
+        self.index = index
+        self.cache = cache
+        self.error = error
+
+
+def _Stages(operation_steps: Tuple, max_stages: int) -> List[List[Tuple[BaseOperation, List[str]]]]:
+    # an operation and the delete instructions following it stay together, fused steps are split
+    # back into their operations so a chain can be cut between two stages
+    operations: List[Tuple[BaseOperation, List[str]]] = []
+    for step in operation_steps:
+        if isinstance(step, CGFusedOperation):
+            operations.extend((operation, []) for operation in step.operations)
+        elif isinstance(step, BaseOperation):
+            operations.append((step, []))
+        elif operations:
+            operations[-1][1].append(step)
+
+    # contiguous groups of about equal cost, an operation without a cost counts as one
+    costs = [operation.cost or 1.0 for operation, _ in operations]
+    n_stages = max(1, min(max_stages, len(operations)))
+    share = sum(costs) / n_stages
+    stages: List[List[Tuple[BaseOperation, List[str]]]] = [[]]
+    accumulated = 0.0
+    for entry, cost in zip(operations, costs):
+        if stages[-1] and accumulated + cost / 2 > share * len(stages) and len(stages) < n_stages:
+            stages.append([])
+        stages[-1].append(entry)
+        accumulated += cost
+    return stages
+
+
+class CGStreamPipeline:
+    def __init__(
+        self,
+        operation_steps: Tuple,
+        required_inputs: Tuple,
+        outputs: List[str],
+        max_in_flight: int = 8,
+        max_stages: int = 4,
+    ):
+        self._required_inputs = required_inputs
+        self._outputs = outputs
+        self._max_in_flight = max(1, max_in_flight)
+        self._in_flight = threading.Semaphore(self._max_in_flight)
+        self._stop = threading.Event()
+        self._submitted = 0
+
+        self._stages = _Stages(operation_steps, max_stages)
+        self._queues = [queue.Queue(maxsize=self._max_in_flight) for _ in range(len(self._stages) + 1)]
+        self._threads = [
+            threading.Thread(
+                target=self._RunStage,
+                args=(i,),
+                name=f"stage:{'+'.join(operation.name for operation, _ in stage)}",
+                daemon=True,
+            )
+            for i, stage in enumerate(self._stages)
+        ]
+
+    @property
+    def closed(self) -> bool:
+        return self._stop.is_set()
+
+    @property
+    def n_stages(self) -> int:
+        return len(self._stages)
+
+    def Start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def _Put(self, index: int, item: Any) -> bool:
+        # only waits on a full queue, and gives up once the pipeline is closed
+        while not self._stop.is_set():
+            try:
+                self._queues[index].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _RunStage(self, index: int):
+        stage = self._stages[index]
+        while True:
+            record = self._queues[index].get()
+            if self._stop.is_set():
+                return
+
+            # records without inputs or already failed pass through
+            if record is not _END and record.cache is not None and record.error is None:
+                for operation, deletions in stage:
+                    try:
+                        record.cache |= operation.Execute(record.cache)
+                    except Exception as e:
+                        record.error = _StageError(operation, e)
+                        break
+                    for name in deletions:
+                        record.cache.pop(name, None)
+
+            if not self._Put(index + 1, record) or record is _END:
+                return
+
+    def Submit(self, input_dict: Dict[str, Any]):
+        # backpressure, wait until a record leaves the pipeline
+        self._in_flight.acquire()
+        if self._stop.is_set():
+            return
+
+        index, self._submitted = self._submitted, self._submitted + 1
+        if missing := [i for i in self._required_inputs if i not in input_dict]:
+            logging.error(f"record:`{index}` missing required inputs:`{tuple(missing)}`")
+            self._Put(0, _Record(index, None))
+        else:
+            self._Put(0, _Record(index, dict(input_dict)))
+
+    def Finish(self):
+        self._Put(0, _END)
+
+    def Get(self) -> Any:
+        record = self._queues[-1].get()
+        if record is _END or self._stop.is_set():
+            return _END
+        self._in_flight.release()
+
+        if record.error is not None:
+            logging.error(f"record:`{record.index}` failed, {record.error}")
+            return None
+        if record.cache is None:
+            return None
+
+        cache, outputs = record.cache, self._outputs
+        return {k: cache[k] for k in iter(cache) if k in outputs} if outputs else cache
+
+    def Close(self):
+        self._stop.set()
+
+        # wake every thread blocked on an empty queue or on the semaphore, a full queue has no reader waiting
+        for q in self._queues:
+            try:
+                q.put_nowait(_END)
+            except queue.Full:
+                pass
+        for _ in range(self._max_in_flight):
+            self._in_flight.release()
+
+
+def _StageError(operation: BaseOperation, error: BaseException) -> BaseException:
+    return error if isinstance(error, CGOperationError) else CGOperationError(operation.name, error)
+
+
+def _Pipeline(
+    network, first: Dict[str, Any], outputs: List[str], max_in_flight: int, max_stages: int
+) -> CGStreamPipeline | None:
+    if not network.flag_compiled:
+        logging.error("graph not compiled")
+        return None
+
+    required_inputs, operation_steps = network.EvaluateComputationRequirements(list(first.keys()), outputs)
+    pipeline = CGStreamPipeline(operation_steps, required_inputs, outputs, max_in_flight, max_stages)
+    pipeline.Start()
+    return pipeline
+
+
+def stream_compute(
+    network,
+    inputs: Iterable[Dict[str, Any]],
+    outputs: List[str],
+    max_in_flight: int = 8,
+    max_stages: int = 4,
+) -> Iterator[Dict[str, Any] | None]:
+    iterator = iter(inputs)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return
+
+    # the plan is evaluated for the inputs of the first record
+    if (pipeline := _Pipeline(network, first, outputs, max_in_flight, max_stages)) is None:
+        return
+
+    feed_errors: List[BaseException] = []
+
+    def feed():
+        try:
+            pipeline.Submit(first)
+            for input_dict in iterator:
+                if pipeline.closed:
+                    return
+                pipeline.Submit(input_dict)
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            pipeline.Finish()
+
+    feeder = threading.Thread(target=feed, name="stage:feed", daemon=True)
+    feeder.start()
+    try:
+        while (result := pipeline.Get()) is not _END:
+            yield result
+        if feed_errors:
+            raise feed_errors[0]
+    finally:
+        pipeline.Close()
+
+
+async def astream_compute(
+    network,
+    inputs: AsyncIterable[Dict[str, Any]],
+    outputs: List[str],
+    max_in_flight: int = 8,
+    max_stages: int = 4,
+) -> AsyncIterator[Dict[str, Any] | None]:
+    iterator = inputs.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        return
+
+    if (pipeline := _Pipeline(network, first, outputs, max_in_flight, max_stages)) is None:
+        return
+
+    feed_errors: List[BaseException] = []
+
+    async def feed():
+        try:
+            await asyncio.to_thread(pipeline.Submit, first)
+            async for input_dict in iterator:
+                if pipeline.closed:
+                    return
+                await asyncio.to_thread(pipeline.Submit, input_dict)
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            await asyncio.to_thread(pipeline.Finish)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while (result := await asyncio.to_thread(pipeline.Get)) is not _END:
+            yield result
+        await feeder
+        if feed_errors:
+            raise feed_errors[0]
+    finally:
+        pipeline.Close()
+        feeder.cancel()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# _____________________________________________________________________________
+# @File    :   sweep.py
+# @Time    :   2026/10/20 01:41:25
+# _____________________________________________________________________________
+
+"""Parameter sweeps of a compiled network over a grid of input variations.
+
+The grid is the product of the values of every axis, an axis being an input
+that varies. Operations of the plan reading a varying input, directly or
+through other operations, form the dependent cone; every other operation is
+invariant. The invariant part is computed once from the base inputs, up to the
+values the cone reads and the requested outputs it produces. Every variation
+then provides those values along with its own, so the requirement query of the
+network prunes the invariant part and only the cone is computed. All variations
+share one plan, and are computed by a thread pool when `max_workers` is given.
+The invariant part is computed with `method` and `max_workers`; variations run
+in the pool are computed sequentially, so parallel calls do not nest pools.
+"""
+
+
+from __future__ import annotations
+
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, Tuple
+
+from computegraph.framework.base import BaseOperation
+
+if TYPE_CHECKING:
+    from computegraph.framework.network import CGNetwork
+
+
+class CGSweepResult:
+    def __init__(self, axes: Dict[str, Sequence], shared: Dict[str, Any], results: Dict[Tuple, Any]):
+        self._axes = axes
+        self._shared = shared
+        self._results = results
+
+    @property
+    def axes(self) -> Dict[str, Sequence]:
+        return self._axes
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(values) for values in self._axes.values())
+
+    @property
+    def shared(self) -> Dict[str, Any]:
+        # values of the invariant part, computed once
+        return self._shared
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __getitem__(self, index: Tuple[int, ...] | int) -> Dict[str, Any] | None:
+        # by position along every axis, in the order the axes were given
+        return self._results[index if isinstance(index, tuple) else (index,)]
+
+    def Select(self, **values: Any) -> Dict[str, Any] | None:
+        # by the values of every axis
+        index = tuple(list(self._axes[axis]).index(values[axis]) for axis in self._axes)
+        return self._results[index]
+
+    def Items(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any] | None]]:
+        for index, result in self._results.items():
+            yield {axis: self._axes[axis][i] for axis, i in zip(self._axes, index)}, result
+
+
+def Cone(operation_steps: Tuple, varying: Sequence[str]) -> Tuple[List[BaseOperation], List[BaseOperation]]:
+    # fused steps are split, the invariant start of a chain is shared as well
+    tainted = set(varying)
+    dependent, invariant = [], []
+    for step in operation_steps:
+        if not isinstance(step, BaseOperation):
+            continue
+        for operation in getattr(step, "operations", [step]):
+            if tainted.intersection(operation.inputs):
+                tainted.update(operation.outputs)
+                dependent.append(operation)
+            else:
+                invariant.append(operation)
+    return dependent, invariant
+
+
+def sweep_compute(
+    network: CGNetwork,
+    base_inputs: Dict[str, Any],
+    axes: Dict[str, Sequence],
+    outputs: List[str],
+    method: CGNetwork.COMPUTE_METHOD,
+    max_workers: int | None = None,
+) -> CGSweepResult | None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    axes = {axis: list(values) for axis, values in axes.items()}
+    base_inputs = {k: v for k, v in base_inputs.items() if k not in axes}
+
+    provided_inputs = [*base_inputs, *axes]
+    required_inputs, operation_steps = network.EvaluateComputationRequirements(provided_inputs, outputs)
+    if not set(required_inputs).issubset(provided_inputs):
+        logging.error(f"Missing required inputs:`{tuple(set(required_inputs) - set(provided_inputs))}`")
+        return None
+
+    dependent, invariant = Cone(operation_steps, list(axes))
+    produced = {output for operation in invariant for output in operation.outputs}
+    read = {input_ for operation in dependent for input_ in operation.inputs}
+    if outputs:
+        shared_outputs = sorted(n for n in produced if n in read or n in outputs)
+    else:
+        shared_outputs = sorted(produced)
+
+    shared: Dict[str, Any] = {}
+    if shared_outputs:
+        shared = network(base_inputs, shared_outputs, method, max_workers)
+        if shared is None or any(n not in shared for n in shared_outputs):
+            logging.error("invariant part of the sweep could not be computed")
+            return None
+        shared = {n: shared[n] for n in shared_outputs}
+
+    grid = list(itertools.product(*(range(len(values)) for values in axes.values())))
+
+    def variation(index: Tuple[int, ...], method: CGNetwork.COMPUTE_METHOD, max_workers: int | None):
+        input_dict = {**base_inputs, **shared}
+        input_dict.update((axis, axes[axis][i]) for axis, i in zip(axes, index))
+        return network(input_dict, outputs, method, max_workers)
+
+    if max_workers is None or max_workers <= 1:
+        results = {index: variation(index, method, max_workers) for index in grid}
+    else:
+        # the pool is the parallelism, a parallel call inside it would start a pool of its own
+        if method == network.COMPUTE_METHOD.PARALLEL:
+            method = network.COMPUTE_METHOD.SEQUENTIAL
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(zip(grid, pool.map(lambda index: variation(index, method, None), grid)))
+
+    return CGSweepResult(axes, shared, results)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CALLS = []
+
+
+def scale(values, factor):
+    CALLS.append(numpy.shape(values))
+    time.sleep(0.005)
+    return values * factor
+
+
+def check(values):
+    if numpy.any(values < 0):
+        raise ValueError("negative values")
+    return values
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_scale", ["x", "factor"], ["x_scaled"], scale, chunkable=True),
+            CGOperation("op_add", ["x_scaled", "y"], ["result"], add, chunkable=True),
+            CGOperation("op_label", ["result"], ["label"], lambda r: f"{float(numpy.sum(r)):.1f}"),
+        ]
+    )
+    op_network.Compile(optimize=True)
+    return op_network
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_threads(self):
+        factor = numpy.float64(2.0)
+        with build_network().Batcher(["result", "label"], max_batch_size=16, max_wait=0.02) as batcher:
+            barrier = threading.Barrier(32)
+
+            def call(i):
+                barrier.wait()
+                x = float(i) if i % 2 else numpy.arange(3.0) + i
+                return batcher({"x": x, "y": 1.0 if i % 2 else numpy.ones(3), "factor": factor})
+
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                results = list(pool.map(call, range(32)))
+
+        for i, result in enumerate(results):
+            expected = i * 2.0 + 1 if i % 2 else (numpy.arange(3.0) + i) * 2 + 1
+            self.assertTrue(numpy.allclose(result["result"], expected))
+            self.assertEqual(result["label"], f"{float(numpy.sum(expected)):.1f}")
+
+        # stacked calls see the rows of many requests at once
+        self.assertLess(len(CALLS), 32)
+        self.assertGreater(max(shape[0] for shape in CALLS), 3)
+        self.assertEqual(sum(batcher.batch_sizes), 32)
+
+    def test_asyncio(self):
+        async def run(batcher):
+            return await asyncio.gather(
+                *(batcher.ACall({"x": float(i), "y": 0.5, "factor": 3}) for i in range(20))
+            )
+
+        with build_network().Batcher(["result"], max_wait=0.02) as batcher:
+            results = asyncio.run(run(batcher))
+
+        self.assertEqual([r["result"] for r in results], [i * 3 + 0.5 for i in range(20)])
+        self.assertLess(len(CALLS), 20)
+
+    def test_max_wait(self):
+        with build_network().Batcher(["result"], max_wait=0.01) as batcher:
+            t_start = time.time()
+            self.assertEqual(batcher({"x": 1.0, "y": 1.0, "factor": 2})["result"], 3.0)
+            self.assertLess(time.time() - t_start, 0.1)
+            self.assertIsNone(batcher({"x": 1.0, "factor": 2}))
+
+    def test_failed_request(self):
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_check", ["x"], ["x_checked"], check),
+                CGOperation("op_scale", ["x_checked", "factor"], ["x_scaled"], scale, chunkable=True),
+                CGOperation("op_double", ["x"], ["x_doubled"], lambda x: x * 2, chunkable=True),
+                CGOperation("op_add", ["x_scaled", "x_doubled"], ["total"], add, chunkable=True),
+            ]
+        )
+        op_network.Compile(optimize=True)
+
+        with op_network.Batcher(["total", "x_doubled"], max_wait=0.05) as batcher:
+            futures = [batcher.Submit({"x": numpy.float64(i - 1), "factor": 2}) for i in range(4)]
+            results = [future.result() for future in futures]
+
+        # only the request with a negative value misses the outputs of the failed branch
+        self.assertEqual(results[0], {"x_doubled": -2.0})
+        for i, result in enumerate(results[1:]):
+            self.assertEqual(result, {"x_doubled": i * 2.0, "total": i * 4.0})
+
+    def test_unstackable_shapes(self):
+        # the same rows count with different trailing shapes cannot be concatenated
+        factor, y = numpy.float64(2.0), 1.0
+        with build_network().Batcher(["result"], max_wait=0.05) as batcher:
+            futures = [
+                batcher.Submit({"x": x, "y": y, "factor": factor})
+                for x in (numpy.arange(3.0), numpy.ones((2, 2)))
+            ]
+            results = [future.result() for future in futures]
+
+        self.assertTrue(numpy.array_equal(results[0]["result"], numpy.arange(3.0) * 2 + 1))
+        self.assertTrue(numpy.array_equal(results[1]["result"], numpy.full((2, 2), 3.0)))
@@ -0,0 +1,151 @@
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from computegraph.framework.cache import CGResultCache
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CALLS = []
+
+
+def expensive_scale(values, factor=1):
+    CALLS.append(factor)
+    return [v * factor for v in values]
+
+
+def array_scale(values, factor=1):
+    CALLS.append(factor)
+    return numpy.asarray(values) * factor
+
+
+class Scale:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __call__(self, values, factor=1):
+        CALLS.append(self.factor)
+        return [v * factor * self.factor for v in values]
+
+
+def build_network(function) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperation(CGOperation("op_scale", ["values"], ["scaled"], function, {"factor": 3}))
+    op_network.Compile()
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_cache_across_restarts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = build_network(expensive_scale)({"values": [1, 2]}, result_cache=CGResultCache(directory))
+            self.assertEqual(result["scaled"], [3, 6])
+
+            # a fresh network and cache object, as after a restart
+            result = build_network(expensive_scale)({"values": [1, 2]}, result_cache=CGResultCache(directory))
+            self.assertEqual(result["scaled"], [3, 6])
+            self.assertEqual(CALLS, [3])
+
+            build_network(expensive_scale)({"values": [1, 3]}, result_cache=CGResultCache(directory))
+            self.assertEqual(CALLS, [3, 3])
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_memory_mapped_arrays(self):
+        with tempfile.TemporaryDirectory() as directory:
+            values = numpy.arange(10.0)
+            build_network(array_scale)({"values": values}, result_cache=CGResultCache(directory))
+            result = build_network(array_scale)({"values": values}, result_cache=CGResultCache(directory))
+
+            self.assertIsInstance(result["scaled"], numpy.memmap)
+            self.assertTrue(numpy.array_equal(result["scaled"], values * 3))
+            self.assertEqual(CALLS, [3])
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result_cache = CGResultCache(directory, max_bytes=1300 << 10)
+            operation = CGOperation("op_scale", ["values"], ["scaled"], expensive_scale)
+
+            keys = []
+            for i in range(3):
+                key = result_cache.Key(operation, {"values": [i]})
+                result_cache.Put(operation, key, {"scaled": bytes(400 << 10)})
+                os.utime(result_cache._EntryPath(key), (i, i))
+                keys.append(key)
+
+            # the first entry is read again, the second becomes the least recently used
+            self.assertIsNotNone(result_cache.Get(operation, keys[0]))
+            key = result_cache.Key(operation, {"values": [3]})
+            result_cache.Put(operation, key, {"scaled": bytes(400 << 10)})
+
+            self.assertIsNone(result_cache.Get(operation, keys[1]))
+            self.assertIsNotNone(result_cache.Get(operation, keys[0]))
+            self.assertIsNotNone(result_cache.Get(operation, key))
+
+    def test_function_identities(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for function in (functools.partial(expensive_scale), Scale(2), Scale(5)):
+                result = build_network(function)({"values": [1]}, result_cache=CGResultCache(directory))
+                self.assertEqual(result["scaled"], [3 * getattr(function, "factor", 1)])
+
+            # instances in the same state share their entries, other states do not
+            build_network(Scale(2))({"values": [1]}, result_cache=CGResultCache(directory))
+            self.assertEqual(CALLS, [3, 2, 5])
+
+    def test_nested_functions(self):
+        # lambdas of one scope and closures of one factory share their qualname
+        def make(factor):
+            def scale(values, factor=1):
+                return [v * factor * offset for v in values]
+
+            offset = factor
+            return scale
+
+        with tempfile.TemporaryDirectory() as directory:
+            result_cache = CGResultCache(directory)
+            functions = (
+                lambda values, factor=1: values,
+                lambda values, factor=1: values * 2,
+                make(1),
+                make(100),
+            )
+            results = [
+                build_network(f)({"values": [1]}, result_cache=result_cache)["scaled"] for f in functions
+            ]
+            self.assertEqual(results, [[1], [1, 1], [3], [300]])
+
+            operation = CGOperation("op", ["values"], ["scaled"], functools.partial(make(1)))
+            self.assertIsNone(result_cache.Key(operation, {"values": [1]}))
+
+    def test_key_across_hash_seeds(self):
+        # sets iterate in an order that depends on the hash seed of the process
+        script = """
+import tempfile
+from computegraph.framework.cache import CGResultCache
+from computegraph.framework.operation import CGOperation
+
+operation = CGOperation("op", ["a"], ["b"], sorted, {"key": None})
+with tempfile.TemporaryDirectory() as directory:
+    print(CGResultCache(directory).Key(operation, {"a": {"x", "y", "z", "w"}}))
+"""
+        keys = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+        self.assertEqual(len(keys), 1)
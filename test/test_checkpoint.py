@@ -0,0 +1,142 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from computegraph.framework.checkpoint import CGCheckpoint
+from computegraph.framework.network import CGExecutionContext, CGNetwork
+from computegraph.framework.operation import CGOperation
+
+
+class Counter:
+    # counts the calls of every step, the last one fails until `broken` is cleared
+    def __init__(self):
+        self.calls = {}
+        self.broken = True
+
+    def __call__(self, name: str, function):
+        def counted(*args):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name == "op_last" and self.broken:
+                raise ValueError("interrupted")
+            return function(*args)
+
+        return counted
+
+
+def build_network(counter: Counter) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_scale", ["x", "k"], ["scaled"], counter("op_scale", numpy.multiply)),
+            CGOperation("op_shift", ["scaled", "k"], ["shifted"], counter("op_shift", numpy.add)),
+            CGOperation("op_square", ["shifted"], ["squared"], counter("op_square", numpy.square)),
+            CGOperation("op_sum", ["squared"], ["total"], counter("op_sum", numpy.sum)),
+            CGOperation("op_last", ["total", "k"], ["result"], counter("op_last", numpy.multiply)),
+        ]
+    )
+    op_network.Compile()
+    return op_network
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.inputs = {"x": numpy.arange(4.0), "k": 2.0}
+
+    def test_resume_after_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            counter = Counter()
+            context = build_network(counter).Evaluate(
+                self.inputs, ["result"], checkpoint=CGCheckpoint(directory, every_operations=2)
+            )
+            self.assertEqual(context.status, CGExecutionContext.STATUS.FAILED)
+
+            # a new process rebuilds the network and continues after the last checkpoint
+            counter = Counter()
+            counter.broken = False
+            op_network = build_network(counter)
+            result = op_network.Resume(CGCheckpoint(directory, every_operations=2))
+
+            expected = 2.0 * numpy.sum(numpy.square(numpy.arange(4.0) * 2.0 + 2.0))
+            self.assertEqual(result, {"result": expected})
+            self.assertEqual(counter.calls, {"op_last": 1})
+            self.assertEqual(op_network(self.inputs, ["result"]), result)
+
+            # both checkpoints together wrote every value once
+            self.assertEqual(len([n for n in os.listdir(directory) if n.endswith((".npy", ".pkl"))]), 6)
+
+    def test_load_without_numpy(self):
+        script = """
+import sys
+sys.modules["numpy"] = None
+from computegraph.framework.checkpoint import CGCheckpoint
+print(CGCheckpoint(sys.argv[1]).Load())
+"""
+        with tempfile.TemporaryDirectory() as directory:
+            build_network(Counter()).Evaluate(
+                self.inputs, ["result"], checkpoint=CGCheckpoint(directory, every_operations=2)
+            )
+
+            # arrays cannot be read back in a process without numpy, the checkpoint is refused
+            completed = subprocess.run(
+                [sys.executable, "-c", script, directory], capture_output=True, text=True, check=True
+            )
+        self.assertEqual(completed.stdout.strip(), "None")
+        self.assertIn("numpy not installed", completed.stderr)
+
+    def test_policies(self):
+        with tempfile.TemporaryDirectory() as directory:
+            counter = Counter()
+            op_network = build_network(counter)
+            checkpoint = CGCheckpoint(directory, after=["op_shift"])
+            op_network.Evaluate(self.inputs, ["result"], checkpoint=checkpoint)
+
+            state = checkpoint.Load()
+            self.assertEqual(set(state.values), {"x", "k", "scaled", "shifted"})
+            self.assertEqual(state.position, 2)
+            self.assertIsInstance(state.values["shifted"], numpy.memmap)
+            self.assertEqual((state.provided_inputs, state.outputs), (["x", "k"], ["result"]))
+
+            # a checkpoint of another plan is not resumed
+            op_network.RemoveOperation(next(o for o in op_network.operations if o.name == "op_square"))
+            op_network.AddOperation(CGOperation("op_cube", ["shifted"], ["squared"], lambda v: v**3))
+            op_network.Compile()
+            self.assertIsNone(op_network.Resume(checkpoint))
+
+        with tempfile.TemporaryDirectory() as directory:
+            counter = Counter()
+            counter.broken = False
+            checkpoint = CGCheckpoint(directory, every_seconds=0.0)
+            build_network(counter)(self.inputs, ["result"], checkpoint=checkpoint)
+            self.assertEqual(checkpoint.Load().position, checkpoint.position)
+            self.assertIn("result", checkpoint.Load().values)
+
+            # files of values gone from a later checkpoint are removed, the others are not written again
+            files = [n for n in os.listdir(directory) if n.endswith((".npy", ".pkl"))]
+            checkpoint.Save({"result": checkpoint.Load().values["result"]})
+            remaining = [n for n in os.listdir(directory) if n.endswith((".npy", ".pkl"))]
+            self.assertEqual(len(remaining), 1)
+            self.assertIn(remaining[0], files)
+
+            checkpoint.Clear()
+            self.assertIsNone(checkpoint.Load())
+
+    def test_parallel_runs_sequentially(self):
+        with tempfile.TemporaryDirectory() as directory:
+            counter = Counter()
+            counter.broken = False
+            checkpoint = CGCheckpoint(directory, every_operations=1)
+            with self.assertLogs(level="WARNING") as logs:
+                result = build_network(counter)(
+                    self.inputs, ["result"], method=CGNetwork.COMPUTE_METHOD.PARALLEL, checkpoint=checkpoint
+                )
+            self.assertIn("method:`PARALLEL` ignored", "".join(logs.output))
+            self.assertEqual(result, {"result": 2.0 * numpy.sum(numpy.square(numpy.arange(4.0) * 2.0 + 2.0))})
+            self.assertEqual(checkpoint.Load().position, checkpoint.position)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNKS = []
+
+
+def scale(values, factor):
+    CHUNKS.append(len(values))
+    return values * factor
+
+
+def build_network(chunkable: bool = True) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_scale", ["x", "factor"], ["x_scaled"], scale, chunkable=True),
+            CGOperation("op_add", ["x_scaled", "y"], ["x_scaled_plus_y"], add, chunkable=chunkable),
+            CGOperation("op_mul", ["x_scaled_plus_y", "y"], ["result"], mul, chunkable=True),
+        ]
+    )
+    op_network.Compile(optimize=True)
+    return op_network
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        CHUNKS.clear()
+
+    def test_chunked_memmap(self):
+        x = numpy.arange(10_000, dtype=numpy.float64)
+        y = numpy.linspace(0, 1, 10_000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            x_path = os.path.join(directory, "x.npy")
+            out_path = os.path.join(directory, "result.npy")
+            numpy.save(x_path, x)
+
+            result = build_network().ChunkedCall(
+                {"x": x_path, "y": y, "factor": 2.0},
+                ["result"],
+                memory_budget=64 << 10,
+                out={"result": out_path},
+            )
+
+            expected = (x * 2.0 + y) * y
+            self.assertTrue(numpy.allclose(result["result"], expected))
+            self.assertTrue(numpy.allclose(numpy.load(out_path), expected))
+
+        # 5 arrays of 8 bytes per row within a 64 KiB budget
+        self.assertGreater(len(CHUNKS), 5)
+        self.assertLessEqual(max(CHUNKS), (64 << 10) // 40)
+        self.assertEqual(sum(CHUNKS), 10_000)
+
+    def test_not_chunkable(self):
+        x = numpy.arange(10.0)
+        result = build_network(chunkable=False).ChunkedCall(
+            {"x": x, "y": x, "factor": 1}, ["result"], 1 << 20
+        )
+        self.assertIsNone(result)
+
+    def test_failing_chunk(self):
+        def fragile(values, factor):
+            # fails on the rows of a later chunk only
+            if values[0] >= 500:
+                raise ValueError("bad rows")
+            return values * factor
+
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_scale", ["x", "factor"], ["x_scaled"], fragile, chunkable=True),
+                CGOperation("op_add", ["x_scaled", "x"], ["result"], add, chunkable=True),
+            ]
+        )
+        op_network.Compile()
+
+        with self.assertLogs(level="ERROR") as logs:
+            result = op_network.ChunkedCall({"x": numpy.arange(1000.0), "factor": 2}, ["result"], 4 << 10)
+        self.assertIsNone(result)
+        self.assertIn("did not produce the outputs:`['result']`", logs.output[-1])
@@ -0,0 +1,134 @@
+import gc
+import linecache
+import timeit
+import unittest
+
+from computegraph.framework.network import CGExecutionContext, CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul, sub, truediv
+
+GENERATED = CGNetwork.COMPUTE_METHOD.GENERATED
+
+
+def scale(x, factor=1.0, offset=None):
+    return x * factor + (offset or 0)
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub),
+            CGOperation("op_div", ["a_minus_b", "c"], ["a_minus_b_div_c"], truediv),
+            CGOperation("op_mul", ["x", "y"], ["x_mul_y"], mul),
+            CGOperation("op_mul_copy", ["x", "y"], ["x_mul_y_copy"], mul),
+            CGOperation("op_divmod", ["a", "c"], ["q", "r"], divmod),
+            CGOperation("op_add", ["a_minus_b_div_c", "x_mul_y_copy"], ["total"], add),
+            CGOperation(
+                "op_scale",
+                ["total", CGOperation.Modifiers.OptionalData("offset")],
+                ["scaled"],
+                scale,
+                {"factor": 2},
+            ),
+            CGOperation("op_sum", ["scaled", "q"], ["result"], add),
+        ]
+    )
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"a": 7, "b": 4, "c": 2, "x": 3, "y": -2, "offset": 1}
+
+    def test_same_results(self):
+        for optimize, constants in ((False, None), (True, None), (True, {"x": 3, "y": -2})):
+            op_network = build_network()
+            op_network.Compile(optimize=optimize, constants=constants)
+            inputs = {k: v for k, v in self.inputs.items() if k not in (constants or {})}
+
+            for outputs in (["result"], ["result", "r", "a_minus_b"], []):
+                expected = op_network(inputs, outputs)
+                self.assertIsNotNone(expected)
+                self.assertEqual(op_network(inputs, outputs, method=GENERATED), expected)
+                # without falling back to the interpreter
+                self.assertEqual(op_network.GeneratedPlan(list(inputs), outputs)(inputs), expected)
+
+    def test_source(self):
+        op_network = build_network()
+        op_network.Compile(optimize=True)
+
+        plan = op_network.GeneratedPlan(list(self.inputs), ["result"])
+        self.assertIs(op_network.GeneratedPlan(list(self.inputs), ["result"]), plan)
+        self.assertIn("def plan(input_dict):", plan.source)
+        self.assertIn("del ", plan.source)
+        self.assertEqual(plan(self.inputs), {"result": -5.0})
+
+        # a changed network generates its plans again
+        op_network.AddOperation(CGOperation("op_neg", ["result"], ["negative"], sub, {}))
+        self.assertIsNot(op_network.GeneratedPlan(list(self.inputs), ["result"]), plan)
+
+    def test_lines_released(self):
+        op_network = build_network()
+        op_network.Compile(optimize=True)
+
+        plan = op_network.GeneratedPlan(list(self.inputs), ["result"])
+        filename = plan.filename
+        self.assertEqual("".join(linecache.getlines(filename)), plan.source)
+
+        # a replaced plan takes its lines along once nothing holds it
+        op_network.Compile(optimize=True)
+        self.assertIn(filename, linecache.cache)
+        del plan
+        gc.collect()
+        self.assertNotIn(filename, linecache.cache)
+
+    def test_failure_not_rerun(self):
+        calls = []
+
+        def divide(a, c):
+            calls.append((a, c))
+            return a / c
+
+        op_network = build_network()
+        op_network.AddOperation(CGOperation("op_ratio", ["a", "c"], ["ratio"], divide))
+        op_network.Compile(optimize=True)
+
+        context = op_network.Evaluate({**self.inputs, "c": 0}, ["ratio", "x_mul_y"], method=GENERATED)
+        self.assertEqual(context.status, CGExecutionContext.STATUS.FAILED)
+        self.assertEqual(list(context.failed), ["op_ratio"])
+        self.assertIsNone(context.values)
+        self.assertEqual(context.not_computed, ["ratio", "x_mul_y"])
+        self.assertEqual(calls, [(7, 0)])
+
+    def test_latency(self):
+        functions = [add, mul, sub]
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation(f"op_{i}", ["x" if i == 0 else f"d{i - 1}", "y" if i % 2 else "x"], [f"d{i}"], f)
+                for i, f in ((i, functions[i % 3]) for i in range(50))
+            ]
+        )
+        op_network.Compile(optimize=True)
+
+        def by_hand(input_dict):
+            x, y = input_dict["x"], input_dict["y"]
+            d = x
+            for i in range(50):
+                d = functions[i % 3](d, y if i % 2 else x)
+            return {"d49": d}
+
+        inputs = {"x": 1.0, "y": 0.5}
+        plan = op_network.GeneratedPlan(list(inputs), ["d49"])
+        self.assertEqual(plan(inputs), by_hand(inputs))
+
+        n = 2000
+        generated = min(timeit.repeat(lambda: plan(inputs), number=n, repeat=5))
+        hand_written = min(timeit.repeat(lambda: by_hand(inputs), number=n, repeat=5))
+        self.assertLess(generated, 1.5 * hand_written)
+
+        # a call through the network adds the requirement and plan lookups and the execution context
+        method = CGNetwork.COMPUTE_METHOD.GENERATED
+        self.assertEqual(op_network(inputs, ["d49"], method=method), by_hand(inputs))
+        called = min(timeit.repeat(lambda: op_network(inputs, ["d49"], method=method), number=n, repeat=5))
+        self.assertLess(called, 3 * hand_written)
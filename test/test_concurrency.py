@@ -0,0 +1,67 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from computegraph.framework.network import CGExecutionContext, CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul, sub
+
+
+def slow_add(a, b):
+    time.sleep(0.02)
+    return a + b
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_add", ["a", "b"], ["a_plus_b"], add),
+            CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub),
+            CGOperation("op_mul", ["a_plus_b", "a_minus_b"], ["product"], mul),
+            CGOperation("op_slow", ["product", "b"], ["slow"], slow_add),
+        ]
+    )
+    op_network.Compile(optimize=True)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    def test_concurrent_calls(self):
+        op_network = build_network()
+        requests = [
+            (a, b, outputs) for a in range(20) for b in range(5) for outputs in (["product"], ["a_plus_b"])
+        ]
+
+        def call(request):
+            a, b, outputs = request
+            context = CGExecutionContext()
+            result = op_network({"a": a, "b": b}, outputs, context=context)
+            return result, set(context.timings)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(call, requests))
+
+        for (a, b, outputs), (result, timings) in zip(requests, results):
+            if outputs == ["product"]:
+                self.assertEqual(result, {"product": (a + b) * (a - b)})
+                self.assertTrue({"op_add", "op_sub", "op_mul"} <= timings)
+            else:
+                self.assertEqual(result, {"a_plus_b": a + b})
+                self.assertNotIn("op_mul", timings)
+        self.assertEqual(
+            set(op_network.cached_requirements), {(("a", "b"), ("product",)), (("a", "b"), ("a_plus_b",))}
+        )
+
+    def test_throughput_scales(self):
+        op_network = build_network()
+        op_network({"a": 1, "b": 1}, ["slow"])
+
+        t_start = time.time()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda a: op_network({"a": a, "b": 1}, ["slow"]), range(32)))
+        elapsed = time.time() - t_start
+
+        self.assertEqual(results, [{"slow": (a + 1) * (a - 1) + 1} for a in range(32)])
+        # one call at a time would sleep 32 * 20ms
+        self.assertLess(elapsed, 0.32)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGAliasOperation, CGConstantOperation, CGOperation
+from operator import add, mul, sub
+
+CALLS = []
+
+
+def counted_mul(a, b):
+    CALLS.append((a, b))
+    return a * b
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_mul", ["a", "b"], ["a_mul_b"], counted_mul),
+            CGOperation("op_mul_copy", ["a", "b"], ["a_mul_b_copy"], counted_mul),
+            CGOperation("op_sub", ["a_mul_b", "c"], ["left"], sub),
+            CGOperation("op_sub_copy", ["a_mul_b_copy", "c"], ["right"], sub),
+            CGOperation("op_add", ["left", "right"], ["result"], add),
+            CGOperation("op_round", ["a_mul_b"], ["rounded"], round, {"ndigits": 1}),
+            CGOperation("op_round_1", ["a_mul_b"], ["rounded_1"], round, {"ndigits": 2}),
+        ]
+    )
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_common_subexpressions(self):
+        op_network = build_network()
+        op_network.Compile(optimize=True)
+
+        aliases = {
+            step.name: step.canonical.name
+            for step in op_network.ordered_steps
+            if isinstance(step, CGAliasOperation)
+        }
+        self.assertEqual(aliases, {"op_mul_copy": "op_mul", "op_sub_copy": "op_sub"})
+
+        result = op_network({"a": 1.5, "b": 3, "c": 1}, ["result", "right", "rounded_1"])
+        self.assertEqual(result, {"right": 3.5, "result": 7.0, "rounded_1": 4.5})
+        self.assertEqual(len(CALLS), 1)
+
+        # an alias pulls in its canonical operation even when only the alias is requested
+        self.assertEqual(op_network({"a": 1.5, "b": 3, "c": 1}, ["right"]), {"right": 3.5})
+
+    def test_constant_folding(self):
+        op_network = build_network()
+        op_network.Compile(optimize=True, constants={"a": 2, "b": 4})
+        self.assertEqual(len(CALLS), 1)
+
+        constants = op_network.ordered_steps[0]
+        self.assertIsInstance(constants, CGConstantOperation)
+        self.assertEqual(constants.values["a_mul_b"], 8)
+
+        required_inputs, _ = op_network.EvaluateComputationRequirements(["c"], ["result"])
+        self.assertEqual(required_inputs, ("c",))
+        for c in range(3):
+            self.assertEqual(op_network({"c": c}, ["result"]), {"result": 2 * (8 - c)})
+        self.assertEqual(len(CALLS), 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.cgnw")
+            self.assertTrue(op_network.Save(path))
+            loaded = CGNetwork.Load(path)
+        self.assertEqual(loaded.constants, {"a": 2, "b": 4})
+        self.assertEqual(loaded({"c": 1}, ["result", "rounded"]), {"result": 14, "rounded": 8})
+        self.assertEqual(len(CALLS), 1)
+
+        # values passed for baked names are rejected instead of being replaced
+        for input_dict in ({"a": 10, "c": 1}, {"a_mul_b": 0, "c": 1}):
+            with self.assertLogs(level="ERROR") as logs:
+                context = op_network.Evaluate(input_dict, ["result"])
+            self.assertIsNone(context.values)
+            self.assertIn("are compile time constants", logs.output[0])
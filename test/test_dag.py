@@ -0,0 +1,190 @@
+import unittest
+
+import random
+
+from computegraph.framework.dag import CGDag
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul, sub
+
+
+class CountingNetwork(CGNetwork):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.n_builds = 0
+
+    def _BuildPlan(self) -> bool:
+        self.n_builds += 1
+        return super()._BuildPlan()
+
+
+def total(*values):
+    return sum(values)
+
+
+class TestClass(unittest.TestCase):
+    def test_topological_queries(self):
+        dag = CGDag()
+        dag.AddEdge("a", "op_1")
+        dag.AddEdge("b", "op_1")
+        dag.AddEdge("op_1", "c")
+        dag.AddEdge("c", "op_2")
+        dag.AddEdge("op_2", "d")
+        dag.AddEdge("c", "op_2")
+
+        self.assertEqual(dag.n_edges, 5)
+        order = dag.TopologicalSort()
+        self.assertLess(order.index("op_1"), order.index("c"))
+        self.assertLess(order.index("c"), order.index("op_2"))
+        self.assertEqual(dag.Ancestors("op_2"), {"a", "b", "op_1", "c"})
+        self.assertEqual(dag.Descendants("b"), {"op_1", "c", "op_2", "d"})
+        self.assertEqual(dag.InDegree("a"), 0)
+
+        graph = dag.ToNetworkx()
+        self.assertEqual(
+            set(graph.edges), {("a", "op_1"), ("b", "op_1"), ("op_1", "c"), ("c", "op_2"), ("op_2", "d")}
+        )
+
+    def test_cycle(self):
+        dag = CGDag()
+        dag.AddEdge("a", "b")
+        dag.AddEdge("b", "c")
+        with self.assertRaises(ValueError):
+            dag.AddEdge("c", "a")
+        self.assertEqual(dag.n_edges, 2)
+        self.assertEqual(dag.TopologicalSort(), ["a", "b", "c"])
+
+    def test_incremental_order(self):
+        dag = CGDag()
+        dag.AddEdge("c", "d")
+        dag.AddEdge("b", "c")
+        dag.AddEdge("a", "b")
+        dag.AddEdge("x", "y")
+        dag.AddEdge("y", "a")
+        self.assertEqual(dag.TopologicalSort(), ["x", "y", "a", "b", "c", "d"])
+
+        dag.RemoveNode("b")
+        dag.AddEdge("d", "a")
+        order = dag.TopologicalSort()
+        self.assertEqual(set(order), {"x", "y", "a", "c", "d"})
+        self.assertLess(order.index("c"), order.index("d"))
+        self.assertLess(order.index("d"), order.index("a"))
+        self.assertLess(order.index("y"), order.index("a"))
+
+    def test_reused_ids(self):
+        dag = CGDag()
+        dag.AddEdge("a", "b")
+        for i in range(100):
+            dag.AddEdge("b", f"c{i}")
+            dag.AddEdge(f"c{i}", "d")
+            dag.RemoveNode(f"c{i}")
+
+        # removed nodes leave no trace, their ids are taken by the next nodes
+        self.assertEqual(dag.id_bound, 4)
+        self.assertEqual(dag.n_edges, 1)
+        dag.AddEdge("d", "e")
+        dag.AddEdge("b", "d")
+        self.assertEqual(dag.TopologicalSort(), ["a", "b", "d", "e"])
+        self.assertEqual(dag.Ancestors("e"), {"a", "b", "d"})
+        self.assertEqual(dag.Descendants("b"), {"d", "e"})
+
+    def test_requirements(self):
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_add", ["a", "b"], ["a_plus_b"], add),
+                CGOperation("op_mul", ["a_plus_b", "c"], ["a_plus_b_mul_c"], mul),
+                CGOperation("op_sq", ["d"], ["d_sq"], lambda d: d * d),
+            ]
+        )
+        op_network.Compile(optimize=True)
+
+        required_inputs, steps = op_network.EvaluateComputationRequirements([], ["a_plus_b_mul_c"])
+        self.assertEqual(required_inputs, ("a", "b", "c"))
+        self.assertEqual([step.name for step in steps if isinstance(step, CGOperation)], ["op_add+op_mul"])
+
+        required_inputs, steps = op_network.EvaluateComputationRequirements(["a_plus_b"], ["a_plus_b_mul_c"])
+        self.assertEqual(required_inputs, ("a_plus_b", "c"))
+        self.assertEqual([step.name for step in steps if isinstance(step, CGOperation)], ["op_mul"])
+
+        self.assertEqual(op_network({"a_plus_b": 2, "c": 3}, ["a_plus_b_mul_c"]), {"a_plus_b_mul_c": 6})
+
+    def test_network_edits(self):
+        op_network = CGNetwork("test network")
+        op_mul = CGOperation("op_mul", ["a_plus_b", "c"], ["a_plus_b_mul_c"], mul)
+        op_network.AddOperation(op_mul)
+        op_network.Compile(optimize=True)
+
+        # producer added after its consumer, the compiled plan follows without a recompile
+        op_add = CGOperation("op_add", ["a", "b"], ["a_plus_b"], add)
+        op_network.AddOperation(op_add)
+        self.assertTrue(op_network.flag_compiled)
+        self.assertEqual(op_network.ordered_steps[0].operations, [op_add, op_mul])
+        self.assertEqual(op_network({"a": 1, "b": 2, "c": 3}, ["a_plus_b_mul_c"]), {"a_plus_b_mul_c": 9})
+
+        op_cycle = CGOperation("op_cycle", ["a_plus_b_mul_c"], ["a"], abs)
+        op_network.AddOperation(op_cycle)
+        self.assertFalse(op_network.graph.HasNode(op_cycle))
+
+        op_network.RemoveOperation(op_add)
+        self.assertFalse(op_network.graph.HasNode("a"))
+        self.assertEqual(op_network.ordered_steps, [op_mul, "a_plus_b", "c"])
+        self.assertEqual(op_network({"a_plus_b": 2, "c": 3}), {"a_plus_b_mul_c": 6})
+
+    def test_patched_plan(self):
+        op_network = CountingNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_add", ["a", "b"], ["s"], add),
+                CGOperation("op_mul", ["s", "c"], ["m"], mul),
+                CGOperation("op_sub", ["s", "m"], ["d"], sub),
+            ]
+        )
+        op_network.Compile(optimize=True)
+        steps = op_network.ordered_steps
+
+        # neither fused nor deduplicated, the operation is placed in the plan as it is
+        op_extra = CGOperation("op_extra", ["a", "s"], ["e"], add)
+        op_network.AddOperation(op_extra)
+        patched = op_network.ordered_steps
+        self.assertEqual(op_network.n_builds, 1)
+        self.assertIn(op_extra, patched)
+        self.assertLess(patched.index(op_extra), patched.index("a"))
+        self.assertEqual(op_network({"a": 1, "b": 2, "c": 3}, ["d", "e"]), {"d": -6, "e": 4})
+
+        op_network.RemoveOperation(op_extra)
+        self.assertEqual(op_network.n_builds, 1)
+        self.assertEqual(op_network.ordered_steps, steps)
+
+        # a producer fusable with its consumer is planned again
+        op_network.AddOperation(CGOperation("op_scale", ["x"], ["c"], abs))
+        op_network.ordered_steps
+        self.assertEqual(op_network.n_builds, 2)
+
+    def test_patched_plan_matches_compile(self):
+        rng = random.Random(5)
+        for optimize in (False, True):
+            op_network = CountingNetwork("test network")
+            operations, data = [], ["s0", "s1", "s2"]
+            for i in range(60):
+                if i >= 30 and rng.random() < 0.4:
+                    op_network.RemoveOperation(operations.pop(rng.randrange(len(operations))))
+                else:
+                    inputs = rng.sample(data, min(len(data), rng.randint(1, 3)))
+                    operations.append(CGOperation(f"op_{i}", inputs, [f"d{i}"], total))
+                    op_network.AddOperation(operations[-1])
+                    data.append(f"d{i}")
+                if i == 29:
+                    op_network.Compile(optimize=optimize)
+                if i < 30:
+                    continue
+
+                reference = CGNetwork("reference")
+                reference.AddOperations(list(operations))
+                reference.Compile(optimize=optimize)
+                produced = {o for operation in operations for o in operation.outputs}
+                inputs = {n: k for k, n in enumerate(data) if n not in produced}
+                outputs = [operation.outputs[0] for operation in operations[-5:]]
+                self.assertEqual(op_network(inputs, outputs), reference(inputs, outputs))
+
+            self.assertLess(op_network.n_builds, 30)
@@ -0,0 +1,62 @@
+import time
+import unittest
+
+from computegraph.framework.network import CGExecutionContext, CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add
+
+
+def slow_add(a, b, delay):
+    time.sleep(delay)
+    return a + b
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_add", ["a", "b"], ["a_plus_b"], add),
+            CGOperation("op_slow_1", ["a", "b"], ["s1"], slow_add, {"delay": 0.05}),
+            CGOperation("op_slow_2", ["s1", "b"], ["s2"], slow_add, {"delay": 0.05}),
+            CGOperation("op_slow_3", ["s2", "b"], ["s3"], slow_add, {"delay": 0.05}),
+            CGOperation("op_very_slow", ["a", "b"], ["v"], slow_add, {"delay": 0.5}),
+        ]
+    )
+    op_network.Compile()
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"a": 1, "b": 2}
+
+    def test_sequential_deadline(self):
+        context = build_network().Evaluate(self.inputs, ["a_plus_b", "s1", "s2", "s3"], timeout=0.08)
+
+        self.assertEqual(context.status, CGExecutionContext.STATUS.TIMEOUT)
+        self.assertEqual(context.values, {"a_plus_b": 3, "s1": 3, "s2": 5})
+        self.assertEqual(context.cancelled, ["op_slow_3"])
+        self.assertEqual(context.not_computed, ["s3"])
+
+    def test_parallel_deadline(self):
+        t_start = time.time()
+        context = build_network().Evaluate(
+            self.inputs,
+            ["a_plus_b", "s3", "v"],
+            method=CGNetwork.COMPUTE_METHOD.PARALLEL,
+            max_workers=4,
+            timeout=0.08,
+        )
+        elapsed = time.time() - t_start
+
+        # the running slow operation is abandoned, not waited for
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(context.status, CGExecutionContext.STATUS.TIMEOUT)
+        self.assertEqual(context.values, {"a_plus_b": 3})
+        self.assertEqual(set(context.cancelled), {"op_slow_2", "op_slow_3", "op_very_slow"})
+        self.assertEqual(context.not_computed, ["s3", "v"])
+
+    def test_within_budget(self):
+        context = build_network().Evaluate(self.inputs, ["s3"], timeout=1.0)
+        self.assertEqual(context.status, CGExecutionContext.STATUS.COMPLETE)
+        self.assertEqual(context.values, {"s3": 7})
+        self.assertEqual(context.cancelled, [])
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation, CGOutputFunctions, CGPartialOperation
+from operator import add
+
+CALLS = []
+
+
+def mean(values):
+    CALLS.append("mean")
+    return sum(values) / len(values)
+
+
+def spread(values):
+    CALLS.append("spread")
+    return max(values) - min(values)
+
+
+def stats(values, outputs):
+    CALLS.append(tuple(outputs))
+    return {"total": sum(values), "count": len(values), "maximum": max(values)}
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation(
+                "op_moments",
+                ["values"],
+                ["mean", "spread"],
+                CGOutputFunctions({"mean": mean, "spread": spread}),
+            ),
+            CGOperation("op_stats", ["values"], ["total", "count", "maximum"], stats, demand=True),
+            CGOperation("op_add", ["total", "mean"], ["result"], add),
+        ]
+    )
+    op_network.Compile(optimize=True)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"values": [1, 2, 6]}
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_requested_outputs_only(self):
+        op_network = build_network()
+
+        self.assertEqual(op_network(self.inputs, ["result"]), {"result": 12.0})
+        self.assertEqual(sorted(CALLS, key=str), [("total",), "mean"])
+
+        _, steps = op_network.EvaluateComputationRequirements(["values"], ["result", "count"])
+        narrowed = {step.name: step.outputs for step in steps if isinstance(step, CGPartialOperation)}
+        self.assertEqual(narrowed, {"op_moments": ["mean"], "op_stats": ["total", "count"]})
+
+        CALLS.clear()
+        result = op_network(self.inputs)
+        self.assertEqual((result["spread"], result["maximum"], result["result"]), (5, 6, 12.0))
+        self.assertEqual(len(CALLS), 3)
+
+    def test_save_load(self):
+        op_network = build_network()
+        op_network.EvaluateComputationRequirements(["values"], ["spread"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.cgnw")
+            self.assertTrue(op_network.Save(path))
+            loaded = CGNetwork.Load(path)
+
+        _, steps = loaded.EvaluateComputationRequirements(["values"], ["spread"])
+        self.assertEqual(
+            [(step.name, step.outputs) for step in steps if isinstance(step, CGOperation)],
+            [("op_moments", ["spread"])],
+        )
+        self.assertEqual(loaded(self.inputs, ["spread", "maximum"]), {"spread": 5, "maximum": 6})
+        self.assertEqual(CALLS, ["spread", ("maximum",)])
@@ -0,0 +1,74 @@
+import unittest
+
+from computegraph.framework.network import CGExecutionContext, CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul, neg, truediv
+
+
+def build_network(optimize: bool = False) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_div", ["a", "b"], ["a_div_b"], truediv),
+            CGOperation("op_neg", ["a_div_b"], ["neg_a_div_b"], neg),
+            CGOperation("op_add", ["neg_a_div_b", "c"], ["result"], add),
+            CGOperation("op_mul", ["a", "c"], ["a_mul_c"], mul),
+            CGOperation("op_mul_2", ["a_mul_c", "c"], ["a_mul_c2"], mul),
+        ]
+    )
+    op_network.Compile(optimize=optimize)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"a": 3, "b": 0, "c": 2}
+    outputs = ["result", "a_mul_c2"]
+
+    def test_failure_skips_descendants(self):
+        for method in CGNetwork.COMPUTE_METHOD.SEQUENTIAL, CGNetwork.COMPUTE_METHOD.PARALLEL:
+            context = build_network().Evaluate(self.inputs, self.outputs, method=method, max_workers=2)
+
+            self.assertEqual(context.status, CGExecutionContext.STATUS.FAILED)
+            self.assertEqual(context.values, {"a_mul_c2": 12})
+            self.assertEqual(list(context.failed), ["op_div"])
+            self.assertIsInstance(context.failed["op_div"], ZeroDivisionError)
+            self.assertEqual(context.skipped, ["op_neg", "op_add"])
+            self.assertEqual(context.not_computed, ["result"])
+
+    def test_failure_inside_fused_chain(self):
+        op_network = build_network(optimize=True)
+        context = op_network.Evaluate(self.inputs, self.outputs)
+
+        self.assertEqual(list(context.failed), ["op_div"])
+        self.assertEqual(context.skipped, ["op_neg", "op_add"])
+        self.assertEqual(context.values, {"a_mul_c2": 12})
+
+        # the plain call keeps returning what could be computed
+        self.assertEqual(op_network(self.inputs, self.outputs), {"a_mul_c2": 12})
+        self.assertEqual(
+            op_network.Evaluate({**self.inputs, "b": 1}, self.outputs).status,
+            CGExecutionContext.STATUS.COMPLETE,
+        )
+
+    def test_abort_on_error(self):
+        context = build_network().Evaluate(self.inputs, self.outputs, abort_on_error=True)
+        self.assertEqual(context.status, CGExecutionContext.STATUS.ABORTED)
+        self.assertEqual(list(context.failed), ["op_div"])
+        self.assertEqual(context.values, {})
+        self.assertEqual(context.not_computed, self.outputs)
+
+        context = build_network().Evaluate(
+            self.inputs,
+            self.outputs,
+            method=CGNetwork.COMPUTE_METHOD.PARALLEL,
+            max_workers=1,
+            abort_on_error=True,
+        )
+        self.assertEqual(context.status, CGExecutionContext.STATUS.ABORTED)
+        self.assertIn("result", context.not_computed)
+
+    def test_invalid_call(self):
+        context = build_network().Evaluate({"a": 1}, self.outputs)
+        self.assertEqual(context.status, CGExecutionContext.STATUS.INVALID)
+        self.assertIsNone(context.values)
+        self.assertEqual(context.not_computed, self.outputs)
@@ -0,0 +1,55 @@
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGFusedOperation, CGOperation
+from operator import add, mul, neg, sub, truediv
+
+
+def build_network(optimize: bool) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub),
+            CGOperation("op_div", ["a_minus_b", "c"], ["a_minus_b_div_c"], truediv),
+            CGOperation("op_neg", ["a_minus_b_div_c"], ["result"], neg),
+            CGOperation("op_add", ["x", "y"], ["x_plus_y"], add),
+            CGOperation("op_mul", ["x_plus_y", "x"], ["x_plus_y_mul_x"], mul),
+            CGOperation("op_mul_y", ["x_plus_y", "y"], ["x_plus_y_mul_y"], mul),
+        ]
+    )
+    op_network.Compile(optimize=optimize)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"a": 0.3, "b": 4, "c": 11, "x": 7, "y": -2}
+
+    def test_fused_chain(self):
+        op_network = build_network(optimize=True)
+
+        fused = [step for step in op_network.ordered_steps if isinstance(step, CGFusedOperation)]
+        self.assertEqual([step.name for step in fused], ["op_sub+op_div+op_neg"])
+        self.assertEqual(fused[0].inputs, ["a", "b", "c"])
+        self.assertEqual(fused[0].intermediates, ["a_minus_b", "a_minus_b_div_c"])
+
+        result = op_network(self.inputs)
+        self.assertEqual(result["result"], build_network(optimize=False)(self.inputs)["result"])
+        self.assertNotIn("a_minus_b", result)
+        self.assertTrue({"op_sub", "op_div", "op_neg", "op_add"} <= set(op_network.perf_register))
+        self.assertNotIn(fused[0].name, op_network.perf_register)
+
+    def test_fused_intermediates_on_request(self):
+        op_network = build_network(optimize=True)
+
+        result = op_network(self.inputs, ["a_minus_b_div_c", "result"])
+        self.assertEqual(round(result["a_minus_b_div_c"], 3), -0.336)
+        self.assertEqual(result["result"], -result["a_minus_b_div_c"])
+
+        _, steps = op_network.EvaluateComputationRequirements(["a_minus_b"], ["result"])
+        self.assertEqual([step.name for step in steps if isinstance(step, CGOperation)], ["op_div", "op_neg"])
+        self.assertEqual(op_network({"a_minus_b": 1.1, "c": 11}, ["result"]), {"result": -0.1})
+
+    def test_fused_parallel(self):
+        op_network = build_network(optimize=True)
+        result = op_network(self.inputs, ["result"], method=CGNetwork.COMPUTE_METHOD.PARALLEL, max_workers=2)
+        self.assertEqual(round(result["result"], 3), 0.336)
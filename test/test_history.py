@@ -0,0 +1,133 @@
+import time
+import unittest
+
+from computegraph.framework.history import CGHistory, CGPersistentMap
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from computegraph.package.string_concat import concat_node, string_node
+from operator import add, mul, sub
+
+
+class Colliding:
+    # every key in the same hash slot
+    def __init__(self, n: int):
+        self.n = n
+
+    def __hash__(self) -> int:
+        return 7
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Colliding) and other.n == self.n
+
+
+class TestClass(unittest.TestCase):
+    def test_persistent_map(self):
+        empty = CGPersistentMap()
+        first = empty
+        for i in range(1000):
+            first = first.Set(i, i)
+        second = first.Set(500, -1).Remove(3).Set(Colliding(1), 1).Set(Colliding(2), 2)
+
+        self.assertEqual((len(empty), len(first), len(second)), (0, 1000, 1001))
+        self.assertEqual((first.Get(500), second.Get(500), second.Get(3, None)), (500, -1, None))
+        self.assertEqual((second.Get(Colliding(1)), second.Get(Colliding(2))), (1, 2))
+        self.assertEqual(second.Remove(Colliding(1)).Get(Colliding(2)), 2)
+        self.assertEqual(dict(first.Items()), {i: i for i in range(1000)})
+        self.assertIs(first.Set(10, first.Get(10)), first)
+
+        changed = {(key.n if isinstance(key, Colliding) else key) for key, _, _ in first.Diff(second)}
+        self.assertEqual(changed, {500, 3, 1, 2})
+
+    def test_node_undo_redo(self):
+        input_node_a = string_node("input_node_a", "developer")
+        input_node_b = string_node("input_node_b", "")
+        concate_node = concat_node("concat_node")
+        history = CGHistory([input_node_a, input_node_b, concate_node])
+        history.Commit()
+
+        socket_in_a = concate_node.GetSocketByName("concat_node_socket_in_a")
+        input_node_a.GetSocketByName("input_node_a_socket_out").Connect(socket_in_a)
+        input_node_b.GetSocketByName("input_node_b_socket_out").Connect(
+            concate_node.GetSocketByName("concat_node_socket_in_b")
+        )
+        history.Commit()
+
+        input_node_b.GetInterfaceByName("input_node_b_string_data").UpdateValue("working")
+        history.Commit()
+        out = concate_node.GetSocketByName("concat_node_socket_out_c")
+        self.assertEqual(out.GetValue(), "developer_working")
+
+        history.Undo()
+        self.assertEqual(out.GetValue(), "developer_")
+        self.assertEqual(input_node_b.GetInterfaceByName("input_node_b_string_data").GetValue(), "")
+
+        history.Undo()
+        self.assertEqual(out.GetValue(), "")
+        self.assertFalse(input_node_a.GetSocketByName("input_node_a_socket_out").connections)
+        self.assertFalse(history.can_undo)
+
+        history.Redo()
+        history.Redo()
+        self.assertEqual(out.GetValue(), "developer_working")
+        self.assertIn(socket_in_a, input_node_a.GetSocketByName("input_node_a_socket_out").connections)
+
+        # an edit after an undo drops the versions that could be redone
+        history.Undo()
+        input_node_a.GetInterfaceByName("input_node_a_string_data").UpdateValue("tester")
+        history.Commit()
+        self.assertFalse(history.can_redo)
+        self.assertEqual(out.GetValue(), "tester_")
+
+    def test_snapshot_cost(self):
+        nodes = [string_node(f"node_{i}", str(i)) for i in range(3000)]
+        history = CGHistory(nodes)
+
+        t_start = time.perf_counter()
+        first = history.Snapshot()
+        full = time.perf_counter() - t_start
+        self.assertEqual(len(first), 3000 * 3)
+
+        nodes[10].GetInterfaceByName("node_10_string_data").SetValue("changed")
+        self.assertEqual(history.n_dirty, 1)
+        t_start = time.perf_counter()
+        second = history.Snapshot()
+        incremental = time.perf_counter() - t_start
+
+        self.assertEqual(first.Changed(second), [nodes[10].GetInterfaceByName("node_10_string_data")])
+        self.assertLess(incremental * 50, full)
+
+        history.Restore(first)
+        self.assertEqual(nodes[10].GetValues(), {"node_10_string_data": "10"})
+
+    def test_network_plans(self):
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub),
+                CGOperation("op_mul", ["a_minus_b", "c"], ["result"], mul),
+            ]
+        )
+        op_network.Compile(optimize=True)
+        history = CGHistory([op_network])
+        history.Commit()
+        steps = op_network.ordered_steps
+
+        op_add = CGOperation("op_add", ["result", "c"], ["total"], add)
+        op_network.AddOperation(op_add)
+        op_network.Compile()
+        history.Commit()
+        self.assertEqual(op_network({"a": 5, "b": 2, "c": 3}, ["total"]), {"total": 12})
+
+        # the compiled plan comes back as it was, no compile in between
+        history.Undo()
+        self.assertIs(op_network.ordered_steps, steps)
+        self.assertNotIn(op_add, op_network.operations)
+        self.assertEqual(op_network({"a": 5, "b": 2, "c": 3}, ["result"]), {"result": 9})
+
+        history.Redo()
+        self.assertIn(op_add, op_network.operations)
+        self.assertEqual(op_network({"a": 5, "b": 2, "c": 3}, ["total"]), {"total": 12})
+
+        # the restored graph compiles like the original one
+        op_network.Compile(optimize=True)
+        self.assertEqual(op_network({"a": 5, "b": 2, "c": 3}, ["total"]), {"total": 12})
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+def import_profile(module: str) -> dict:
+    # fresh interpreter, otherwise modules imported by the test runner are not measured
+    # bytecode is written, compiling the sources is not what is measured
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; import sys; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return {"modules": set(completed.stdout.split()), "profile": profile}
+
+
+class TestClass(unittest.TestCase):
+    def test_node_import_skips_networkx(self):
+        result = import_profile("computegraph.framework.node")
+        self.assertNotIn("networkx", result["modules"])
+
+    def test_node_import_skips_heavy_modules(self):
+        # third party and slow standard library modules are imported where they are used
+        modules = import_profile("computegraph.framework.node")["modules"]
+        for heavy in ("numpy", "networkx", "inspect", "concurrent.futures", "asyncio"):
+            self.assertNotIn(heavy, modules)
+
+    def test_node_import_time(self):
+        # the whole cost of the import, the standard library modules it pulls in included
+        # the first run writes the bytecode, the fastest of the others is kept
+        cumulative_us = min(
+            profile["computegraph.framework.node"][1]
+            for profile in (import_profile("computegraph.framework.node")["profile"] for _ in range(4))
+        )
+        self.assertLess(cumulative_us, 40_000)
+
+    def test_network_import_skips_networkx(self):
+        result = import_profile("computegraph.framework.network")
+        self.assertNotIn("networkx", result["modules"])
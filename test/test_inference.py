@@ -0,0 +1,155 @@
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from computegraph.framework.base import SocketTypeEnum
+from computegraph.framework.inference import ChangeDetector, Compatible, InferTypes
+from computegraph.framework.network import CGNetwork, CGNetworkOperation
+from computegraph.framework.node import CGNode
+from computegraph.framework.operation import CGOperation
+from computegraph.package.data_items import Boolean, Integer, String
+from computegraph.package.string_concat import concat_node, string_node
+from operator import add, mul, ne
+
+
+class Array:
+    # data item without a type
+    def __init__(self, value):
+        self._value = value
+
+    def SetValue(self, value):
+        self._value = value
+
+    def GetValue(self):
+        return self._value
+
+
+def integer_node(node_name: str, value: int) -> CGNode:
+    node = CGNode(node_name)
+    data = node.AddData(f"{node_name}_data", Integer(value))
+    node.AddSocket(f"{node_name}_socket_out", SocketTypeEnum.OUTPUT).SetDataInterface(data)
+    return node
+
+
+def count(text: str) -> int:
+    return len(text)
+
+
+def halve(value: float) -> float:
+    return value / 2
+
+
+def shout(text: str) -> str:
+    return text.upper()
+
+
+class TestClass(unittest.TestCase):
+    def test_compatible(self):
+        self.assertTrue(Compatible(int, float))
+        self.assertTrue(Compatible(bool, int))
+        self.assertTrue(Compatible(None, str))
+        self.assertTrue(Compatible(bytearray, object))
+        self.assertFalse(Compatible(float, int))
+        self.assertFalse(Compatible(int, str))
+
+    def test_connect(self):
+        number = integer_node("number", 3)
+        concate_node = concat_node("concat_node")
+        socket_in_a = concate_node.GetSocketByName("concat_node_socket_in_a")
+
+        # an int is never read as a str
+        number.GetSocketByName("number_socket_out").Connect(socket_in_a)
+        self.assertFalse(number.GetSocketByName("number_socket_out").connections)
+        self.assertEqual(concate_node.GetValues()["concat_node_data_a"], "")
+
+        text = string_node("text", "developer")
+        text.GetSocketByName("text_socket_out").Connect(socket_in_a)
+        self.assertEqual(text.GetSocketByName("text_socket_out").connections, [socket_in_a])
+
+        flag = CGNode("flag")
+        flag_data = flag.AddData("flag_data", Boolean(True))
+        flag.AddSocket("flag_socket_out", SocketTypeEnum.OUTPUT).SetDataInterface(flag_data)
+        counter = integer_node("counter", 0)
+        counter.AddSocket("counter_socket_in", SocketTypeEnum.INPUT).SetDataInterface(
+            counter.GetInterfaceByName("counter_data")
+        )
+        flag.GetSocketByName("flag_socket_out").Connect(counter.GetSocketByName("counter_socket_in"))
+        self.assertEqual(counter.GetValues(), {"counter_data": True})
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_change_detection(self):
+        self.assertIs(ChangeDetector(str), ne)
+        self.assertIs(ChangeDetector(bool), ne)
+
+        node = CGNode("node")
+        calls = []
+        node.AddData("array_in", Array(numpy.arange(3)))
+        node.AddData("array_out", Array(None))
+        node.AddOperation("op_sum", ["array_in"], ["array_out"], lambda a: calls.append(a) or a.sum())
+
+        # equal arrays are not a change, `!=` on them would raise
+        node.UpdateValues({"array_in": numpy.arange(3)})
+        self.assertEqual(calls, [])
+        node.UpdateValues({"array_in": numpy.arange(4)})
+        self.assertEqual((len(calls), node.GetValues()["array_out"]), (1, 6))
+        node.UpdateValues({"array_in": numpy.arange(5)[:4]})
+        self.assertEqual(len(calls), 1)
+
+    def test_network(self):
+        op_network = CGNetwork("test network")
+        op_count = CGOperation("op_count", ["text"], ["length"], count, types={"length": int})
+        op_halve = CGOperation("op_halve", ["length"], ["half"], halve)
+        op_network.AddOperations([op_count, op_halve])
+
+        # declared types disagreeing reject the operation
+        op_upper = CGOperation("op_upper", ["length"], ["upper"], str.upper, types={"length": str})
+        op_network.AddOperation(op_upper)
+        self.assertNotIn(op_upper, op_network.operations)
+
+        # annotations are not enforced, disagreeing with one is only a warning
+        op_source = CGOperation("op_source", ["seed"], ["text"], abs, types={"text": int})
+        with self.assertLogs(level="WARNING") as logs:
+            op_network.AddOperation(op_source)
+        self.assertIn("by annotation only", logs.output[0])
+        self.assertIn(op_source, op_network.operations)
+        op_network.RemoveOperation(op_source)
+
+        op_network.AddOperation(CGOperation("op_scale", ["half", "k"], ["scaled"], mul, types={"k": float}))
+        for optimize in (False, True):
+            self.assertTrue(op_network.Compile(optimize=optimize))
+            self.assertEqual(op_network.types, {"text": str, "length": int, "half": float, "k": float})
+            self.assertEqual(op_network({"text": "abcd", "k": 3}, ["scaled"]), {"scaled": 6.0})
+
+        # constants are checked when the plan is built
+        self.assertEqual(op_network.Compile(constants={"k": "3"}), [])
+        self.assertFalse(op_network.flag_compiled)
+        self.assertTrue(op_network.Compile(constants={"k": 3}))
+        self.assertEqual(op_network.types["k"], int)
+
+        # types are carried by inlined operations, renamed
+        outer = CGNetwork("outer network")
+        outer.AddOperation(CGNetworkOperation("inner", op_network, {"text": "name"}, {"length": "count"}))
+        op_join = CGOperation("op_join", ["count", "name"], ["joined"], add, types={"count": str})
+        outer.AddOperation(op_join)
+        self.assertNotIn(op_join, outer.operations)
+        outer.Compile()
+        self.assertEqual(
+            (outer.types["name"], outer.types["count"], outer.types["inner/half"]), (str, int, float)
+        )
+
+    def test_infer(self):
+        operations = [
+            CGOperation("op_count", ["text"], ["length"], count),
+            CGOperation("op_more", ["length", "x"], ["more"], add, types={"x": int}),
+        ]
+        # an annotated str read where an int is annotated is only warned about
+        with self.assertLogs(level="WARNING"):
+            types, errors = InferTypes(
+                [*operations, CGOperation("op_shout", ["length"], ["loud"], shout)], {"x": 1.5}
+            )
+        self.assertEqual(types, {"text": str, "length": int, "x": float, "loud": str})
+        self.assertEqual(errors, ["data:`x` produced as `float` by `constant` is read as `int` by `op_more`"])
@@ -0,0 +1,41 @@
+import timeit
+import unittest
+
+from computegraph.framework.operation import CGOperation
+from operator import mul
+
+
+def scale(x, factor=1.0, offset=None):
+    return x * factor + (offset or 0)
+
+
+class TestClass(unittest.TestCase):
+    def test_invoker_shapes(self):
+        op_mul = CGOperation("op_mul", ["a", "b"], ["c"], mul)
+        self.assertEqual(op_mul.Compute({"a": 3, "b": 4}), {"c": 12})
+
+        op_scale = CGOperation(
+            "op_scale", ["x", CGOperation.Modifiers.OptionalData("offset")], ["y"], scale, {"factor": 2}
+        )
+        self.assertEqual(op_scale.Compute({"x": 3}), {"y": 6})
+        self.assertEqual(op_scale.Compute({"x": 3, "offset": 1}), {"y": 7})
+
+        op_divmod = CGOperation("op_divmod", ["a", "b"], ["q", "r"], divmod)
+        self.assertEqual(op_divmod.Compute({"a": 7, "b": 2}), {"q": 3, "r": 1})
+        self.assertEqual(op_divmod.Compute({"a": 7, "b": 2}, ["r"]), {"r": 1})
+
+        # a missing input is raised, an error of the function is logged
+        with self.assertRaises(KeyError):
+            op_mul.Compute({"a": 3})
+        self.assertEqual(CGOperation("op_get", ["d"], ["v"], lambda d: d["missing"]).Compute({"d": {}}), {})
+
+    def test_call_overhead(self):
+        op_mul = CGOperation("op_mul", ["a", "b"], ["c"], mul)
+        input_dict = {"a": 3, "b": 4}
+
+        n = 20000
+        bare = min(timeit.repeat(lambda: {"c": mul(input_dict["a"], input_dict["b"])}, number=n, repeat=5))
+        compute = min(timeit.repeat(lambda: op_mul.Compute(input_dict), number=n, repeat=5))
+
+        # a bound call costs two extra python frames over the bare call
+        self.assertLess(compute, 4 * bare)
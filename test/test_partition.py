@@ -0,0 +1,74 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from computegraph.framework.partition import CGPartitioner, MeasureDataSizes
+from operator import add, mul
+
+
+def build_network() -> CGNetwork:
+    # two chains exchanging large arrays internally and a small value at the end
+    op_network = CGNetwork("test network")
+    operations = []
+    for chain in ("a", "b"):
+        for i in range(8):
+            source = chain if i == 0 else f"{chain}{i - 1}"
+            operations.append(CGOperation(f"op_{chain}{i}", [source, "w"], [f"{chain}{i}"], mul, cost=1.0))
+        operations.append(
+            CGOperation(f"op_{chain}_sum", [f"{chain}7"], [f"{chain}_sum"], numpy.sum, cost=1.0)
+        )
+    operations.append(CGOperation("op_total", ["a_sum", "b_sum"], ["total"], add, cost=1.0))
+    op_network.AddOperations(operations)
+    op_network.Compile()
+    return op_network
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.inputs = {"a": numpy.ones(10000), "b": numpy.ones(10000), "w": 2.0}
+
+    def test_partition(self):
+        op_network = build_network()
+        values = op_network(self.inputs, [])
+        sizes = MeasureDataSizes(values)
+        self.assertEqual(sizes["a3"], 80000)
+
+        partitioner = CGPartitioner(2, data_size=lambda name: sizes.get(name, 0))
+        plan = partitioner.Partition(op_network.ordered_steps)
+
+        # every chain stays on one worker, only a sum crosses
+        workers = {op.name: worker for op, worker in plan.workers.items()}
+        self.assertEqual(len({workers[f"op_a{i}"] for i in range(8)}), 1)
+        self.assertEqual(len({workers[f"op_b{i}"] for i in range(8)}), 1)
+        self.assertNotEqual(workers["op_a0"], workers["op_b0"])
+        self.assertEqual(len(plan.transfers), 1)
+        self.assertEqual(plan.transfer_volume, sum(sizes[name] for name, _, _ in plan.transfers))
+        self.assertLess(plan.transfer_volume, 1000)
+
+        # loads within the imbalance, steps of a worker in plan order
+        self.assertTrue(all(load <= 19 / 2 * 1.1 for load in plan.loads))
+        order = [step for step in op_network.ordered_steps if step in plan.workers]
+        for worker in range(2):
+            steps = plan.Steps(worker)
+            self.assertEqual(steps, [step for step in order if plan.Worker(step) == worker])
+
+    def test_balance(self):
+        # without sizes every edge counts the same, the heavy operation sits alone
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                CGOperation("op_heavy", ["x"], ["h"], abs, cost=10.0),
+                *[CGOperation(f"op_{i}", ["x"], [f"l{i}"], abs, cost=1.0) for i in range(10)],
+            ]
+        )
+        op_network.Compile()
+
+        plan = CGPartitioner(2).Partition(op_network.ordered_steps)
+        self.assertEqual(sorted(plan.loads), [10.0, 10.0])
+        self.assertEqual(plan.transfer_volume, 0)
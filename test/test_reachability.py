@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from computegraph.framework.reachability import CGReachabilityIndex
+
+
+def total(*values):
+    return sum(values)
+
+
+def build_network(n_operations: int, seed: int) -> CGNetwork:
+    rng = random.Random(seed)
+    op_network = CGNetwork("test network")
+    data = ["s0", "s1", "s2"]
+    for i in range(n_operations):
+        inputs = rng.sample(data, min(len(data), rng.randint(1, 3)))
+        op_network.AddOperation(CGOperation(f"op_{i}", inputs, [f"d{i}"], total))
+        data.append(f"d{i}")
+    return op_network
+
+
+class WalkIndex(CGReachabilityIndex):
+    BITSET_LIMIT = 0
+
+
+class TestClass(unittest.TestCase):
+    def test_queries_match_graph(self):
+        op_network = build_network(200, seed=7)
+        op_network.Compile()
+        graph = op_network.graph
+        rng = random.Random(3)
+
+        for _ in range(50):
+            outputs = tuple(sorted(rng.sample([f"d{i}" for i in range(200)], 3)))
+            inputs = tuple(sorted(rng.sample([f"d{i}" for i in range(100)], 2)))
+            required_inputs, steps = op_network.EvaluateComputationRequirements(list(inputs), list(outputs))
+
+            necessary = set().union(*(graph.Ancestors(o) for o in outputs))
+            unnecessary = set().union(*(graph.Ancestors(i) for i in inputs))
+            expected = [s for s in op_network.ordered_steps if s in necessary - unnecessary]
+            self.assertEqual(list(steps), expected)
+
+            sources = {i for s in expected for i in s.inputs if graph.InDegree(i) == 0}
+            self.assertEqual(required_inputs, tuple(sorted(sources | set(inputs))))
+
+    def test_walk_matches_bitsets(self):
+        op_network = build_network(300, seed=5)
+        op_network.Compile(optimize=True)
+        steps = op_network.ordered_steps
+        bitsets = CGReachabilityIndex(steps)
+        walk = WalkIndex(steps)
+        rng = random.Random(9)
+
+        for _ in range(30):
+            outputs = tuple(rng.sample([f"d{i}" for i in range(300)], 3))
+            inputs = tuple(rng.sample([f"d{i}" for i in range(150)], 2))
+            self.assertEqual(walk.Query(inputs, outputs), bitsets.Query(inputs, outputs))
+        self.assertEqual(walk.Query(("s0",), ()), bitsets.Query(("s0",), ()))
+
+    def test_optimized_plan(self):
+        op_network = build_network(200, seed=11)
+        reference = build_network(200, seed=11)
+        op_network.Compile(optimize=True)
+        reference.Compile()
+
+        index = CGReachabilityIndex(op_network.ordered_steps)
+        self.assertEqual(len(index), 200)
+
+        inputs = {"s0": 1, "s1": 2, "s2": 3}
+        for outputs in (["d199"], ["d150", "d60"], []):
+            expected = reference(inputs, outputs)
+            result = op_network(inputs, outputs)
+            for output in outputs:
+                self.assertEqual(result[output], expected[output])
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+from computegraph.framework.base import CGResources
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGFusedOperation, CGOperation
+from computegraph.framework.scheduler import CGResourceBudget
+
+PARALLEL = CGNetwork.COMPUTE_METHOD.PARALLEL
+
+
+class Tracker:
+    # counts the operations running at once, per kind
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peaks = {}
+        self.alone = []
+
+    def __call__(self, kind: str, exclusive: bool = False):
+        def function(x):
+            with self.lock:
+                self.running[kind] = self.running.get(kind, 0) + 1
+                self.peaks[kind] = max(self.peaks.get(kind, 0), self.running[kind])
+                if exclusive:
+                    self.alone.append(sum(self.running.values()) == 1)
+            time.sleep(0.02)
+            with self.lock:
+                self.running[kind] -= 1
+            return x
+
+        return function
+
+
+class TestClass(unittest.TestCase):
+    def test_memory_budget(self):
+        tracker = Tracker()
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                *[
+                    CGOperation(
+                        f"op_big{i}", ["x"], [f"big{i}"], tracker("big"), resources=CGResources(memory=600)
+                    )
+                    for i in range(3)
+                ],
+                *[CGOperation(f"op_small{i}", ["x"], [f"small{i}"], tracker("small")) for i in range(4)],
+            ]
+        )
+        op_network.Compile()
+
+        budget = CGResourceBudget(cpu=8, memory=1000)
+        outputs = ["big0", "big1", "big2", "small0", "small1", "small2", "small3"]
+        result = op_network({"x": 1}, outputs, method=PARALLEL, max_workers=8, budget=budget)
+        self.assertEqual(result, dict.fromkeys(outputs, 1))
+
+        # only one large operation fits, the small ones fill the remaining slots
+        self.assertEqual(tracker.peaks["big"], 1)
+        self.assertGreater(tracker.peaks["small"], 1)
+        self.assertEqual(budget.used, CGResources(0, 0.0, False))
+
+    def test_cpu_and_exclusive(self):
+        tracker = Tracker()
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [
+                *[
+                    CGOperation(
+                        f"op_blas{i}", ["x"], [f"blas{i}"], tracker("blas"), resources=CGResources(cpu=2)
+                    )
+                    for i in range(4)
+                ],
+                CGOperation(
+                    "op_alone",
+                    ["x"],
+                    ["alone"],
+                    tracker("alone", exclusive=True),
+                    resources=CGResources(exclusive=True),
+                ),
+                # larger than the whole budget, runs alone rather than never
+                CGOperation("op_huge", ["x"], ["huge"], tracker("huge"), resources=CGResources(cpu=16)),
+            ]
+        )
+        op_network.Compile()
+
+        context = op_network.Evaluate(
+            {"x": 1}, [], method=PARALLEL, max_workers=8, budget=CGResourceBudget(cpu=4)
+        )
+        self.assertEqual(context.status, context.STATUS.COMPLETE)
+        self.assertEqual(tracker.peaks["blas"], 2)
+        self.assertEqual(tracker.alone, [True])
+        self.assertEqual(context.values["huge"], 1)
+
+    def test_fused_resources(self):
+        first = CGOperation("op_a", ["x"], ["a"], abs, resources=CGResources(cpu=2, memory=10))
+        second = CGOperation("op_b", ["a"], ["b"], abs, resources=CGResources(memory=50, exclusive=True))
+        self.assertEqual(CGFusedOperation([first, second]).resources, CGResources(2, 50, True))
+        self.assertIsNone(CGFusedOperation([CGOperation("op_c", ["x"], ["c"], abs)]).resources)
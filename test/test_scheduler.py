@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from computegraph.framework.scheduler import CGCostModel, CGListScheduler
+from operator import sub, truediv, pow, mul, add
+
+
+def skewed_network() -> CGNetwork:
+    network = CGNetwork("skewed network")
+
+    # cheap independent operations come first in the topological order
+    for i in range(10):
+        network.AddOperation(CGOperation(f"op_short_{i}", [f"s{i}"], [f"s{i}_out"], abs, cost=1.0))
+
+    network.AddOperation(CGOperation("op_chain_0", ["c"], ["c0"], abs, cost=10.0))
+    network.AddOperation(CGOperation("op_chain_1", ["c0"], ["c1"], abs, cost=10.0))
+    network.AddOperation(CGOperation("op_chain_2", ["c1"], ["c2"], abs, cost=10.0))
+    return network
+
+
+class TestClass(unittest.TestCase):
+    def test_upward_rank_beats_fifo(self):
+        network = skewed_network()
+        steps = network.Compile()
+        scheduler = CGListScheduler(n_workers=2)
+
+        fifo = CGListScheduler.Makespan(scheduler.Schedule(steps, prioritize=False))
+        ranked = CGListScheduler.Makespan(scheduler.Schedule(steps, prioritize=True))
+
+        self.assertEqual(ranked, 30.0)
+        self.assertLess(ranked, fifo)
+
+    def test_locality_keeps_chain_on_one_worker(self):
+        network = skewed_network()
+        steps = network.Compile()
+        scheduler = CGListScheduler(n_workers=2, transfer_cost=lambda name: 100.0)
+
+        workers = {
+            entry.worker for entry in scheduler.Schedule(steps) if entry.operation.name.startswith("op_chain")
+        }
+        self.assertEqual(len(workers), 1)
+
+    def test_cost_model_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "costs.json")
+            cost_model = CGCostModel(path)
+            cost_model.Update({"op_sub": 2.0})
+            cost_model.Update({"op_sub": 4.0})
+            cost_model.Save()
+
+            reloaded = CGCostModel(path)
+            self.assertEqual(reloaded.history["op_sub"], 3.0)
+            self.assertEqual(reloaded.GetCost(CGOperation("op_sub", ["a"], ["b"], abs)), 3.0)
+            self.assertEqual(reloaded.GetCost(CGOperation("op_sub", ["a"], ["b"], abs, cost=0.5)), 0.5)
+
+    def test_parallel_network_operation(self):
+        op_network = CGNetwork("test network")
+
+        op_sub = CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub)
+        op_div = CGOperation("op_div", ["a_minus_b", "c"], ["a_minus_b_div_c"], truediv)
+        op_pow = CGOperation("op_pow", ["a_minus_b_div_c", "p"], ["a_minus_b_div_c_pow_p"], pow)
+        op_mul = CGOperation("op_mul", ["x", "y"], ["p"], mul)
+        op_add = CGOperation("op_add", ["x", "y"], ["x_plus_y"], add)
+
+        op_network.AddOperations([op_sub, op_div, op_pow, op_mul, op_add])
+        op_network.Compile(optimize=True)
+
+        cost_model = CGCostModel()
+        result = op_network(
+            {"a": 0.3, "b": 4, "c": 11, "x": 7, "y": -2},
+            method=CGNetwork.COMPUTE_METHOD.PARALLEL,
+            max_workers=2,
+            cost_model=cost_model,
+        )
+
+        self.assertEqual(round(result["a_minus_b_div_c_pow_p"], 3), 4213795.503)
+        self.assertEqual(result["x_plus_y"], 5)
+        self.assertNotIn("a_minus_b", result)
+        self.assertEqual(set(cost_model.history), {"op_sub", "op_div", "op_pow", "op_mul", "op_add"})
+
+        # the sequential plan also times its delete instructions, they stay out of the history
+        op_network({"a": 0.3, "b": 4, "c": 11, "x": 7, "y": -2}, cost_model=cost_model)
+        self.assertIn("x", op_network.perf_register)
+        self.assertEqual(set(cost_model.history), {"op_sub", "op_div", "op_pow", "op_mul", "op_add"})
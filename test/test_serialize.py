@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from computegraph.framework.base import CGResources
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import sub, truediv, pow, mul
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+
+    op_sub = CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub, types={"a": float, "a_minus_b": float})
+    op_div = CGOperation("op_div", ["a_minus_b", "c"], ["a_minus_b_div_c"], truediv)
+    op_pow = CGOperation("op_pow", ["a_minus_b_div_c", "p"], ["a_minus_b_div_c_pow_p"], pow, cost=2.5)
+    op_mul = CGOperation("op_mul", ["x", "y"], ["p"], mul, resources=CGResources(cpu=2, memory=64.0))
+    op_round = CGOperation("op_round", ["a_minus_b_div_c"], ["rounded"], round, {"ndigits": 2})
+
+    op_network.AddOperations([op_sub, op_div, op_pow, op_mul, op_round])
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    def test_save_load(self):
+        op_network = build_network()
+        op_network.Compile(optimize=True)
+        op_network.EvaluateComputationRequirements(["a", "b", "c"], ["rounded"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.cgnw")
+            self.assertTrue(op_network.Save(path))
+            saved_requirements = set(op_network.cached_requirements)
+
+            for use_mmap in (True, False):
+                loaded = CGNetwork.Load(path, use_mmap=use_mmap)
+
+                self.assertTrue(loaded.flag_compiled)
+                self.assertEqual(loaded.name, op_network.name)
+                self.assertEqual(
+                    [repr(step) for step in loaded.ordered_steps],
+                    [repr(step) for step in op_network.ordered_steps],
+                )
+                self.assertEqual(set(loaded.cached_requirements), saved_requirements)
+                self.assertEqual(loaded.ordered_steps[0].uid, op_network.ordered_steps[0].uid)
+                costs = {
+                    operation.name: operation.cost
+                    for step in loaded.ordered_steps
+                    if isinstance(step, CGOperation)
+                    for operation in getattr(step, "operations", [step])
+                }
+                self.assertEqual((costs["op_pow"], costs["op_sub"]), (2.5, None))
+                resources = {
+                    operation.name: operation.resources
+                    for step in loaded.ordered_steps
+                    if isinstance(step, CGOperation)
+                    for operation in getattr(step, "operations", [step])
+                }
+                self.assertEqual(resources["op_mul"], CGResources(2, 64.0, False))
+                self.assertEqual(loaded.types, {"a": float, "a_minus_b": float})
+
+                inputs = {"a": 0.3, "b": 4, "c": 11, "x": 7, "y": -2}
+                self.assertEqual(loaded(inputs), op_network(inputs))
+                self.assertEqual(loaded(inputs, ["rounded"]), {"rounded": -0.34})
+
+    def test_unimportable_function(self):
+        op_network = CGNetwork("test network")
+        op_network.AddOperation(CGOperation("op_neg", ["a"], ["b"], lambda a: -a))
+        op_network.Compile()
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertFalse(op_network.Save(os.path.join(directory, "network.cgnw")))
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+
+
+def slow_increment(value):
+    time.sleep(0.02)
+    return value + 1
+
+
+def build_network() -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_1", ["a"], ["b"], slow_increment),
+            CGOperation("op_2", ["b"], ["c"], slow_increment),
+            CGOperation("op_3", ["c"], ["d"], slow_increment),
+        ]
+    )
+    op_network.Compile(optimize=True)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    def test_stream_order_and_throughput(self):
+        op_network = build_network()
+
+        t_start = time.time()
+        results = list(op_network.Stream(({"a": i} for i in range(20)), ["d"]))
+        elapsed = time.time() - t_start
+
+        self.assertEqual(results, [{"d": i + 3} for i in range(20)])
+        # sequential evaluation would take 20 records * 3 stages * 20ms
+        self.assertLess(elapsed, 0.8)
+
+    def test_backpressure(self):
+        op_network = build_network()
+        pulled = []
+
+        def records():
+            for i in range(100):
+                pulled.append(i)
+                yield {"a": i}
+
+        stream = op_network.Stream(records(), ["d"], max_in_flight=4)
+        self.assertEqual(next(stream), {"d": 3})
+        time.sleep(0.2)
+        self.assertLessEqual(len(pulled), 4 + 2)
+        stream.close()
+
+    def test_async_stream(self):
+        op_network = build_network()
+
+        async def records():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield {"a": i}
+
+        async def collect():
+            return [result async for result in op_network.AStream(records(), ["d"])]
+
+        self.assertEqual(asyncio.run(collect()), [{"d": i + 3} for i in range(5)])
+
+    def test_async_failing_inputs(self):
+        op_network = build_network()
+
+        async def records():
+            yield {"a": 0}
+            yield {"a": 1}
+            raise RuntimeError("source failed")
+
+        async def collect(results):
+            async for result in op_network.AStream(records(), ["d"]):
+                results.append(result)
+
+        # the records before the error come out, then the error reaches the consumer
+        results = []
+        with self.assertRaisesRegex(RuntimeError, "source failed"):
+            asyncio.run(asyncio.wait_for(collect(results), timeout=10))
+        self.assertEqual(results, [{"d": 3}, {"d": 4}])
+
+    def test_failed_records(self):
+        op_network = build_network()
+        records = [{"a": 0}, {"b": 1}, {"a": "text"}, {"a": 3}]
+
+        # a record missing inputs or failing in an operation comes out as None, the others go on
+        with self.assertLogs(level="ERROR") as logs:
+            results = list(op_network.Stream(iter(records), ["d"]))
+        self.assertEqual(results, [{"d": 3}, None, None, {"d": 6}])
+        self.assertIn("record:`1` missing required inputs", logs.output[0])
+        self.assertIn("record:`2` failed, operation:`op_1` failed", logs.output[1])
+
+    def test_bounded_stages(self):
+        op_network = CGNetwork("test network")
+        op_network.AddOperations(
+            [CGOperation(f"op_{i}", [f"v_{i}"], [f"v_{i + 1}"], slow_increment) for i in range(10)]
+        )
+        op_network.Compile()
+
+        before = threading.active_count()
+        stream = op_network.Stream(({"v_0": i} for i in range(3)), ["v_10"], max_stages=3)
+        self.assertEqual(next(stream), {"v_10": 10})
+        # three stages and the feeder
+        self.assertLessEqual(threading.active_count() - before, 4)
+        self.assertEqual(list(stream), [{"v_10": 11}, {"v_10": 12}])
@@ -0,0 +1,84 @@
+import unittest
+
+from computegraph.framework.network import CGNetwork, CGNetworkOperation
+from computegraph.framework.operation import CGFusedOperation, CGOperation
+from operator import add, mul, neg, sub, truediv
+
+
+def build_inner() -> CGNetwork:
+    inner = CGNetwork("inner")
+    inner.AddOperations(
+        [
+            CGOperation("op_sub", ["a", "b"], ["a_minus_b"], sub),
+            CGOperation("op_div", ["a_minus_b", "c"], ["ratio"], truediv),
+            CGOperation("op_mul", ["a", "b"], ["product"], mul),
+        ]
+    )
+    inner.Compile()
+    return inner
+
+
+def build_network(inner: CGNetwork) -> CGNetwork:
+    op_network = CGNetwork("outer")
+    op_network.AddOperations(
+        [
+            CGOperation("op_neg", ["x"], ["minus_x"], neg),
+            CGNetworkOperation(
+                "first", inner, {"a": "minus_x", "b": "y", "c": "z"}, {"ratio": "r1", "product": "p1"}
+            ),
+            CGNetworkOperation("second", inner, {"a": "r1", "b": "p1", "c": "z"}, {"ratio": "r2"}),
+            CGOperation("op_add", ["r2", "y"], ["result"], add),
+        ]
+    )
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    inputs = {"x": -7, "y": 3, "z": 2}
+
+    def test_inlined(self):
+        op_network = build_network(build_inner())
+        op_network.Compile()
+
+        names = {step.name for step in op_network.ordered_steps}
+        self.assertTrue({"first/op_sub", "first/op_div", "second/op_sub", "second/op_div"} <= names)
+
+        # r1 = (7 - 3) / 2, p1 = 21, r2 = (2 - 21) / 2
+        self.assertEqual(
+            op_network(self.inputs, ["result", "first/a_minus_b"]), {"first/a_minus_b": 4, "result": -6.5}
+        )
+
+        # pruning sees through the boundary, the unused product of the second network is not computed
+        _, steps = op_network.EvaluateComputationRequirements(list(self.inputs), ["result"])
+        self.assertNotIn("second/op_mul", [step.name for step in steps if isinstance(step, CGOperation)])
+
+        # the parallel executor interleaves the inner operations with the outer ones
+        result = op_network(self.inputs, ["result"], method=CGNetwork.COMPUTE_METHOD.PARALLEL, max_workers=2)
+        self.assertEqual(result, {"result": -6.5})
+
+    def test_fusion_across_boundary(self):
+        op_network = build_network(build_inner())
+        op_network.Compile(optimize=True)
+
+        fused = [step.name for step in op_network.ordered_steps if isinstance(step, CGFusedOperation)]
+        self.assertIn("second/op_sub+second/op_div+op_add", fused)
+        self.assertEqual(op_network(self.inputs, ["result"]), {"result": -6.5})
+
+    def test_changes(self):
+        inner = build_inner()
+        op_network = build_network(inner)
+        op_network.Compile()
+
+        # a changed sub-network is inlined again on the next compile
+        inner.RemoveOperation(inner.operations[-1])
+        inner.AddOperation(CGOperation("op_mul", ["a", "b"], ["product"], add))
+        op_network.Compile()
+        self.assertEqual(op_network(self.inputs, ["result"]), {"result": -1.0})
+
+        second = next(o for o in op_network.network_operations if o.name == "second")
+        op_network.RemoveOperation(second)
+        self.assertFalse(any(step.name.startswith("second/") for step in op_network.ordered_steps))
+
+    def test_standalone(self):
+        operation = CGNetworkOperation("first", build_inner(), {"a": "u", "b": "v", "c": "w"}, {"ratio": "r"})
+        self.assertEqual(operation.Compute({"u": 7, "v": 3, "w": 2}), {"r": 2.0})
@@ -0,0 +1,96 @@
+import threading
+import unittest
+
+from computegraph.framework.network import CGNetwork
+from computegraph.framework.operation import CGOperation
+from operator import add, mul, sub
+
+
+class Counter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def __call__(self, name: str, function):
+        def counted(*args):
+            with self.lock:
+                self.calls[name] = self.calls.get(name, 0) + 1
+            return function(*args)
+
+        return counted
+
+
+class RecordingNetwork(CGNetwork):
+    # records the method and `max_workers` every call is given
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.calls = []
+
+    def __call__(self, input_dict, outputs=[], method=CGNetwork.COMPUTE_METHOD.SEQUENTIAL, max_workers=None):
+        self.calls.append((method, max_workers))
+        return super().__call__(input_dict, outputs, method, max_workers)
+
+
+def build_network(counter: Counter, optimize: bool = False) -> CGNetwork:
+    op_network = CGNetwork("test network")
+    op_network.AddOperations(
+        [
+            CGOperation("op_load", ["a", "b"], ["data"], counter("op_load", mul)),
+            CGOperation("op_prepare", ["data"], ["prepared"], counter("op_prepare", lambda d: d + 1)),
+            CGOperation("op_fit", ["prepared", "alpha"], ["fit"], counter("op_fit", mul)),
+            CGOperation("op_score", ["fit", "beta"], ["score"], counter("op_score", sub)),
+            CGOperation("op_report", ["score", "prepared"], ["report"], counter("op_report", add)),
+        ]
+    )
+    op_network.Compile(optimize=optimize)
+    return op_network
+
+
+class TestClass(unittest.TestCase):
+    base = {"a": 2, "b": 3, "alpha": 0, "beta": 0}
+    axes = {"alpha": [1, 2, 3], "beta": [10, 20]}
+
+    def test_sweep(self):
+        for optimize in (False, True):
+            counter = Counter()
+            op_network = build_network(counter, optimize)
+            sweep = op_network.Sweep(self.base, self.axes, ["report", "prepared"])
+
+            self.assertEqual(sweep.shape, (3, 2))
+            self.assertEqual(len(sweep), 6)
+            self.assertEqual(sweep.shared, {"prepared": 7})
+            for variation, result in sweep.Items():
+                expected = op_network({**self.base, **variation}, ["report", "prepared"])
+                self.assertEqual(result, expected)
+
+            self.assertEqual(sweep[2, 1], {"report": 7 * 3 - 20 + 7, "prepared": 7})
+            self.assertEqual(sweep.Select(alpha=2, beta=10), sweep[1, 0])
+
+            # the invariant prefix once for the sweep, plus once more for every checked call above
+            self.assertEqual(counter.calls["op_load"], 1 + 6)
+            self.assertEqual(counter.calls["op_fit"], 6 + 6)
+
+    def test_parallel(self):
+        counter = Counter()
+        op_network = build_network(counter)
+        sweep = op_network.Sweep({**self.base, "alpha": 1}, {"beta": range(8)}, ["score"], max_workers=4)
+
+        self.assertEqual([sweep[i] for i in range(8)], [{"score": 7 - i} for i in range(8)])
+        self.assertEqual((counter.calls["op_prepare"], counter.calls["op_score"]), (1, 8))
+
+    def test_max_workers(self):
+        op_network = RecordingNetwork("test network")
+        op_network.AddOperations(build_network(Counter()).operations)
+        op_network.Compile()
+        sweep = op_network.Sweep(
+            {**self.base, "alpha": 1}, {"beta": range(4)}, ["score"], CGNetwork.COMPUTE_METHOD.PARALLEL, 2
+        )
+
+        self.assertEqual([sweep[i] for i in range(4)], [{"score": 7 - i} for i in range(4)])
+        # the shared part runs in parallel, the variations run sequentially inside the pool
+        method = CGNetwork.COMPUTE_METHOD
+        self.assertEqual(op_network.calls, [(method.PARALLEL, 2)] + [(method.SEQUENTIAL, None)] * 4)
+
+    def test_missing_input(self):
+        op_network = build_network(Counter())
+        self.assertIsNone(op_network.Sweep({"a": 1}, {"alpha": [1]}, ["score"]))